@@ -194,4 +194,29 @@ export const PropertyAPI = {
     }),
 };
 
+// POST /batch: several API calls in one round trip, authenticated once.
+// Each result carries its own status and body; a failed item does not fail the batch.
+export interface BatchItem {
+  id?: string;
+  method?: "GET" | "POST" | "PUT" | "PATCH" | "DELETE";
+  path: string;
+  headers?: Record<string, string>;
+  body?: unknown;
+}
+
+export interface BatchItemResult<T = unknown> {
+  id?: string | null;
+  status: number;
+  headers: Record<string, string>;
+  body: T;
+}
+
+export const BatchAPI = {
+  run: (requests: BatchItem[]) =>
+    authorizedRequest<{ responses: BatchItemResult[] }>("/batch", {
+      method: "POST",
+      body: JSON.stringify({ requests }),
+    }).then((r) => r.responses),
+};
+
 export default AuthAPI;
@@ -0,0 +1,154 @@
+"""
+POST /batch: several API calls in one round trip.
+
+The caller is authenticated once; each sub-request then runs through the regular
+routes in-process (validation, status codes, ETags) as that user. Consecutive GETs
+run concurrently, up to BATCH_MAX_CONCURRENCY at a time, each on its own pooled
+session because a Session must not be used from two threads at once. A lone GET
+and every write run on the batch's session, in order: a write sees the items
+before it, and the items after it see its result.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from server.api.dependencies import get_current_user
+from server.core.config import settings
+from server.db.database import get_db
+from server.models.model import User
+from server.schemas.schema import BatchItem, BatchItemResult, BatchRequest, BatchResponse
+
+logger = logging.getLogger(__name__)
+
+batch_router = APIRouter(prefix="/batch", tags=["Batch"])
+
+# Per-item response headers that describe the transport, not the sub-response
+HOP_HEADERS = {"content-length", "transfer-encoding", "connection"}
+
+
+@batch_router.post("", response_model=BatchResponse)
+async def run_batch(
+    payload: BatchRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    items = payload.requests
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.BATCH_MAX_ITEMS} requests",
+        )
+    authorization = request.headers.get("authorization")
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    results: List[Optional[BatchItemResult]] = [None] * len(items)
+
+    async def read(index: int) -> None:
+        async with semaphore:
+            results[index] = await _dispatch(request, items[index], authorization, {"user": current_user})
+
+    i = 0
+    while i < len(items):
+        end = i
+        while end < len(items) and items[end].method == "GET":
+            end += 1
+        if end - i > 1:
+            await asyncio.gather(*(read(k) for k in range(i, end)))
+            i = end
+            continue
+        item = items[i]
+        results[i] = await _dispatch(request, item, authorization, {"user": current_user, "db": db})
+        if item.method != "GET":
+            await run_in_threadpool(_after_write, db, current_user, results[i].status)
+        i += 1
+    return BatchResponse(responses=results)
+
+
+def _after_write(db: Session, user: User, status_code: int) -> None:
+    if status_code >= 400:
+        db.rollback()
+    # A commit expires the user; reload it here rather than lazily from concurrent reads
+    db.refresh(user)
+
+
+async def _dispatch(request: Request, item: BatchItem, authorization: Optional[str], state: Dict[str, Any]) -> BatchItemResult:
+    path, _, query = item.path.partition("?")
+    headers = {k.lower(): v for k, v in item.headers.items() if k.lower() not in HOP_HEADERS}
+    # Bodies are returned inside JSON, so they must not be compressed
+    headers.pop("accept-encoding", None)
+    body = b""
+    if item.body is not None:
+        body = json.dumps(item.body).encode()
+        headers.setdefault("content-type", "application/json")
+    headers["content-length"] = str(len(body))
+    if authorization:
+        headers["authorization"] = authorization
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": "1.1",
+        "method": item.method,
+        "scheme": request.url.scheme,
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+        "state": state,
+    }
+
+    delivered = False
+
+    async def receive():
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # No disconnect ever comes; the app cancels this wait once the response is sent
+        await asyncio.Event().wait()
+
+    start: Dict[str, Any] = {}
+    chunks: List[bytes] = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # The error middleware has already sent a 500 if it could
+        logger.exception("Batch sub-request %s %s failed", item.method, item.path)
+    if not start:
+        return BatchItemResult(id=item.id, status=500, headers={}, body={"detail": "Internal Server Error"})
+
+    response_headers = {
+        k.decode("latin-1"): v.decode("latin-1") for k, v in start.get("headers", []) if k.decode("latin-1") not in HOP_HEADERS
+    }
+    return BatchItemResult(
+        id=item.id,
+        status=start["status"],
+        headers=response_headers,
+        body=_decode_body(b"".join(chunks), response_headers.get("content-type", "")),
+    )
+
+
+def _decode_body(raw: bytes, content_type: str) -> Any:
+    if not raw:
+        return None
+    if "json" in content_type:
+        try:
+            return json.loads(raw)
+        except ValueError:
+            pass
+    return raw.decode("utf-8", errors="replace")
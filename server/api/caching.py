@@ -0,0 +1,64 @@
+"""
+HTTP validators and cache headers for public read endpoints.
+
+Routes compute a strong ETag from cheap version data (a row timestamp, a per-city
+counter) before loading anything else, and answer a matching ``If-None-Match``
+with an empty 304. ``Cache-Control`` lets a CDN or reverse proxy serve repeats.
+
+Owner endpoints tag a property with its ``version`` column instead, so an
+``If-Match`` on a write can be turned straight into a ``WHERE version = ...``.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request, Response
+
+from server.core.config import settings
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the string form of ``parts``."""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` matches ``etag`` (weak comparison, per RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={settings.PUBLIC_CACHE_MAX_AGE}"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+_VERSION_TAG = re.compile(r'^"v(\d+)"$')
+
+
+def version_etag(version: int) -> str:
+    return f'"v{version}"'
+
+
+def if_match_versions(request: Request) -> Optional[List[int]]:
+    """Versions named by ``If-Match`` (strong comparison); None when absent or ``*``.
+
+    Tags that are not ``version_etag`` values can never match, so they parse to nothing.
+    """
+    header = request.headers.get("if-match")
+    if header is None or header.strip() == "*":
+        return None
+    versions = []
+    for tag in header.split(","):
+        match = _VERSION_TAG.match(tag.strip())
+        if match:
+            versions.append(int(match.group(1)))
+    return versions
@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from jose import JWTError
@@ -10,7 +10,15 @@ from server.schemas.schema import UserResponse
 
 http_bearer_scheme = HTTPBearer()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(http_bearer_scheme), db: Session = Depends(get_db)) -> User:
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(http_bearer_scheme),
+    db: Session = Depends(get_db),
+    request: Request = None,
+) -> User:
+    # Sub-requests of POST /batch reuse the user the batch already authenticated
+    batch_user = getattr(request.state, "user", None) if request is not None else None
+    if batch_user is not None:
+        return batch_user
     token = credentials.credentials
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
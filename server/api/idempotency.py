@@ -0,0 +1,81 @@
+"""
+Idempotency-Key support for POST endpoints.
+
+A client that retries a POST (e.g. after a timeout on a flaky network) sends the
+same ``Idempotency-Key`` header. The first response for a (user, key) pair is
+stored for ``IDEMPOTENCY_TTL_SECONDS`` and replayed to retries, marked with
+``Idempotent-Replayed: true``, without calling the service again. A duplicate that
+arrives while the first request is still running waits for its response. Client
+errors (4xx) are stored too; server errors are not, so the retry runs again.
+Reusing a key for a different request is a 422.
+
+Keys live in a per-worker ``DetailCache`` (byte-capped LRU with single-flight
+loads): a retry that lands on another worker runs the request again.
+"""
+
+import json
+from typing import Any, Callable, Type
+
+from fastapi import HTTPException, Request, Response, status
+from pydantic import BaseModel
+
+from server.api.caching import make_etag
+from server.core.cache import DetailCache
+from server.core.config import settings
+from server.models.model import User
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# (user id, key) -> (response body, (status code, request fingerprint, headers))
+idempotency_store = DetailCache(
+    max_bytes=settings.IDEMPOTENCY_MAX_BYTES,
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+)
+
+
+def idempotent(
+    request: Request,
+    user: User,
+    payload: BaseModel,
+    model: Type[BaseModel],
+    run: Callable[[], Any],
+    status_code: int = status.HTTP_200_OK,
+) -> Any:
+    """Call ``run`` once per ``Idempotency-Key`` and serialize its result as ``model``.
+
+    Without the header, returns ``run()`` unchanged for FastAPI to serialize.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return run()
+    if not key.strip() or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters",
+        )
+    fingerprint = make_etag(request.method, request.url.path, payload.model_dump_json())
+    executed = False
+
+    def execute():
+        nonlocal executed
+        executed = True
+        try:
+            result = run()
+        except HTTPException as exc:
+            if exc.status_code >= 500:
+                raise
+            return json.dumps({"detail": exc.detail}).encode(), (exc.status_code, fingerprint, exc.headers or {})
+        body = model.model_validate(result, from_attributes=True).model_dump_json().encode()
+        return body, (status_code, fingerprint, {})
+
+    body, (stored_status, stored_fingerprint, headers) = idempotency_store.get_or_load((user.id, key), execute)
+    if stored_fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{IDEMPOTENCY_HEADER} was already used for a different request",
+        )
+    if not executed:
+        headers = {**headers, REPLAYED_HEADER: "true"}
+    return Response(content=body, status_code=stored_status, media_type="application/json", headers=headers)
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from server.api.idempotency import idempotency_store
+from server.core.cache import property_detail_cache
+from server.core.events import application_events
+from server.core.invalidation import invalidation_bus
+from server.db.database import get_db
+from server.services.featured_service import featured_feed
+from server.services.job_service import JobService, job_worker
+from server.services.popularity_service import popularity_counters
+
+# Operational endpoints: per-worker runtime metrics for dashboards and load tests
+ops_router = APIRouter(prefix="/ops", tags=["Ops"])
+
+@ops_router.get("/cache")
+def cache_stats():
+    """Hit ratio, size and eviction counters of this worker's in-process caches."""
+    return {
+        "property_detail": property_detail_cache.stats(),
+        "featured": featured_feed.stats(),
+        "idempotency": idempotency_store.stats(),
+    }
+
+@ops_router.get("/invalidation")
+def invalidation_stats():
+    """Published/received/dropped invalidation events and delivery lag for this worker."""
+    return invalidation_bus.stats()
+
+@ops_router.get("/events")
+def event_stats():
+    """Open Server-Sent Events streams and events published/delivered by this worker."""
+    return {"applications": application_events.stats()}
+
+@ops_router.get("/jobs")
+def job_stats(db: Session = Depends(get_db)):
+    """Queue depth and oldest due job (all workers), plus this worker's job counters and latencies."""
+    return {"queue": JobService.queue_stats(db), "worker": job_worker.stats()}
+
+def _pool_saturated(pool) -> bool:
+    if not isinstance(pool, QueuePool):
+        return False
+    max_overflow = pool._max_overflow  # no public accessor; negative means unlimited
+    return max_overflow >= 0 and pool.checkedout() >= pool.size() + max_overflow
+
+@ops_router.get("/counters")
+def counter_stats():
+    """Popularity counter deltas buffered by this worker and its flush counters."""
+    return popularity_counters.stats()
+
+@ops_router.get("/ready")
+def readiness(db: Session = Depends(get_db)):
+    """Readiness probe: 200 when this worker can get a pooled DB connection and run a query, else 503."""
+    pool = db.get_bind().pool
+    checks = {"pool": pool.status()}
+    # Don't queue behind a saturated pool for the whole pool timeout just to report it
+    if _pool_saturated(pool):
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"ready": False, **checks})
+    try:
+        db.execute(text("SELECT 1"))
+    except Exception as exc:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"ready": False, "error": type(exc).__name__, **checks},
+        )
+    return {"ready": True, **checks}
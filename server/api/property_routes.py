@@ -1,8 +1,19 @@
-from fastapi import APIRouter, Depends, status
-import re
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Literal, Optional, Tuple
+from server.api.caching import cache_headers, etag_matches, if_match_versions, make_etag, not_modified, version_etag
 from server.api.dependencies import get_current_user
+from server.api.idempotency import idempotent
+from server.api.responses import construct, json_fragments_response, json_list_response, parse_fields, partial_model
+from server.api.streaming import (
+    SSE_HEADERS, accepts_gzip, csv_chunks, csv_records, gzip_chunks, json_array_items, last_event_id, ndjson_chunks, sse_chunks,
+)
+from server.core.cache import property_detail_cache
+from server.core.config import settings
+from server.core.events import application_events
 from server.db.database import get_db
 from server.schemas.schema import (
     PropertyCreate,
@@ -11,13 +22,25 @@ from server.schemas.schema import (
     ApplicationUpdateRequest,
     ApplicationResponse,
     ApplicationCreateRequest,
+    ArchivedApplicationResponse,
+    ArchivedPropertyResponse,
     PropertySearchQuery,
+    PropertyExportQuery,
     PropertyDeleteResponse,
+    PropertyImportError,
+    PropertyImportResponse,
+    PropertyBulkUpdateRequest,
+    PropertyBulkUpdateResponse,
     PropertyPublic,
     PropertyOwnerItem,
     PropertyOwnerDetail,
+    PropertySummary,
 )
-from server.services.property_service import PropertyService
+from server.services.archive_service import ArchiveService
+from server.services.property_service import PropertyService, mask_address, public_view
+from server.services.featured_service import featured_feed
+from server.services.owner_stats_service import OwnerStatsService
+from server.services.popularity_service import PopularityService
 from server.models.model import User
 from server.services.tenant_service import TenantService
 
@@ -25,19 +48,120 @@ from server.services.tenant_service import TenantService
 property_router = APIRouter(prefix="/properties", tags=["Properties"])
 application_router = APIRouter(prefix="/applications", tags=["Applications"])
 
+# List endpoints load only the columns their response items need
+OWNER_ITEM_COLUMNS = PropertyService.columns_for(PropertyOwnerItem.model_fields)
+
+# Part of every public ETag, so changing the PropertyPublic shape invalidates cached copies
+PUBLIC_SHAPE = ",".join(PropertyPublic.model_fields)
+
+FIELDS_QUERY = Query(None, description="Comma-separated response fields to return (default: all)")
+
+def _public_items(rows: Iterable, fields: Tuple[str, ...]) -> Iterator:
+    # Rows carry only the columns from PropertyService.public_columns(fields)
+    model = partial_model(PropertyPublic, fields)
+    for r in rows:
+        if "address" in fields:
+            yield construct(model, r, address=r.masked_address or mask_address(r.address))
+        else:
+            yield construct(model, r)
+
 @property_router.post("/", response_model=PropertyResponse, status_code=status.HTTP_201_CREATED)
 def create_property(
     property_data: PropertyCreate,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    List a new property.
+    List a new property. Retries with the same Idempotency-Key replay the first response.
+    """
+    return idempotent(
+        request, current_user, property_data, PropertyResponse,
+        lambda: PropertyService.create_property(db=db, property_data=property_data, owner_id=current_user.id),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+@property_router.post("/bulk", response_model=PropertyImportResponse)
+async def import_properties(
+    request: Request,
+    mode: Literal["atomic", "chunked"] = Query(
+        "atomic", description="atomic: all rows in one transaction, none if any row fails; chunked: commit each chunk, skip bad rows"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    List many properties in one request. The body is a JSON array of PropertyCreate
+    objects, or CSV with a header row of PropertyCreate fields (`Content-Type: text/csv`).
+    Rows are validated as they stream in and inserted BULK_IMPORT_CHUNK_SIZE at a time;
+    the report lists each rejected row with its errors.
     """
-    return PropertyService.create_property(db=db, property_data=property_data, owner_id=current_user.id)
+    await run_in_threadpool(PropertyService.require_owner, db, current_user.id)
+    if "csv" in request.headers.get("content-type", ""):
+        records = (_csv_row(r) async for r in csv_records(request.stream()))
+    else:
+        records = json_array_items(request.stream())
+    return await _import_records(db, current_user.id, records, mode)
+
+def _csv_row(record: dict) -> dict:
+    # An empty cell is a missing value, so optional fields fall back to their defaults
+    return {name: value for name, value in record.items() if name and value != ""}
+
+def _validation_messages(exc: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in exc.errors(include_url=False)
+    ]
+
+async def _import_records(db: Session, owner_id: int, records: AsyncIterator[Any], mode: str) -> PropertyImportResponse:
+    atomic = mode == "atomic"
+    report = PropertyImportResponse(mode=mode, received=0, created=0, failed=0, errors=[])
+    chunk: List[PropertyCreate] = []
+    inserted = 0
+
+    async def flush() -> None:
+        nonlocal inserted
+        # Once an atomic import has a bad row it will be rolled back, so stop writing
+        if chunk and not (atomic and report.failed):
+            inserted += await run_in_threadpool(PropertyService.insert_properties, db, owner_id, chunk, not atomic)
+        chunk.clear()
+
+    try:
+        async for record in records:
+            report.received += 1
+            if report.received > settings.BULK_IMPORT_MAX_ROWS:
+                raise ValueError(f"An import may contain at most {settings.BULK_IMPORT_MAX_ROWS} rows")
+            try:
+                chunk.append(PropertyCreate.model_validate(record))
+            except ValidationError as exc:
+                report.failed += 1
+                if len(report.errors) < settings.BULK_IMPORT_MAX_ERRORS:
+                    report.errors.append(PropertyImportError(row=report.received, errors=_validation_messages(exc)))
+                else:
+                    report.errors_truncated = True
+                continue
+            if len(chunk) >= settings.BULK_IMPORT_CHUNK_SIZE:
+                await flush()
+        await flush()
+    except ValueError as exc:
+        # A malformed body: drop the chunks an atomic import has flushed but not committed
+        await run_in_threadpool(db.rollback)
+        committed = "" if atomic else f"; {inserted} rows were already committed"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"{exc} (after row {report.received}){committed}"
+        )
+
+    if atomic and report.failed:
+        await run_in_threadpool(db.rollback)
+        return report
+    if atomic and inserted:
+        await run_in_threadpool(PropertyService.commit_imported_properties, db)
+    report.created = inserted
+    return report
 
 @property_router.get("/", response_model=List[PropertyPublic])
 def search_properties(
+    request: Request,
     filters: PropertySearchQuery = Depends(),
     db: Session = Depends(get_db),
 ):
@@ -47,9 +171,33 @@ def search_properties(
     - max_price: list properties with price <= max_price
     - min_bedrooms: properties with bedrooms >= this value
     - min_area: properties with area_sqft >= this value
-    Supports pagination via skip & limit. Public endpoint; no auth required.
+    Supports pagination via skip & limit, and `fields` to return only some fields
+    (only those columns are read). Public endpoint; no auth required.
+    Sends an ETag from the matching cities' versions and honours If-None-Match.
     """
-    props = PropertyService.search_properties(
+    fields = parse_fields(filters.fields, PropertyPublic)
+    version = PropertyService.get_search_version(db=db, city=filters.city)
+    shape = ",".join(fields) if fields else PUBLIC_SHAPE
+    etag = make_etag("search", shape, filters.model_dump_json(exclude={"fields"}), version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    if fields:
+        rows = PropertyService.search_properties(
+            db=db,
+            city=filters.city,
+            max_price=filters.max_price,
+            min_bedrooms=filters.min_bedrooms,
+            min_area=filters.min_area,
+            skip=filters.skip,
+            limit=filters.limit,
+            columns=PropertyService.public_columns(fields),
+        )
+        response = json_list_response(partial_model(PropertyPublic, fields), _public_items(rows, fields))
+        response.headers.update(cache_headers(etag))
+        return response
+
+    listings = PropertyService.search_public_listings(
         db=db,
         city=filters.city,
         max_price=filters.max_price,
@@ -58,61 +206,138 @@ def search_properties(
         skip=filters.skip,
         limit=filters.limit,
     )
+    response = json_fragments_response(listings)
+    response.headers.update(cache_headers(etag))
+    return response
 
-    def mask_address(addr: str) -> str:
-        # Replace digits with 'x' to hide house numbers/apartment numbers
-        return re.sub(r"\d", "x", addr)
+@property_router.get("/export", response_class=StreamingResponse)
+def export_properties(
+    request: Request,
+    filters: PropertyExportQuery = Depends(),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream every listing matching the search filters (same as GET /properties, without
+    pagination) as NDJSON (default) or CSV. Public-safe fields only; gzip-compressed
+    on the fly when the client accepts it. Public endpoint; no auth required.
+    """
+    chunks = _export_chunks(db.get_bind(), filters)
+    headers = {
+        "Content-Disposition": f'attachment; filename="properties.{filters.format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if accepts_gzip(request):
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    media_type = "text/csv" if filters.format == "csv" else "application/x-ndjson"
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
 
-    return [
-        PropertyPublic(
-            name=p.name,
-            address=mask_address(p.address or ""),
-            city=p.city,
-            state=p.state,
-            pincode=p.pincode,
-            price=p.price,
-            bedrooms=p.bedrooms,
-            bathrooms=p.bathrooms,
-            area_sqft=p.area_sqft,
-            description=p.description,
+def _export_chunks(bind, filters: PropertyExportQuery) -> Iterator[bytes]:
+    # The request's session is closed once the route returns, so the stream opens its own
+    with Session(bind=bind) as db:
+        rows = PropertyService.stream_public_listings(
+            db,
+            city=filters.city,
+            max_price=filters.max_price,
+            min_bedrooms=filters.min_bedrooms,
+            min_area=filters.min_area,
         )
-        for p in props
-    ]
+        if filters.format == "csv":
+            fields = list(PropertyPublic.model_fields)
+            yield from csv_chunks(fields, (
+                [r.masked_address or mask_address(r.address) if name == "address" else getattr(r, name) for name in fields]
+                for r in rows
+            ))
+        else:
+            yield from ndjson_chunks(r.public_json or public_view(r).model_dump_json() for r in rows)
+
+@property_router.get("/featured", response_model=List[PropertyPublic])
+def get_featured_properties(
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    Featured listings for the home page, ranked by recency, shortlists and applications.
+    Served from a snapshot rebuilt in the background. Public endpoint; no auth required.
+    """
+    snapshot = featured_feed.get(db)
+    # From the content only: a refresh that ranks the same listings keeps the ETag
+    etag = make_etag("featured", PUBLIC_SHAPE, snapshot.ids, snapshot.versions)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=snapshot.body, media_type="application/json", headers=cache_headers(etag))
 
 @property_router.get("/mine", response_model=List[PropertyOwnerItem])
 def get_my_properties(
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Return properties listed by the current owner."""
-    props = PropertyService.get_properties_by_owner(db=db, owner_id=current_user.id)
-    return [
-        PropertyOwnerItem(
-            id=p.id,
-            name=p.name,
-            city=p.city,
-            state=p.state,
-            price=p.price,
-            bedrooms=p.bedrooms,
-            bathrooms=p.bathrooms,
-            area_sqft=p.area_sqft,
-        )
-        for p in props
-    ]
+    """Return properties listed by the current owner; `fields` selects a subset of the item fields."""
+    selected = parse_fields(fields, PropertyOwnerItem)
+    model = partial_model(PropertyOwnerItem, selected) if selected else PropertyOwnerItem
+    columns = PropertyService.columns_for(selected) if selected else OWNER_ITEM_COLUMNS
+    props = PropertyService.get_properties_by_owner(db=db, owner_id=current_user.id, columns=columns)
+    return json_list_response(model, (construct(model, p) for p in props))
+
+@property_router.get("/mine/summary", response_model=PropertySummary)
+def get_my_properties_summary(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Totals for the owner dashboard, from counters kept up to date by every write (no aggregation per request)."""
+    stats = OwnerStatsService.get_summary(db=db, owner_id=current_user.id)
+    return PropertySummary(
+        total=stats.properties,
+        available=stats.available,
+        rented=stats.rented,
+        average_rent=round(stats.rent_total / stats.properties, 2) if stats.properties else None,
+        open_applications=stats.open_applications,
+        shortlists=stats.shortlists,
+    )
+
+@property_router.get("/mine/history", response_model=List[ArchivedPropertyResponse])
+def get_my_archived_properties(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Return the current owner's archived (long-rented) listings, newest first."""
+    props = ArchiveService.get_archived_properties(db=db, owner_id=current_user.id, skip=skip, limit=limit)
+    return json_list_response(ArchivedPropertyResponse, (construct(ArchivedPropertyResponse, p) for p in props))
+
+@property_router.patch("/mine/bulk", response_model=PropertyBulkUpdateResponse)
+def bulk_update_my_properties(
+    payload: PropertyBulkUpdateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Change the rent (absolute `price` or `price_change_pct`) and/or `status` of every
+    property of the current owner that matches `filter` (city, bedrooms, ids), in one
+    UPDATE. Returns the ids that were changed; other users' ids are never matched.
+    """
+    ids = PropertyService.bulk_update_properties(db=db, owner_id=current_user.id, request=payload)
+    return PropertyBulkUpdateResponse(updated=len(ids), ids=ids)
 
 @property_router.get("/{property_id}/mine", response_model=PropertyOwnerDetail)
 def get_my_property_details(
     property_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Return full details for a property owned by the current user (unmasked)."""
+    """Return full details for a property owned by the current user (unmasked).
+
+    The ETag names the property's version; send it back as If-Match on PUT.
+    """
     p = PropertyService.get_property_by_id(db=db, property_id=property_id)
     if p.owner_id != current_user.id:
         # Hide whether the property exists if not owner
-        from fastapi import HTTPException
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You can view only your own properties")
 
+    response.headers["ETag"] = version_etag(p.version)
     return PropertyOwnerDetail(
         id=p.id,
         name=p.name,
@@ -134,36 +359,68 @@ def get_my_property_details(
 @property_router.get("/{property_id}", response_model=PropertyPublic)
 def get_property_details(
     property_id: int,
+    request: Request,
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
 ):
-    """Get all the information about a single property (public-safe)."""
-    p = PropertyService.get_property_by_id(db=db, property_id=property_id)
+    """Get all the information about a single property (public-safe).
 
-    def mask_address(addr: str) -> str:
-        return re.sub(r"\d", "x", addr)
+    Served from the in-process detail cache; sends an ETag from the property's
+    last-modified time and answers a matching If-None-Match with 304. With `fields`,
+    only those columns are read, bypassing the cache. Every request, 304s included,
+    counts as a view.
+    """
+    selected = parse_fields(fields, PropertyPublic)
+    if selected:
+        columns = PropertyService.public_columns(selected)
+        row, modified_at = PropertyService.get_public_listing_columns(db=db, property_id=property_id, columns=columns)
+        PopularityService.record_view(db, property_id)
+        etag = make_etag("property", ",".join(selected), property_id, modified_at.isoformat())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        listing = next(_public_items([row], selected)).model_dump_json()
+        return Response(content=listing, media_type="application/json", headers=cache_headers(etag))
 
-    return PropertyPublic(
-        name=p.name,
-        address=mask_address(p.address or ""),
-        city=p.city,
-        state=p.state,
-        pincode=p.pincode,
-        price=p.price,
-        bedrooms=p.bedrooms,
-        bathrooms=p.bathrooms,
-        area_sqft=p.area_sqft,
-        description=p.description,
+    bind = db.get_bind()
+    listing, modified_at = property_detail_cache.get_or_load(
+        property_id, lambda: _load_public_listing(bind, property_id)
     )
+    PopularityService.record_view(db, property_id)
+    etag = make_etag("property", PUBLIC_SHAPE, property_id, modified_at.isoformat())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=listing, media_type="application/json", headers=cache_headers(etag))
+
+def _load_public_listing(bind, property_id: int):
+    # May run on the cache's refresh thread after the request is gone, so it opens its own session
+    with Session(bind=bind) as db:
+        listing, modified_at = PropertyService.get_versioned_public_listing(db=db, property_id=property_id)
+    return listing.encode(), modified_at
 
 @property_router.put("/{property_id}", response_model=PropertyResponse)
 def update_property(
     property_id: int,
     updates: PropertyUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Update an existing property. Only the owner of the property may update it."""
-    return PropertyService.update_property(db=db, property_id=property_id, owner_id=current_user.id, updates=updates)
+    """Update an existing property. Only the owner of the property may update it.
+
+    Send the ETag from GET /properties/{id}/mine (or the previous PUT) as If-Match to
+    update only if nobody changed the property since: otherwise 412. The response
+    carries the new ETag.
+    """
+    expected = if_match_versions(request)
+    if expected == []:
+        # None of the tags can be a version of this property
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="If-Match does not name a property version")
+    row = PropertyService.update_property(
+        db=db, property_id=property_id, owner_id=current_user.id, updates=updates, expected_versions=expected
+    )
+    response.headers["ETag"] = version_etag(row.version)
+    return construct(PropertyResponse, row, owner=current_user)
 
 @application_router.put("/{application_id}", response_model=ApplicationResponse)
 def manage_application(
@@ -183,11 +440,16 @@ def manage_application(
 @application_router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
 def apply_for_property(
     payload: ApplicationCreateRequest,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Tenants can submit an application to rent a property."""
-    return TenantService.apply_for_property(db=db, tenant_id=current_user.id, property_id=payload.property_id)
+    """Tenants can submit an application to rent a property (Idempotency-Key supported)."""
+    return idempotent(
+        request, current_user, payload, ApplicationResponse,
+        lambda: TenantService.apply_for_property(db=db, tenant_id=current_user.id, property_id=payload.property_id),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 @application_router.get("/", response_model=List[ApplicationResponse])
 def get_my_applications(
@@ -195,7 +457,33 @@ def get_my_applications(
     current_user: User = Depends(get_current_user),
 ):
     """Tenants can see the status of their applications."""
-    return TenantService.get_my_applications(db=db, tenant_id=current_user.id)
+    apps = TenantService.get_my_applications(db=db, tenant_id=current_user.id)
+    return json_list_response(ApplicationResponse, (construct(ApplicationResponse, a) for a in apps))
+
+@application_router.get("/history", response_model=List[ArchivedApplicationResponse])
+def get_my_archived_applications(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Tenants can see their archived applications (rejected ones, and those on archived listings)."""
+    apps = ArchiveService.get_archived_applications(db=db, tenant_id=current_user.id, skip=skip, limit=limit)
+    return json_list_response(ArchivedApplicationResponse, (construct(ArchivedApplicationResponse, a) for a in apps))
+
+@application_router.get("/stream", response_class=StreamingResponse)
+async def stream_application_updates(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Server-Sent Events: an `application_status` event whenever an owner changes the status
+    of one of your applications, `: keep-alive` comments while idle, and `reset` when
+    events may have been missed (refetch GET /applications/). Send `Last-Event-ID` to
+    resume after a disconnect.
+    """
+    chunks = sse_chunks(application_events, current_user.id, last_event_id(request), settings.SSE_HEARTBEAT_SECONDS)
+    return StreamingResponse(chunks, media_type="text/event-stream", headers=SSE_HEADERS)
 
 @property_router.delete("/{property_id}", response_model=PropertyDeleteResponse)
 def delete_property(
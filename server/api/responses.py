@@ -0,0 +1,106 @@
+"""
+Fast JSON responses for hot list endpoints.
+
+FastAPI validates whatever a route returns against ``response_model`` and then
+encodes it with the stdlib ``json`` module. For list endpoints that already build
+their items from trusted ORM rows this is a second validation pass per row.
+Here items are assembled with ``model_construct`` (no validation) and serialized
+straight to bytes by a cached pydantic-core ``TypeAdapter``; the JSON is the same
+as the default path. Routes keep ``response_model`` for the OpenAPI schema.
+
+Sparse fieldsets (``?fields=name,price``) are validated with ``parse_fields`` and
+serialized through ``partial_model``, a cached copy of the response model with only
+those fields.
+"""
+
+import enum
+import typing
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple, Type, Union
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel, TypeAdapter, create_model
+
+# (field name, nested model to construct, coerce Enum members to their value)
+FieldPlan = Tuple[str, Optional[Type[BaseModel]], bool]
+
+
+def _unwrap_optional(annotation):
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def _field_plan(model: Type[BaseModel]) -> Tuple[FieldPlan, ...]:
+    plan = []
+    for name, info in model.model_fields.items():
+        annotation = _unwrap_optional(info.annotation)
+        nested = annotation if isinstance(annotation, type) and issubclass(annotation, BaseModel) else None
+        # Validation would turn e.g. UserType.OWNER into "owner" for a `str` field
+        plan.append((name, nested, annotation is str))
+    return tuple(plan)
+
+
+def construct(model: Type[BaseModel], obj: Any, **values: Any) -> BaseModel:
+    """Build ``model`` from an ORM object or Row by attribute, without validation.
+
+    Keyword arguments override attributes (e.g. a masked address).
+    """
+    data = {}
+    for name, nested, coerce_enum in _field_plan(model):
+        value = values[name] if name in values else getattr(obj, name)
+        if nested is not None and value is not None:
+            value = construct(nested, value)
+        elif coerce_enum and isinstance(value, enum.Enum):
+            value = value.value
+        data[name] = value
+    return model.model_construct(**data)
+
+
+def parse_fields(raw: Optional[str], model: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """Validate a comma-separated ``fields=`` value against ``model``; None means every field.
+
+    Names come back in the model's field order without duplicates, so equal selections share
+    one ``partial_model`` and one ETag.
+    """
+    if raw is None or not raw.strip():
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(model.model_fields)}",
+        )
+    selected = tuple(name for name in model.model_fields if name in requested)
+    return None if len(selected) == len(model.model_fields) else selected
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """``model`` restricted to ``fields`` (same types and defaults)."""
+    definitions = {name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields}
+    return create_model(f"{model.__name__}Fields", **definitions)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def dump_list(model: Type[BaseModel], items: Iterable[BaseModel]) -> bytes:
+    return list_adapter(model).dump_json(list(items))
+
+
+def json_list_response(model: Type[BaseModel], items: Iterable[BaseModel], status_code: int = 200) -> Response:
+    """Serialize already-constructed ``model`` items to a JSON array response."""
+    return Response(content=dump_list(model, items), status_code=status_code, media_type="application/json")
+
+
+def json_fragments_response(fragments: Iterable[Union[str, bytes]], status_code: int = 200) -> Response:
+    """JSON array response joined from pre-serialized items (e.g. stored projections)."""
+    body = b",".join(f.encode() if isinstance(f, str) else f for f in fragments)
+    return Response(content=b"[" + body + b"]", status_code=status_code, media_type="application/json")
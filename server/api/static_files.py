@@ -0,0 +1,139 @@
+"""
+Static serving for the built React client.
+
+``ClientStaticFiles`` extends Starlette's ``StaticFiles`` (ETag/If-None-Match,
+Last-Modified and Range come from ``FileResponse``):
+
+- serves ``<file>.br`` / ``<file>.gz`` written at build time when the client accepts them
+- marks content-hashed build assets (``assets/index-B3f9a1c2.js``) immutable for a year;
+  everything else, notably ``index.html``, is revalidated on every use
+- falls back to ``index.html`` for client-side routes (browser navigations only, so an
+  unknown API path still gets a 404), and keeps the router's trailing-slash redirects
+
+It is a plain ASGI app mounted after the API routers; no request dependency (DB
+session, auth) runs for it. Bodies are sent with the ``http.response.pathsend``
+extension where the server offers it, otherwise streamed in chunks.
+"""
+
+import os
+import re
+import stat
+from typing import Optional, Tuple
+
+from fastapi import FastAPI
+from starlette.datastructures import URL, Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, RedirectResponse, Response
+from starlette.routing import Match, Mount
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Vite writes build outputs to assets/<name>-<hash>.<ext>; the hash is at least 8 url-safe characters
+HASHED_ASSET = re.compile(r"-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _accepted_encodings(headers: Headers) -> set:
+    accepted = set()
+    for part in headers.get("accept-encoding", "").lower().split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        q = next((p[2:] for p in params if p.startswith("q=")), "1")
+        try:
+            weight = float(q)
+        except ValueError:
+            continue
+        if name and weight > 0:
+            accepted.add(name)
+    return accepted
+
+
+class ClientStaticFiles(StaticFiles):
+    def __init__(self, directory: str, index: str = "index.html", assets_dir: str = "assets"):
+        super().__init__(directory=directory, html=False)
+        self.index = index
+        self.assets_dir = assets_dir
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            redirect = self._api_slash_redirect(scope)
+            if redirect is not None:
+                return redirect
+            raise HTTPException(status_code=405)
+        if path in ("", "."):
+            path = self.index
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as exc:
+            if exc.status_code != 404:
+                raise
+        redirect = self._api_slash_redirect(scope)
+        if redirect is not None:
+            return redirect
+        if not self._is_navigation(path, scope):
+            raise HTTPException(status_code=404)
+        # Client-side route: let the SPA router handle it
+        return await super().get_response(self.index, scope)
+
+    @staticmethod
+    def _api_slash_redirect(scope: Scope) -> Optional[Response]:
+        # A catch-all mount at / always matches, which stops the router from redirecting
+        # /properties to /properties/; do it here for any API route instead
+        path = scope["path"]
+        other = {**scope, "path": path[:-1] if path.endswith("/") else path + "/"}
+        for route in scope["app"].router.routes:
+            if isinstance(route, Mount):
+                continue
+            match, _ = route.matches(other)
+            if match != Match.NONE:
+                return RedirectResponse(url=str(URL(scope=other)))
+        return None
+
+    @staticmethod
+    def _is_navigation(path: str, scope: Scope) -> bool:
+        last = path.rsplit("/", 1)[-1]
+        return "." not in last and "text/html" in Headers(scope=scope).get("accept", "")
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        headers = {
+            "Cache-Control": IMMUTABLE if self._is_hashed_asset(full_path) else REVALIDATE,
+            "Vary": "Accept-Encoding",
+        }
+        # Content-Type follows the original file, not the .br/.gz variant
+        media_type = FileResponse(full_path, stat_result=stat_result).media_type
+        variant = self._precompressed(str(full_path), request_headers)
+        if variant is not None:
+            full_path, stat_result, headers["Content-Encoding"] = variant
+        response = FileResponse(
+            full_path, status_code=status_code, stat_result=stat_result, media_type=media_type, headers=headers
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _is_hashed_asset(self, full_path) -> bool:
+        relative = os.path.relpath(full_path, self.directory)
+        return relative.startswith(self.assets_dir + os.sep) and bool(HASHED_ASSET.search(relative))
+
+    @staticmethod
+    def _precompressed(full_path: str, headers: Headers) -> Optional[Tuple[str, os.stat_result, str]]:
+        accepted = _accepted_encodings(headers)
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                stat_result = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if stat.S_ISREG(stat_result.st_mode):
+                return full_path + suffix, stat_result, encoding
+        return None
+
+
+def mount_client(app: FastAPI, directory: str) -> None:
+    """Serve the client build at ``/``; call after including the API routers so they match first."""
+    app.mount("/", ClientStaticFiles(directory=directory), name="client")
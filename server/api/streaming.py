@@ -0,0 +1,202 @@
+"""
+Chunked encoders for streaming responses (NDJSON, CSV, on-the-fly gzip), decoders
+for streamed request bodies (JSON array, CSV), and Server-Sent Events from an
+``EventHub`` subscription.
+
+Each encoder consumes an iterator and yields byte chunks of roughly
+``chunk_size`` so a StreamingResponse sends a few large writes instead of one per
+row, while never holding more than one chunk in memory. The decoders do the
+reverse for ``request.stream()``: they yield one item at a time as its bytes
+arrive, holding at most one item plus one network chunk.
+"""
+
+import asyncio
+import codecs
+import csv
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Sequence
+
+from fastapi import Request
+
+from server.core.events import EventHub
+
+CHUNK_SIZE = 64 * 1024
+
+# Longest single element json_array_items will buffer while waiting for the rest of it
+MAX_ITEM_CHARS = 1024 * 1024
+
+# How long an EventSource waits before reconnecting after the stream ends
+SSE_RETRY_MS = 3000
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+def ndjson_chunks(lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Join already-serialized JSON documents with newlines."""
+    buf = io.StringIO()
+    for line in lines:
+        buf.write(line)
+        buf.write("\n")
+        if buf.tell() >= chunk_size:
+            yield buf.getvalue().encode()
+            buf = io.StringIO()
+    if buf.tell():
+        yield buf.getvalue().encode()
+
+
+def csv_chunks(header: Sequence[str], rows: Iterable[Sequence], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buf.tell() >= chunk_size:
+            yield buf.getvalue().encode()
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+    if buf.tell():
+        yield buf.getvalue().encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+async def json_array_items(chunks: AsyncIterator[bytes], max_item_chars: int = MAX_ITEM_CHARS) -> AsyncIterator[Any]:
+    """Yield the elements of a top-level JSON array as its bytes arrive.
+
+    Raises ``ValueError`` if the body is not a well-formed array or one element is
+    longer than ``max_item_chars``.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buf, pos, eof = "", 0, False
+    # "[" before the array, "item|]" after it opens, "item" after a comma, ",|]" after an item
+    expect = "["
+
+    async def fill() -> bool:
+        nonlocal buf, pos, eof
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            buf, pos, eof = buf[pos:] + utf8.decode(b"", final=True), 0, True
+            return False
+        buf, pos = buf[pos:] + utf8.decode(chunk), 0
+        return True
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n":
+            pos += 1
+        if pos == len(buf):
+            if await fill():
+                continue
+            if expect is None:
+                return
+            raise ValueError("Expected a JSON array" if expect == "[" else "JSON body ended before the closing ']'")
+        char = buf[pos]
+        if expect is None:
+            raise ValueError("Unexpected data after the JSON array")
+        if expect == "[":
+            if char != "[":
+                raise ValueError("Expected a JSON array")
+            expect, pos = "item|]", pos + 1
+        elif char == "]" and expect != "item":
+            expect, pos = None, pos + 1
+        elif expect == ",|]":
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in the JSON array, got {char!r}")
+            expect, pos = "item", pos + 1
+        else:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if len(buf) - pos > max_item_chars:
+                    raise ValueError(f"JSON array item longer than {max_item_chars} characters or malformed")
+                # The item most likely continues in the next chunk
+                if await fill():
+                    continue
+                raise ValueError("Malformed JSON array item")
+            if end == len(buf) and not eof:
+                # A number at the end of the buffer may have more digits to come
+                await fill()
+                continue
+            expect, pos = ",|]", end
+            yield item
+
+
+async def csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Dict[str, str]]:
+    """Yield each row of a CSV body as a dict keyed by its header line, as its bytes arrive.
+
+    Quoted fields may span lines and chunks; blank lines are skipped.
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+    header: Optional[list] = None
+    pending = ""  # text after the last line break seen
+    record = ""  # lines of a record whose quoted field is still open
+
+    def complete_rows(text: str) -> Iterator[Dict[str, str]]:
+        nonlocal header, record
+        for line in io.StringIO(text, newline=""):
+            record += line
+            if record.count('"') % 2:
+                continue
+            row = next(csv.reader(io.StringIO(record, newline="")), [])
+            record = ""
+            if not row:
+                continue
+            if header is None:
+                header = [name.strip() for name in row]
+            else:
+                yield dict(zip(header, row))
+
+    async for chunk in chunks:
+        pending += utf8.decode(chunk)
+        cut = max(pending.rfind("\n"), pending.rfind("\r")) + 1
+        if cut:
+            for row in complete_rows(pending[:cut]):
+                yield row
+            pending = pending[cut:]
+    for row in complete_rows(pending + utf8.decode(b"", final=True) + "\n"):
+        yield row
+    if record.strip():
+        raise ValueError("CSV body ended inside a quoted field")
+
+
+def last_event_id(request: Request) -> Optional[int]:
+    """The ``Last-Event-ID`` an EventSource sends on reconnect, if it is one of ours."""
+    try:
+        return int(request.headers["last-event-id"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def sse_chunks(hub: EventHub, key: Any, since: Optional[int], heartbeat: float) -> AsyncIterator[bytes]:
+    """Events for ``key`` as SSE frames, with a comment line after ``heartbeat`` idle seconds.
+
+    Subscribes when the response starts and unsubscribes when it ends or the client goes away.
+    """
+    sub = hub.subscribe(key, since)
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+        while True:
+            try:
+                event = await sub.next(heartbeat)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection and surfaces dead clients
+                yield b": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            yield event.encode()
+    finally:
+        hub.unsubscribe(sub)
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 from typing import List
 from server.api.dependencies import get_current_user
+from server.api.idempotency import idempotent
+from server.api.responses import construct, json_list_response
 from server.db.database import get_db
 from server.models.model import User
 from server.schemas.schema import ShortlistRequest, ShortlistResponse, Property as PropertyResponse
@@ -12,17 +14,22 @@ router = APIRouter(prefix="/me", tags=["Tenant"])
 @router.post("/shortlist", response_model=ShortlistResponse)
 def shortlist_property(
     payload: ShortlistRequest,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    return TenantService.shortlist_property(db=db, tenant_id=current_user.id, payload=payload)
+    return idempotent(
+        request, current_user, payload, ShortlistResponse,
+        lambda: TenantService.shortlist_property(db=db, tenant_id=current_user.id, payload=payload),
+    )
 
 @router.get("/shortlist", response_model=List[PropertyResponse])
 def get_shortlist(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    return TenantService.get_shortlisted_properties(db=db, tenant_id=current_user.id)
+    props = TenantService.get_shortlisted_properties(db=db, tenant_id=current_user.id)
+    return json_list_response(PropertyResponse, (construct(PropertyResponse, p) for p in props))
 
 @router.delete("/shortlist/{property_id}", status_code=204)
 def remove_from_shortlist(
@@ -0,0 +1,106 @@
+"""
+Benchmark: hot-table size and query latency before and after archival.
+
+Seeds a throwaway SQLite database (listing and application timestamps spread over
+the year before --as-of), times public search, a busy tenant's applications and a
+busy owner's listings, runs ArchiveService with the given thresholds, then repeats
+the measurements. Reports hot-table row counts and the best-of-N latency of each
+query.
+
+Usage (from the repository root):
+    python -m server.benchmarks.archival --properties 50000 --applications 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--properties", type=int, default=50_000)
+    parser.add_argument("--applications", type=int, default=200_000)
+    parser.add_argument("--rented-after-days", type=int, default=90)
+    parser.add_argument("--rejected-after-days", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.orm import sessionmaker
+
+    from server.core.config import settings
+    from server.db.seed import SeedSpec, seed_database
+    from server.models.model import Application, Property
+    from server.services.archive_service import ArchiveService
+    from server.services.property_service import PropertyService
+    from server.services.tenant_service import TenantService
+
+    as_of = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    engine = create_engine(f"sqlite:///{Path(tempfile.mkdtemp(prefix='nobroker-archive-')) / 'archive.db'}")
+    spec = SeedSpec(users=args.users, properties=args.properties, applications=args.applications,
+                    shortlists=args.applications // 2, as_of=as_of)
+    seed_database(engine, spec, password_hash="x")
+    Session = sessionmaker(bind=engine)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+        city = conn.execute(
+            select(Property.city).group_by(Property.city).order_by(func.count().desc()).limit(1)
+        ).scalar_one()
+        tenant_id = conn.execute(
+            select(Application.tenant_id).group_by(Application.tenant_id).order_by(func.count().desc()).limit(1)
+        ).scalar_one()
+        owner_id = conn.execute(
+            select(Property.owner_id).group_by(Property.owner_id).order_by(func.count().desc()).limit(1)
+        ).scalar_one()
+
+    queries: Dict[str, Callable] = {
+        f"search {city}": lambda db: PropertyService.search_public_listings(db, city=city, limit=20),
+        "tenant applications": lambda db: TenantService.get_my_applications(db, tenant_id),
+        "owner listings": lambda db: PropertyService.get_properties_by_owner(db, owner_id),
+    }
+
+    def measure() -> Dict[str, float]:
+        with Session() as db:
+            return {
+                name: min(timeit.repeat(lambda: query(db), number=10, repeat=args.repeat)) / 10
+                for name, query in queries.items()
+            }
+
+    def counts() -> Dict[str, int]:
+        with engine.connect() as conn:
+            return {table: conn.exec_driver_sql(f"SELECT count(*) FROM {table}").scalar_one()
+                    for table in ("properties", "applications", "shortlisted_properties")}
+
+    before, rows_before = measure(), counts()
+    settings.ARCHIVE_RENTED_AFTER_DAYS = args.rented_after_days
+    settings.ARCHIVE_REJECTED_AFTER_DAYS = args.rejected_after_days
+    started = time.perf_counter()
+    with Session() as db:
+        moved = ArchiveService.run(db, now=as_of + timedelta(days=1), batch_size=args.batch_size)
+    archive_s = time.perf_counter() - started
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    after, rows_after = measure(), counts()
+
+    print(f"archived {moved['properties']} properties and {moved['applications']} applications in {archive_s:.2f}s")
+    print(f"{'table':<24} {'rows before':>12} {'rows after':>12}")
+    for table in rows_before:
+        print(f"{table:<24} {rows_before[table]:>12} {rows_after[table]:>12}")
+    print(f"{'query':<24} {'before ms':>12} {'after ms':>12}")
+    for name in queries:
+        print(f"{name:<24} {1000 * before[name]:>12.2f} {1000 * after[name]:>12.2f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
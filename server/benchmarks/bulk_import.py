@@ -0,0 +1,126 @@
+"""
+Benchmark: POST /properties/ per row vs POST /properties/bulk (JSON and CSV).
+
+Creates a throwaway SQLite database and an owner, then lists the same generated
+rows through the app in-process: one request per row for a sample (the per-row
+cost is then extrapolated to the full size), and the full set through the bulk
+endpoint in atomic and chunked mode, as a JSON array and as CSV. Reports rows per
+second for each.
+
+Usage (from the repository root):
+    python -m server.benchmarks.bulk_import --rows 10000 --single-rows 500
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+
+CITIES = ("Bengaluru", "Mumbai", "Pune", "Delhi", "Hyderabad", "Chennai")
+
+
+def _rows(count: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        bedrooms = rng.randint(1, 4)
+        rows.append({
+            "name": f"{bedrooms}BHK Apartment {i}",
+            "address": f"{rng.randint(1, 999)}, Street {rng.randint(1, 99)}",
+            "city": rng.choice(CITIES),
+            "state": "KA",
+            "pincode": f"560{rng.randint(0, 999):03d}",
+            "price": float(rng.randint(8, 60) * 1000),
+            "bedrooms": bedrooms,
+            "bathrooms": max(1, bedrooms - 1),
+            "area_sqft": 400 * bedrooms + rng.randint(0, 300),
+            "description": "Close to transit, schools and markets.",
+        })
+    return rows
+
+
+def _csv_body(rows: List[dict]) -> bytes:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue().encode()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--single-rows", type=int, default=500, help="Rows sent one request each")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Overrides BULK_IMPORT_CHUNK_SIZE")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    # These must be set before server.core.config is imported
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp(prefix='nobroker-import-')) / 'import.db'}"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ["DEBUG"] = "false"
+    os.environ["BULK_IMPORT_MAX_ROWS"] = str(max(args.rows, 50_000))
+    if args.chunk_size:
+        os.environ["BULK_IMPORT_CHUNK_SIZE"] = str(args.chunk_size)
+    if str(SERVER_DIR) not in sys.path:
+        sys.path.insert(0, str(SERVER_DIR))
+    logging.basicConfig(level=logging.WARNING)
+
+    from fastapi.testclient import TestClient
+
+    from server.core.config import settings
+    from server.db.database import create_tables, engine
+    from server.main import app
+
+    create_tables()
+    client = TestClient(app)
+    owner = {"name": "Bulk Owner", "email": "bulk.owner@example.com", "phone": "9000000000",
+             "password": "benchmark", "user_type": "owner"}
+    client.post("/auth/register", json=owner).raise_for_status()
+    token = client.post("/auth/login", json={"email": owner["email"], "password": owner["password"]}).json()["access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+
+    rows = _rows(args.rows, args.seed)
+    results = []
+
+    started = time.perf_counter()
+    for row in rows[: args.single_rows]:
+        client.post("/properties/", json=row, headers=auth).raise_for_status()
+    per_row = (time.perf_counter() - started) / args.single_rows
+    results.append((f"POST /properties/ x{args.single_rows}", args.single_rows, per_row * args.single_rows))
+
+    bodies = [
+        ("json", "application/json", json.dumps(rows).encode()),
+        ("csv", "text/csv", _csv_body(rows)),
+    ]
+    for mode in ("atomic", "chunked"):
+        for label, content_type, body in bodies:
+            started = time.perf_counter()
+            r = client.post(
+                "/properties/bulk", params={"mode": mode}, content=body,
+                headers={**auth, "Content-Type": content_type},
+            )
+            elapsed = time.perf_counter() - started
+            r.raise_for_status()
+            assert r.json()["created"] == args.rows, r.json()
+            results.append((f"bulk {mode} {label}", args.rows, elapsed))
+
+    print(f"{args.rows} rows, chunk size {settings.BULK_IMPORT_CHUNK_SIZE}")
+    print(f"{'request':<28} {'rows':>7} {'seconds':>9} {'rows/s':>10} {'s for all rows':>15}")
+    for label, count, elapsed in results:
+        print(f"{label:<28} {count:>7} {elapsed:>9.2f} {count / elapsed:>10.0f} {elapsed / count * args.rows:>15.1f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
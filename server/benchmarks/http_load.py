@@ -0,0 +1,303 @@
+"""
+HTTP load benchmark for the FastAPI app.
+
+Drives ``server.main:app`` with weighted scenarios, either in-process through an
+ASGI transport or over a local uvicorn socket, against a freshly seeded SQLite
+database (no external services needed). Reports throughput and p50/p95/p99 per
+endpoint, writes the results as JSON and exits non-zero when p95 latency or
+throughput regresses past ``--max-regression`` relative to a stored baseline.
+
+Usage (from the repository root):
+    python -m server.benchmarks.http_load --mode both --duration 20 --concurrency 16
+    python -m server.benchmarks.http_load --update-baseline   # record a baseline (machine-local, not committed)
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+REPO_ROOT = SERVER_DIR.parent
+DEFAULT_OUTPUT = SERVER_DIR / "benchmarks" / "results" / "http_load.json"
+DEFAULT_BASELINE = SERVER_DIR / "benchmarks" / "baselines" / "http_load.json"
+
+DEFAULT_WEIGHTS = {"search": 50, "detail": 30, "tenant": 10, "owner": 10}
+
+logger = logging.getLogger("benchmarks.http_load")
+
+
+class Recorder:
+    """Collects per-endpoint latencies (seconds) and error counts."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(self, client, name: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[name].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+
+class Fixtures:
+    """Ids, cities and credentials sampled from the seeded database."""
+
+    def __init__(self, property_ids: List[int], cities: List[str], tenants: List[str], owners: List[str], password: str):
+        self.property_ids = property_ids
+        self.cities = cities
+        self.tenants = tenants
+        self.owners = owners
+        self.password = password
+
+
+async def scenario_search(client, rec: Recorder, fx: Fixtures, rng: random.Random, state: dict) -> None:
+    params = {"city": rng.choice(fx.cities), "limit": 20}
+    if rng.random() < 0.5:
+        params["max_price"] = rng.choice((15000, 25000, 40000))
+    if rng.random() < 0.3:
+        params["min_bedrooms"] = rng.choice((1, 2, 3))
+    await rec.request(client, "GET /properties", "GET", "/properties/", params=params)
+
+
+async def scenario_detail(client, rec: Recorder, fx: Fixtures, rng: random.Random, state: dict) -> None:
+    await rec.request(client, "GET /properties/{id}", "GET", f"/properties/{rng.choice(fx.property_ids)}")
+
+
+async def _login(client, rec: Recorder, email: str, password: str) -> Optional[dict]:
+    r = await rec.request(client, "POST /auth/login", "POST", "/auth/login", json={"email": email, "password": password})
+    if r.status_code != 200:
+        return None
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def scenario_tenant(client, rec: Recorder, fx: Fixtures, rng: random.Random, state: dict) -> None:
+    headers = await _login(client, rec, rng.choice(fx.tenants), fx.password)
+    if headers is None:
+        return
+    property_id = rng.choice(fx.property_ids)
+    await rec.request(client, "POST /me/shortlist", "POST", "/me/shortlist", json={"property_id": property_id}, headers=headers)
+    await rec.request(client, "POST /applications", "POST", "/applications/", json={"property_id": property_id}, headers=headers)
+
+
+async def scenario_owner(client, rec: Recorder, fx: Fixtures, rng: random.Random, state: dict) -> None:
+    # Owners revisit their dashboard with the token they already hold
+    headers = state.get("owner_headers")
+    if headers is None:
+        headers = await _login(client, rec, rng.choice(fx.owners), fx.password)
+        if headers is None:
+            return
+        state["owner_headers"] = headers
+    await rec.request(client, "GET /users/me", "GET", "/users/me", headers=headers)
+    r = await rec.request(client, "GET /properties/mine", "GET", "/properties/mine", headers=headers)
+    if r.status_code == 200 and r.json():
+        first = r.json()[0]["id"]
+        await rec.request(client, "GET /properties/{id}/mine", "GET", f"/properties/{first}/mine", headers=headers)
+
+
+SCENARIOS: Dict[str, Callable[..., Awaitable[None]]] = {
+    "search": scenario_search,
+    "detail": scenario_detail,
+    "tenant": scenario_tenant,
+    "owner": scenario_owner,
+}
+
+
+def parse_weights(raw: Optional[str]) -> Dict[str, int]:
+    if not raw:
+        return dict(DEFAULT_WEIGHTS)
+    weights = {}
+    for part in raw.split(","):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}'. Choose from: {', '.join(SCENARIOS)}")
+        weights[name] = int(value)
+    return weights
+
+
+async def _virtual_user(client, rec: Recorder, fx: Fixtures, weights: Dict[str, int], seed: int, deadline: float) -> None:
+    rng = random.Random(seed)
+    names = list(weights)
+    cum = []
+    total = 0
+    for name in names:
+        total += weights[name]
+        cum.append(total)
+    state: dict = {}
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, cum_weights=cum)[0]
+        await SCENARIOS[name](client, rec, fx, rng, state)
+
+
+async def drive(client, fx: Fixtures, weights: Dict[str, int], concurrency: int, duration: float, seed: int) -> dict:
+    from server.benchmarks.report import summarize
+
+    rec = Recorder()
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _virtual_user(client, rec, fx, weights, seed * 1000 + i, deadline) for i in range(concurrency)
+    ))
+    return summarize(rec.latencies, rec.errors, time.perf_counter() - started)
+
+
+async def run_inprocess(app, fx: Fixtures, args) -> dict:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return await drive(client, fx, args.weights, args.concurrency, args.duration, args.seed)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_socket(app, fx: Fixtures, args) -> dict:
+    import httpx
+    import uvicorn
+
+    port = _free_port()
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+            return await drive(client, fx, args.weights, args.concurrency, args.duration, args.seed)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+def prepare_database(args) -> str:
+    """Point the app at the benchmark database (seeding a fresh SQLite file by default)."""
+    url = args.database_url
+    if not url:
+        workdir = Path(tempfile.mkdtemp(prefix="nobroker-bench-"))
+        url = f"sqlite:///{workdir / 'bench.db'}"
+    # These must be set before server.core.config is imported
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ["DEBUG"] = "false"
+    return url
+
+
+def load_fixtures(engine, sample: int = 500) -> Fixtures:
+    from sqlalchemy import select
+    from server.db.seed import SEED_PASSWORD
+    from server.models.model import Property, User, UserType
+
+    with engine.connect() as conn:
+        property_ids = list(conn.execute(select(Property.id).limit(sample)).scalars())
+        cities = list(conn.execute(select(Property.city).distinct()).scalars())
+        tenants = list(conn.execute(select(User.email).where(User.user_type == UserType.TENANT).limit(sample)).scalars())
+        owners = list(conn.execute(
+            select(User.email).join(Property, Property.owner_id == User.id).distinct().limit(sample)
+        ).scalars())
+    if not (property_ids and tenants and owners):
+        raise SystemExit("Benchmark database has no seeded data; run without --no-seed or seed it first.")
+    return Fixtures(property_ids, cities, tenants, owners, SEED_PASSWORD)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP load benchmark for the NoBroker API.")
+    parser.add_argument("--mode", choices=("inprocess", "socket", "both"), default="both")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument("--weights", help="Scenario weights, e.g. search=50,detail=30,tenant=10,owner=10")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="Use an existing database instead of a fresh SQLite file")
+    parser.add_argument("--no-seed", action="store_true", help="Do not load synthetic data")
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--properties", type=int, default=20_000)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed fractional regression")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run as the new baseline")
+    args = parser.parse_args(argv)
+    args.weights = parse_weights(args.weights)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    url = prepare_database(args)
+    for path in (str(REPO_ROOT), str(SERVER_DIR)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    from server.main import app
+    from server.db.database import engine
+    from server.db.seed import SeedSpec, seed_database
+    from server.benchmarks.report import compare_to_baseline, format_table, load_json, save_json
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("server.main").setLevel(logging.WARNING)
+    if not args.no_seed:
+        spec = SeedSpec(
+            users=args.users,
+            properties=args.properties,
+            applications=args.properties * 2,
+            shortlists=args.properties * 3,
+            seed=args.seed,
+        )
+        logger.info("Seeding %s ...", url)
+        seed_database(engine, spec)
+    fixtures = load_fixtures(engine)
+
+    modes = ("inprocess", "socket") if args.mode == "both" else (args.mode,)
+    results = {
+        "config": {
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "weights": args.weights,
+            "database": engine.dialect.name,
+        }
+    }
+    for mode in modes:
+        runner = run_inprocess if mode == "inprocess" else run_socket
+        report = asyncio.run(runner(app, fixtures, args))
+        results[mode] = report
+        logger.info("\n[%s]\n%s", mode, format_table(report))
+
+    save_json(args.output, results)
+    logger.info("Results written to %s", args.output)
+
+    if args.update_baseline:
+        save_json(args.baseline, results)
+        logger.info("Baseline updated at %s", args.baseline)
+        return 0
+
+    baseline = load_json(args.baseline)
+    if baseline is None:
+        logger.info("No baseline at %s; skipping regression check (record one with --update-baseline)", args.baseline)
+        return 0
+    regressions = []
+    for mode in modes:
+        if mode in baseline:
+            regressions += [f"[{mode}] {line}" for line in compare_to_baseline(results[mode], baseline[mode], args.max_regression)]
+    if regressions:
+        logger.error("Regressions beyond %.0f%%:\n%s", args.max_regression * 100, "\n".join(regressions))
+        return 1
+    logger.info("No regressions beyond %.0f%% against %s", args.max_regression * 100, args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
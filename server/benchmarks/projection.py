@@ -0,0 +1,72 @@
+"""
+Benchmark: full ORM hydration vs column-projected Row loading for list pages.
+
+Seeds a throwaway SQLite database, then loads 100- and 1000-row pages of the
+PropertyPublic columns both ways, reporting latency and allocated memory
+(tracemalloc peak while the page is held).
+
+Usage (from the repository root):
+    python -m server.benchmarks.projection --pages 100 1000
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Optional, Sequence
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+
+def _peak_kib(load) -> float:
+    tracemalloc.start()
+    page = load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del page
+    return peak / 1024
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Full ORM vs projected list loading")
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--properties", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from server.db.seed import SeedSpec, seed_database
+    from server.schemas.schema import PropertyPublic
+    from server.services.property_service import PropertyService
+
+    engine = create_engine(f"sqlite:///{Path(tempfile.mkdtemp()) / 'projection.db'}")
+    seed_database(engine, SeedSpec(users=1000, properties=args.properties, applications=0, shortlists=0), password_hash="x")
+    Session = sessionmaker(bind=engine)
+    columns = PropertyService.columns_for(PropertyPublic.model_fields)
+
+    def full(limit):
+        with Session() as db:
+            return PropertyService.get_all_properties(db, limit=limit)
+
+    def projected(limit):
+        with Session() as db:
+            return PropertyService.get_all_properties(db, limit=limit, columns=columns)
+
+    print(f"{'rows':>6} {'orm ms':>9} {'rows ms':>9} {'orm KiB':>9} {'rows KiB':>9}")
+    for limit in args.pages:
+        number = max(1, 5_000 // limit)
+        orm_s = min(timeit.repeat(lambda: full(limit), number=number, repeat=args.repeat)) / number
+        row_s = min(timeit.repeat(lambda: projected(limit), number=number, repeat=args.repeat)) / number
+        print(
+            f"{limit:>6} {1000 * orm_s:>9.2f} {1000 * row_s:>9.2f} "
+            f"{_peak_kib(lambda: full(limit)):>9.0f} {_peak_kib(lambda: projected(limit)):>9.0f}"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
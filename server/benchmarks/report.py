@@ -0,0 +1,90 @@
+"""
+Latency/throughput summaries and baseline comparison for benchmark runs.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (pct in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> dict:
+    """Build the report dict: per-endpoint throughput and p50/p95/p99 in milliseconds."""
+    endpoints = {}
+    total = 0
+    for name in sorted(latencies):
+        samples = latencies[name]
+        total += len(samples)
+        endpoints[name] = {
+            "count": len(samples),
+            "errors": errors.get(name, 0),
+            "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(1000 * sum(samples) / len(samples), 3) if samples else 0.0,
+            "p50_ms": round(1000 * percentile(samples, 50), 3),
+            "p95_ms": round(1000 * percentile(samples, 95), 3),
+            "p99_ms": round(1000 * percentile(samples, 99), 3),
+        }
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": total,
+        "errors": sum(errors.values()),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, max_regression: float) -> List[str]:
+    """
+    Return human-readable regressions where p95 latency grew, or throughput fell,
+    by more than ``max_regression`` (a fraction, e.g. 0.2 for 20%).
+    """
+    regressions = []
+    for name, current in report["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + max_regression):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.2f}ms vs baseline {previous['p95_ms']:.2f}ms"
+            )
+    if baseline.get("throughput_rps") and report["throughput_rps"] < baseline["throughput_rps"] * (1 - max_regression):
+        regressions.append(
+            f"overall throughput {report['throughput_rps']:.1f} rps vs baseline {baseline['throughput_rps']:.1f} rps"
+        )
+    return regressions
+
+
+def format_table(report: dict) -> str:
+    lines = [
+        f"{'endpoint':<40} {'count':>7} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+    ]
+    for name, row in report["endpoints"].items():
+        lines.append(
+            f"{name:<40} {row['count']:>7} {row['errors']:>5} {row['throughput_rps']:>9.1f} "
+            f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+        )
+    lines.append(
+        f"total: {report['requests']} requests, {report['errors']} errors, "
+        f"{report['throughput_rps']:.1f} rps over {report['elapsed_s']:.1f}s"
+    )
+    return "\n".join(lines)
+
+
+def load_json(path: Path) -> Optional[dict]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
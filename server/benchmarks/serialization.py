@@ -0,0 +1,75 @@
+"""
+Microbenchmark: per-row cost of list endpoint serialization.
+
+Compares FastAPI's default path (build a validated model per row, validate the
+list again against ``response_model``, encode with the stdlib ``json``) with the
+fast path in ``server.api.responses`` (``model_construct`` + cached TypeAdapter).
+
+Usage (from the repository root):
+    python -m server.benchmarks.serialization --rows 100 1000
+"""
+
+import argparse
+import json
+import os
+import timeit
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List, Optional, Sequence
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+
+def _rows(n: int):
+    return [
+        SimpleNamespace(
+            id=i, owner_id=1, name=f"2BHK Apartment {i}", address=f"{i}/4, MG Road", city="Bengaluru", state="KA",
+            pincode="560001", price=25000.0 + i, bedrooms=2, bathrooms=2, area_sqft=1100,
+            description="Well ventilated, close to transit and markets. " * 3, status=None,
+            created_at=datetime(2025, 1, 1), updated_at=None,
+        )
+        for i in range(n)
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    from server.api.responses import construct, dump_list
+    from server.schemas.schema import PropertyPublic
+
+    validator = TypeAdapter(List[PropertyPublic])
+
+    def default_path(rows):
+        items = [
+            PropertyPublic(
+                name=p.name, address=p.address, city=p.city, state=p.state, pincode=p.pincode, price=p.price,
+                bedrooms=p.bedrooms, bathrooms=p.bathrooms, area_sqft=p.area_sqft, description=p.description,
+            )
+            for p in rows
+        ]
+        # response_model validation followed by JSONResponse rendering
+        content = jsonable_encoder(validator.dump_python(validator.validate_python(items), mode="json"))
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+    def fast_path(rows):
+        return dump_list(PropertyPublic, (construct(PropertyPublic, p) for p in rows))
+
+    print(f"{'rows':>6} {'default µs/row':>15} {'fast µs/row':>12} {'speedup':>8}")
+    for n in args.rows:
+        rows = _rows(n)
+        assert default_path(rows) == fast_path(rows)
+        number = max(1, 20_000 // n)
+        default = min(timeit.repeat(lambda: default_path(rows), number=number, repeat=args.repeat)) / number
+        fast = min(timeit.repeat(lambda: fast_path(rows), number=number, repeat=args.repeat)) / number
+        print(f"{n:>6} {1e6 * default / n:>15.2f} {1e6 * fast / n:>12.2f} {default / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: full PropertyPublic pages vs sparse fieldsets (``?fields=``).
+
+Seeds a throwaway SQLite database, gives every listing a long description, then
+requests search pages and detail views through the app in-process, with all fields
+and with a card-sized selection, reporting response bytes and latency.
+
+Usage (from the repository root):
+    python -m server.benchmarks.sparse_fields --pages 20 100 --description-bytes 4000
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+
+CARD_FIELDS = "name,price,city,bedrooms"
+
+
+def _measure(client, url: str, params: dict, repeat: int):
+    """Median latency (ms) and body size (bytes) of uncached GETs."""
+    samples, size = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url, params=params)
+        samples.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        size = len(response.content)
+    return statistics.median(samples), size
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--properties", type=int, default=5_000)
+    parser.add_argument("--description-bytes", type=int, default=4_000)
+    parser.add_argument("--fields", default=CARD_FIELDS)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    # These must be set before server.core.config is imported
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp(prefix='nobroker-sparse-')) / 'sparse.db'}"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ["DEBUG"] = "false"
+    if str(SERVER_DIR) not in sys.path:
+        sys.path.insert(0, str(SERVER_DIR))
+    logging.basicConfig(level=logging.WARNING)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import update
+    from sqlalchemy.orm import Session
+
+    from server.db.database import create_tables, engine
+    from server.db.seed import SeedSpec, seed_database
+    from server.main import app
+    from server.models.model import Property
+    from server.services.property_service import PropertyService
+
+    create_tables()
+    seed_database(engine, SeedSpec(users=500, properties=args.properties, applications=0, shortlists=0), password_hash="x")
+    description = ("Spacious, sunlit rooms close to transit, schools and markets. " * 100)[: args.description_bytes]
+    with Session(bind=engine) as db:
+        db.execute(update(Property).values(description=description))
+        db.commit()
+        PropertyService.backfill_public_projection(db, rebuild=True)
+        property_id = db.query(Property.id).first().id
+
+    client = TestClient(app)
+    print(f"description: {args.description_bytes} bytes; sparse fields: {args.fields}")
+    print(f"{'request':<22} {'full KiB':>9} {'sparse KiB':>11} {'full ms':>9} {'sparse ms':>10}")
+    rows = [(f"search limit={n}", "/properties/", {"limit": n}) for n in args.pages]
+    rows.append(("detail", f"/properties/{property_id}", {}))
+    for label, url, params in rows:
+        full_ms, full_size = _measure(client, url, params, args.repeat)
+        sparse_ms, sparse_size = _measure(client, url, {**params, "fields": args.fields}, args.repeat)
+        print(
+            f"{label:<22} {full_size / 1024:>9.1f} {sparse_size / 1024:>11.1f} "
+            f"{full_ms:>9.2f} {sparse_ms:>10.2f}"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+In-process response cache with a byte budget, stale-while-revalidate and
+single-flight loading.
+
+An entry is fresh for ``ttl`` seconds and may then be served stale for another
+``stale_ttl`` seconds while one background thread reloads it. Concurrent misses
+on the same key wait for a single load instead of each querying the database.
+Values are ``(payload bytes, extra)`` pairs; only the payload counts towards
+``max_bytes``, plus a fixed per-entry overhead.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from server.core.config import settings
+from server.core.invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+# Rough cost of the key, tuple and OrderedDict node behind each entry
+ENTRY_OVERHEAD = 200
+
+Value = Tuple[bytes, Any]
+
+
+@dataclass
+class _Entry:
+    value: Value
+    size: int
+    loaded_at: float
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Optional[Value] = None
+    error: Optional[BaseException] = None
+    # Set by invalidate() while the load runs: hand the result to waiters but don't store it
+    discarded: bool = False
+
+
+class DetailCache:
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._bytes = 0
+        self._stats = dict.fromkeys(
+            ("hits", "stale_hits", "misses", "coalesced", "loads", "load_errors", "evictions", "invalidations"), 0
+        )
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Value]) -> Value:
+        """Return the cached value for ``key``, calling ``loader`` at most once per key at a time.
+
+        ``loader`` may run on a background thread (stale refresh), so it must not use
+        request-scoped resources such as the request's DB session.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = self._clock() - entry.loaded_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry.value
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._stats["stale_hits"] += 1
+                    if key not in self._flights:
+                        flight = self._flights[key] = _Flight()
+                        threading.Thread(target=self._load, args=(key, loader, flight, True), daemon=True).start()
+                    return entry.value
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                self._stats["misses"] += 1
+                flight = self._flights[key] = _Flight()
+                leader = True
+
+        if leader:
+            self._load(key, loader, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _load(self, key: Hashable, loader: Callable[[], Value], flight: _Flight, background: bool = False) -> None:
+        try:
+            flight.value = loader()
+        except BaseException as exc:  # handed to every waiter
+            flight.error = exc
+            if background:
+                # Nobody is waiting; the stale entry keeps being served until it expires
+                logger.warning("Background refresh of %r failed: %s", key, exc)
+        with self._lock:
+            self._stats["loads"] += 1
+            if flight.error is not None:
+                self._stats["load_errors"] += 1
+            elif not flight.discarded:
+                self._store(key, flight.value)
+            del self._flights[key]
+        flight.done.set()
+
+    def _store(self, key: Hashable, value: Value) -> None:
+        self._drop(key)
+        size = len(value[0]) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        self._entries[key] = _Entry(value, size, self._clock())
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self._stats["evictions"] += 1
+
+    def _drop(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop ``key`` and discard any load of it already in flight."""
+        with self._lock:
+            self._drop(key)
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.discarded = True
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for flight in self._flights.values():
+                flight.discarded = True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            entries, used = len(self._entries), self._bytes
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"] + stats["coalesced"]
+        served = stats["hits"] + stats["stale_hits"]
+        return {
+            **stats,
+            "entries": entries,
+            "bytes": used,
+            "max_bytes": self.max_bytes,
+            "hit_ratio": served / lookups if lookups else 0.0,
+        }
+
+
+# Serialized public property details: property id -> (PropertyPublic JSON, last-modified time)
+property_detail_cache = DetailCache(
+    max_bytes=settings.DETAIL_CACHE_MAX_BYTES,
+    ttl=settings.DETAIL_CACHE_TTL_SECONDS,
+    stale_ttl=settings.DETAIL_CACHE_STALE_SECONDS,
+)
+invalidation_bus.subscribe("property", property_detail_cache.invalidate, reset=property_detail_cache.clear)
@@ -35,6 +35,83 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # HTTP caching: max-age (seconds) for public listing responses; ETags revalidate after it
+    PUBLIC_CACHE_MAX_AGE: int = 60
+
+    # In-process property detail cache (per worker): byte budget, freshness and stale-while-revalidate window
+    DETAIL_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    DETAIL_CACHE_TTL_SECONDS: float = 30.0
+    DETAIL_CACHE_STALE_SECONDS: float = 300.0
+
+    # Idempotency-Key replay store (per worker): how long first responses are kept, and its byte budget
+    IDEMPOTENCY_TTL_SECONDS: float = 24 * 3600.0
+    IDEMPOTENCY_MAX_BYTES: int = 16 * 1024 * 1024
+
+    # Cross-worker cache invalidation: local | unix | postgres | redis
+    # INVALIDATION_URL is the socket directory, DSN (defaults to DATABASE_URL) or Redis URL
+    INVALIDATION_TRANSPORT: str = "local"
+    INVALIDATION_URL: Optional[str] = None
+    INVALIDATION_CHANNEL: str = "nobroker_invalidation"
+
+    # Built React client served at / when this directory exists (the Docker image sets it)
+    STATIC_FILES_DIR: Optional[str] = None
+
+    # Production launcher (python -m server.launcher); WEB_CONCURRENCY defaults to the CPU count
+    HOST: str = "127.0.0.1"
+    PORT: int = 8000
+    WEB_CONCURRENCY: Optional[int] = None
+    MAX_REQUESTS: int = 10000
+    MAX_REQUESTS_JITTER: int = 1000
+    GRACEFUL_TIMEOUT: int = 30
+
+    # Featured home feed: size, candidate pool per signal, background refresh interval (seconds)
+    FEATURED_LIMIT: int = 20
+    FEATURED_CANDIDATES: int = 500
+    FEATURED_REFRESH_SECONDS: float = 60.0
+
+    # Server-Sent Events (GET /applications/stream): idle heartbeat, replay buffer for Last-Event-ID
+    # resume (events across all users), and how far a client may fall behind before it is disconnected
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_REPLAY_EVENTS: int = 1000
+    SSE_QUEUE_SIZE: int = 100
+
+    # POST /batch: sub-requests per batch, and how many of its reads run at once (each holds a pooled connection)
+    BATCH_MAX_ITEMS: int = 20
+    BATCH_MAX_CONCURRENCY: int = 4
+
+    # POST /properties/bulk: rows per multi-row INSERT (and per commit in chunked mode), rows per
+    # import, and how many per-row errors the report lists
+    BULK_IMPORT_CHUNK_SIZE: int = 500
+    BULK_IMPORT_MAX_ROWS: int = 50000
+    BULK_IMPORT_MAX_ERRORS: int = 100
+
+    # DELETE /properties/{id}: with soft delete the listing is hidden at once and its applications,
+    # shortlists and row are purged by a background job, this many rows per transaction
+    PROPERTY_SOFT_DELETE: bool = False
+    PROPERTY_PURGE_BATCH_SIZE: int = 500
+
+    # Archival (python -m server.db.archive or the archive.run job): rented listings untouched for this
+    # many days, and rejected applications older than this, move to the *_archive tables in batches
+    ARCHIVE_RENTED_AFTER_DAYS: int = 180
+    ARCHIVE_REJECTED_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 500
+
+    # Popularity counters on properties (shortlist, application and view counts): "buffered" collects
+    # per-worker deltas and flushes them every POPULARITY_FLUSH_SECONDS as one batched UPDATE;
+    # "exact" increments the row in the write's own transaction
+    POPULARITY_COUNTERS: str = "buffered"
+    POPULARITY_FLUSH_SECONDS: float = 5.0
+
+    # Background jobs: worker threads per API worker (0 when running python -m server.worker instead),
+    # idle poll interval, retries with exponential backoff, lock expiry for crashed workers, done-job retention
+    JOB_WORKERS: int = 1
+    JOB_POLL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_SECONDS: float = 2.0
+    JOB_BACKOFF_MAX_SECONDS: float = 600.0
+    JOB_LOCK_TIMEOUT_SECONDS: float = 600.0
+    JOB_RETENTION_SECONDS: float = 7 * 24 * 3600.0
+
     def model_post_init(self, __context: object) -> None:
         # If DATABASE_URL is not supplied, try to construct it from parts
         if not self.DATABASE_URL:
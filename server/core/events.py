@@ -0,0 +1,158 @@
+"""
+In-process pub/sub hub for Server-Sent Events.
+
+``publish(key, event, data)`` stamps the event with an id and sends it over the
+invalidation bus, so it reaches subscribers in every worker; each worker's hub then
+hands it to the subscribers registered for ``key`` (e.g. a tenant id). Subscribers
+are asyncio queues read by streaming responses: an idle connection costs one queue
+and one suspended coroutine on the event loop, and holds no DB connection.
+
+The last ``replay_size`` events (all keys) are kept so a reconnecting client can
+resume after its ``Last-Event-ID``. When that id is older than the buffer, or
+the bus may have lost events, subscribers get a ``reset`` event and should refetch.
+A subscriber that falls ``queue_size`` events behind is disconnected and resumes
+the same way.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Set
+
+from server.core.config import settings
+from server.core.invalidation import invalidation_bus
+
+RESET = "reset"
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    key: Any
+    event: str
+    data: Dict[str, Any]
+
+    def encode(self) -> bytes:
+        return f"id: {self.id}\nevent: {self.event}\ndata: {json.dumps(self.data)}\n\n".encode()
+
+
+class Subscription:
+    def __init__(self, key: Any, queue_size: int):
+        self.key = key
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, event: Optional[Event]) -> None:
+        """Queue ``event`` (None ends the stream); runs on the subscriber's loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind: end the stream; the client resumes from its Last-Event-ID
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def next(self, timeout: float) -> Optional[Event]:
+        """Next event, or None when the stream should end; raises TimeoutError after ``timeout``."""
+        return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+
+
+class EventHub:
+    def __init__(self, topic: str, replay_size: int, queue_size: int, bus=invalidation_bus):
+        self.topic = topic
+        self.queue_size = queue_size
+        self.bus = bus
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Any, Set[Subscription]] = defaultdict(set)
+        self._replay: Deque[Event] = deque(maxlen=replay_size)
+        # Ids at or below this may have been evicted from (or predate) the replay buffer
+        self._replay_floor = time.time_ns()
+        self._last_id = 0
+        self._stats = dict.fromkeys(("published", "delivered", "resets"), 0)
+        bus.subscribe(topic, self._deliver, reset=self.reset)
+
+    def _next_id(self) -> int:
+        with self._lock:
+            self._last_id = max(time.time_ns(), self._last_id + 1)
+            self._stats["published"] += 1
+            return self._last_id
+
+    def publish(self, key: Any, event: str, data: Dict[str, Any]) -> int:
+        """Send ``event`` to ``key``'s subscribers in every worker; safe to call from any thread."""
+        event_id = self._next_id()
+        self.bus.publish(self.topic, {"id": event_id, "key": key, "event": event, "data": data})
+        return event_id
+
+    def _deliver(self, message: Dict[str, Any]) -> None:
+        event = Event(id=int(message["id"]), key=message["key"], event=message["event"], data=message["data"])
+        with self._lock:
+            if len(self._replay) == self._replay.maxlen:
+                self._replay_floor = max(self._replay_floor, self._replay[0].id)
+            self._replay.append(event)
+            subscribers = list(self._subscribers.get(event.key, ()))
+            self._stats["delivered"] += len(subscribers)
+        for sub in subscribers:
+            self._send(sub, event)
+
+    @staticmethod
+    def _send(sub: Subscription, event: Optional[Event]) -> None:
+        try:
+            sub.loop.call_soon_threadsafe(sub.offer, event)
+        except RuntimeError:
+            pass  # loop already closed (shutdown)
+
+    def subscribe(self, key: Any, last_event_id: Optional[int] = None) -> Subscription:
+        """Register a subscriber for ``key`` on the running loop, queueing what it missed since ``last_event_id``."""
+        sub = Subscription(key, self.queue_size)
+        with self._lock:
+            if last_event_id is not None:
+                if last_event_id < self._replay_floor:
+                    sub.offer(Event(id=self._replay_floor, key=key, event=RESET, data={}))
+                for event in self._replay:
+                    if event.key == key and event.id > last_event_id:
+                        sub.offer(event)
+            self._subscribers[key].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.key)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.key]
+
+    def reset(self) -> None:
+        """Events may have been missed (bus reconnect): tell every subscriber to refetch."""
+        with self._lock:
+            subscribers = [sub for subs in self._subscribers.values() for sub in subs]
+            self._replay.clear()
+            self._replay_floor = self._last_id = max(time.time_ns(), self._last_id + 1)
+            self._stats["resets"] += 1
+        for sub in subscribers:
+            self._send(sub, Event(id=self._replay_floor, key=sub.key, event=RESET, data={}))
+
+    def disconnect_all(self) -> None:
+        """End every open stream, e.g. before a graceful shutdown; clients reconnect elsewhere."""
+        with self._lock:
+            subscribers = [sub for subs in self._subscribers.values() for sub in subs]
+        for sub in subscribers:
+            self._send(sub, None)
+
+    def subscriber_count(self, key: Any = None) -> int:
+        with self._lock:
+            if key is not None:
+                return len(self._subscribers.get(key, ()))
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "subscribers": sum(len(s) for s in self._subscribers.values()), "buffered": len(self._replay)}
+
+
+application_events = EventHub(
+    "application_events", replay_size=settings.SSE_REPLAY_EVENTS, queue_size=settings.SSE_QUEUE_SIZE
+)
@@ -0,0 +1,337 @@
+"""
+Cross-worker cache invalidation bus.
+
+Write paths call ``invalidation_bus.publish(topic, key)`` after committing. The
+event is applied to this worker's subscribers at once and broadcast through a
+pluggable transport to every other worker, which applies it on receipt:
+
+- ``local``: no broadcast (single worker; the default)
+- ``unix``: datagrams between workers sharing a directory of Unix sockets (one host; tests)
+- ``postgres``: LISTEN/NOTIFY on the application database
+- ``redis``: Redis-compatible pub/sub (requires the ``redis`` package)
+
+Delivery is best-effort. Events a worker may have missed (a broken listener
+connection) make it reset every subscribed cache instead. Counters and delivery
+lag are reported by ``stats()``.
+"""
+
+import json
+import logging
+import os
+import select
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+
+from server.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+OnMessage = Callable[[bytes], None]
+OnReset = Callable[[], None]
+
+
+class LocalTransport:
+    """No-op transport: events only reach the publishing worker."""
+
+    name = "local"
+
+    def start(self, on_message: OnMessage, on_reset: OnReset, origin: str) -> None:
+        pass
+
+    def send(self, payload: bytes) -> int:
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+class UnixSocketTransport:
+    """Every worker binds ``<directory>/<origin>.sock`` and sends each event to all the others."""
+
+    name = "unix"
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._sock: Optional[socket.socket] = None
+        self._path: Optional[Path] = None
+        self._closed = threading.Event()
+
+    def start(self, on_message: OnMessage, on_reset: OnReset, origin: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path = self.directory / f"{origin}.sock"
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(str(self._path))
+        self._sock.settimeout(0.5)
+        threading.Thread(target=self._listen, args=(on_message,), name="invalidation-unix", daemon=True).start()
+
+    def _listen(self, on_message: OnMessage) -> None:
+        while not self._closed.is_set():
+            try:
+                payload = self._sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            on_message(payload)
+
+    def send(self, payload: bytes) -> int:
+        dropped = 0
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as out:
+            out.setblocking(False)
+            for peer in self.directory.glob("*.sock"):
+                if peer == self._path:
+                    continue
+                try:
+                    out.sendto(payload, str(peer))
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Socket file left behind by a worker that exited
+                    peer.unlink(missing_ok=True)
+                except BlockingIOError:
+                    dropped += 1
+        return dropped
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._sock is not None:
+            self._sock.close()
+        if self._path is not None:
+            self._path.unlink(missing_ok=True)
+
+
+class PostgresTransport:
+    """LISTEN/NOTIFY on a dedicated autocommit connection; reconnects with backoff."""
+
+    name = "postgres"
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self._send_conn = None
+        self._send_lock = threading.Lock()
+        self._closed = threading.Event()
+
+    def _connect(self):
+        import psycopg2
+
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def start(self, on_message: OnMessage, on_reset: OnReset, origin: str) -> None:
+        threading.Thread(
+            target=self._listen, args=(on_message, on_reset), name="invalidation-postgres", daemon=True
+        ).start()
+
+    def _listen(self, on_message: OnMessage, on_reset: OnReset) -> None:
+        backoff = 0.5
+        connected_before = False
+        while not self._closed.is_set():
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                if connected_before:
+                    # Anything sent while we were disconnected is lost
+                    on_reset()
+                connected_before, backoff = True, 0.5
+                while not self._closed.is_set():
+                    if select.select([conn], [], [], 1.0)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            on_message(conn.notifies.pop(0).payload.encode())
+                conn.close()
+            except Exception as exc:
+                logger.warning("Invalidation listener lost its connection: %s", exc)
+                self._closed.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def send(self, payload: bytes) -> int:
+        with self._send_lock:
+            try:
+                if self._send_conn is None or self._send_conn.closed:
+                    self._send_conn = self._connect()
+                with self._send_conn.cursor() as cur:
+                    cur.execute("SELECT pg_notify(%s, %s)", (self.channel, payload.decode()))
+            except Exception:
+                self._send_conn = None
+                raise
+        return 0
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._send_conn is not None:
+            self._send_conn.close()
+
+
+class RedisTransport:
+    """Pub/sub on a Redis-compatible server."""
+
+    name = "redis"
+
+    def __init__(self, url: str, channel: str):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("INVALIDATION_TRANSPORT=redis requires the 'redis' package") from exc
+        self.channel = channel
+        self._client = redis.Redis.from_url(url)
+        self._pubsub = None
+        self._closed = threading.Event()
+
+    def start(self, on_message: OnMessage, on_reset: OnReset, origin: str) -> None:
+        threading.Thread(
+            target=self._listen, args=(on_message, on_reset), name="invalidation-redis", daemon=True
+        ).start()
+
+    def _listen(self, on_message: OnMessage, on_reset: OnReset) -> None:
+        backoff = 0.5
+        connected_before = False
+        while not self._closed.is_set():
+            try:
+                self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                self._pubsub.subscribe(self.channel)
+                if connected_before:
+                    on_reset()
+                connected_before, backoff = True, 0.5
+                while not self._closed.is_set():
+                    message = self._pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        on_message(message["data"])
+            except Exception as exc:
+                if self._closed.is_set():
+                    return
+                logger.warning("Invalidation subscriber lost its connection: %s", exc)
+                self._closed.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def send(self, payload: bytes) -> int:
+        self._client.publish(self.channel, payload)
+        return 0
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+
+class InvalidationBus:
+    def __init__(self, transport=None):
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        self.transport = transport or LocalTransport()
+        self._handlers: Dict[str, List[Callable[[Any], None]]] = defaultdict(list)
+        self._resets: List[OnReset] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._stats = dict.fromkeys(("published", "received", "applied", "dropped", "resets"), 0)
+        self._lag = {"last_ms": 0.0, "max_ms": 0.0, "total_ms": 0.0}
+
+    def subscribe(self, topic: str, handler: Callable[[Any], None], reset: Optional[OnReset] = None) -> None:
+        """Call ``handler(key)`` for every event on ``topic``; ``reset()`` when events may have been missed."""
+        self._handlers[topic].append(handler)
+        if reset is not None:
+            self._resets.append(reset)
+
+    def start(self, transport=None) -> None:
+        """Start receiving from ``transport`` (after fork, once per worker)."""
+        if self._started:
+            return
+        if transport is not None:
+            self.transport = transport
+        # A new process must not share its parent's identity
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        self.transport.start(self._on_message, self._reset, self.origin)
+        self._started = True
+        logger.info("Invalidation bus started with %s transport", self.transport.name)
+
+    def close(self) -> None:
+        if self._started:
+            self.transport.close()
+            self._started = False
+
+    def publish(self, topic: str, key: Any) -> None:
+        """Apply ``topic``/``key`` here and broadcast it to the other workers. Call after commit."""
+        self._apply(topic, key)
+        payload = json.dumps({"topic": topic, "key": key, "origin": self.origin, "sent_at": time.time()}).encode()
+        try:
+            dropped = self.transport.send(payload)
+        except Exception as exc:
+            logger.warning("Failed to broadcast invalidation %s:%r: %s", topic, key, exc)
+            dropped = 1
+        with self._lock:
+            self._stats["published"] += 1
+            self._stats["dropped"] += dropped
+
+    def _on_message(self, payload: bytes) -> None:
+        try:
+            event = json.loads(payload)
+            topic, key, origin, sent_at = event["topic"], event["key"], event["origin"], float(event["sent_at"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Dropping malformed invalidation event: %r", payload[:200])
+            with self._lock:
+                self._stats["dropped"] += 1
+            return
+        if origin == self.origin:
+            return
+        lag_ms = max(0.0, (time.time() - sent_at) * 1000)
+        with self._lock:
+            self._stats["received"] += 1
+            self._lag["last_ms"] = lag_ms
+            self._lag["max_ms"] = max(self._lag["max_ms"], lag_ms)
+            self._lag["total_ms"] += lag_ms
+        self._apply(topic, key)
+
+    def _apply(self, topic: str, key: Any) -> None:
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(key)
+            except Exception:
+                logger.exception("Invalidation handler for %s failed", topic)
+        with self._lock:
+            self._stats["applied"] += 1
+
+    def _reset(self) -> None:
+        for reset in self._resets:
+            reset()
+        with self._lock:
+            self._stats["resets"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            lag = dict(self._lag)
+        received = stats["received"]
+        return {
+            "transport": self.transport.name,
+            "origin": self.origin,
+            **stats,
+            "lag_ms": {
+                "last": lag["last_ms"],
+                "max": lag["max_ms"],
+                "mean": lag["total_ms"] / received if received else 0.0,
+            },
+        }
+
+
+def transport_from_settings():
+    kind = settings.INVALIDATION_TRANSPORT
+    channel = settings.INVALIDATION_CHANNEL
+    if kind == "local":
+        return LocalTransport()
+    if kind == "unix":
+        return UnixSocketTransport(settings.INVALIDATION_URL or "/tmp/nobroker-invalidation")
+    if kind == "postgres":
+        url = make_url(settings.INVALIDATION_URL or settings.DATABASE_URL)
+        return PostgresTransport(url.set(drivername="postgresql").render_as_string(hide_password=False), channel)
+    if kind == "redis":
+        return RedisTransport(settings.INVALIDATION_URL or "redis://localhost:6379/0", channel)
+    raise ValueError(f"Unknown INVALIDATION_TRANSPORT: {kind}")
+
+
+invalidation_bus = InvalidationBus()
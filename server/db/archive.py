@@ -0,0 +1,58 @@
+"""
+Move cold rows (long-rented listings, old rejected applications) into the archive tables.
+
+Usage (from the repository root):
+    python -m server.db.archive [--batch-size 500] [--enqueue]
+
+Thresholds come from ARCHIVE_RENTED_AFTER_DAYS and ARCHIVE_REJECTED_AFTER_DAYS.
+``--enqueue`` hands the run to the job workers instead of running it here; schedule
+either form from cron.
+"""
+
+import argparse
+import logging
+from typing import Dict, Optional, Sequence
+
+from server.core.config import settings
+from server.db.database import SessionLocal, create_tables
+from server.services.archive_service import ArchiveService
+from server.services.job_service import JobService
+
+logger = logging.getLogger(__name__)
+
+
+def archive(batch_size: int) -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        return ArchiveService.run(db, batch_size=batch_size)
+    finally:
+        db.close()
+
+
+def enqueue_archive(batch_size: int) -> int:
+    db = SessionLocal()
+    try:
+        job = JobService.enqueue(db, "archive.run", {"batch_size": batch_size})
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--enqueue", action="store_true", help="Run it as a background job instead")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    create_tables()
+    if args.enqueue:
+        logger.info(f"Enqueued archival as job {enqueue_archive(args.batch_size)}")
+    else:
+        moved = archive(args.batch_size)
+        logger.info(f"Archived {moved['properties']} properties and {moved['applications']} applications")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Backfill denormalized data for existing rows.
+
+Usage (from the repository root):
+    python -m server.db.backfill public-projection [--rebuild] [--batch-size 1000] [--enqueue]
+    python -m server.db.backfill owner-stats [--batch-size 1000] [--enqueue]
+    python -m server.db.backfill popularity [--batch-size 1000] [--enqueue]
+
+``--enqueue`` hands the backfill to the job workers instead of running it here.
+``owner-stats`` also corrects drifted dashboard counters; schedule it periodically.
+"""
+
+import argparse
+import logging
+from typing import Optional, Sequence
+
+from server.db.database import SessionLocal, create_tables
+from server.services.job_service import JobService
+from server.services.owner_stats_service import OwnerStatsService
+from server.services.popularity_service import PopularityService
+from server.services.property_service import PropertyService
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_public_projection(batch_size: int, rebuild: bool) -> int:
+    db = SessionLocal()
+    try:
+        return PropertyService.backfill_public_projection(db, batch_size=batch_size, rebuild=rebuild)
+    finally:
+        db.close()
+
+
+def enqueue_backfill_public_projection(batch_size: int, rebuild: bool) -> int:
+    db = SessionLocal()
+    try:
+        job = JobService.enqueue(db, "public_projection.backfill", {"batch_size": batch_size, "rebuild": rebuild})
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+def reconcile_owner_stats(batch_size: int) -> int:
+    db = SessionLocal()
+    try:
+        return OwnerStatsService.reconcile(db, batch_size=batch_size)
+    finally:
+        db.close()
+
+
+def enqueue_reconcile_owner_stats(batch_size: int) -> int:
+    db = SessionLocal()
+    try:
+        job = JobService.enqueue(db, "owner_stats.reconcile", {"batch_size": batch_size})
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+def recount_popularity(batch_size: int) -> int:
+    db = SessionLocal()
+    try:
+        return PopularityService.recount(db, batch_size=batch_size)
+    finally:
+        db.close()
+
+
+def enqueue_recount_popularity(batch_size: int) -> int:
+    db = SessionLocal()
+    try:
+        job = JobService.enqueue(db, "popularity.recount", {"batch_size": batch_size})
+        db.commit()
+        return job.id
+    finally:
+        db.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill denormalized data for existing rows.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    projection = commands.add_parser("public-projection", help="Masked address + PropertyPublic JSON per property")
+    projection.add_argument("--batch-size", type=int, default=1000)
+    projection.add_argument("--rebuild", action="store_true", help="Recompute every row, not just missing ones")
+    projection.add_argument("--enqueue", action="store_true", help="Run it as a background job instead")
+    owner_stats = commands.add_parser("owner-stats", help="Recompute per-owner dashboard counters, fixing drift")
+    owner_stats.add_argument("--batch-size", type=int, default=1000)
+    owner_stats.add_argument("--enqueue", action="store_true", help="Run it as a background job instead")
+    popularity = commands.add_parser("popularity", help="Shortlist and application counts per property")
+    popularity.add_argument("--batch-size", type=int, default=1000)
+    popularity.add_argument("--enqueue", action="store_true", help="Run it as a background job instead")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    create_tables()
+    if args.command == "public-projection" and args.enqueue:
+        job_id = enqueue_backfill_public_projection(args.batch_size, args.rebuild)
+        logger.info(f"Enqueued public projection backfill as job {job_id}")
+    elif args.command == "public-projection":
+        written = backfill_public_projection(args.batch_size, args.rebuild)
+        logger.info(f"Wrote public projection for {written} properties")
+    elif args.command == "owner-stats" and args.enqueue:
+        job_id = enqueue_reconcile_owner_stats(args.batch_size)
+        logger.info(f"Enqueued owner stats reconciliation as job {job_id}")
+    elif args.command == "owner-stats":
+        corrected = reconcile_owner_stats(args.batch_size)
+        logger.info(f"Corrected owner stats for {corrected} owners")
+    elif args.command == "popularity" and args.enqueue:
+        job_id = enqueue_recount_popularity(args.batch_size)
+        logger.info(f"Enqueued popularity recount as job {job_id}")
+    elif args.command == "popularity":
+        written = recount_popularity(args.batch_size)
+        logger.info(f"Recounted popularity for {written} properties")
+
+
+if __name__ == "__main__":
+    main()
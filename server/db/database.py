@@ -1,4 +1,8 @@
-from sqlalchemy import create_engine, text
+import sqlite3
+from fastapi import Request
+from sqlalchemy import MetaData, create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import AddConstraint, CreateColumn, CreateIndex, CreateTable
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from server.core.config import settings
@@ -16,16 +20,29 @@ engine = create_engine(
     echo=settings.DEBUG
 )
 
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores foreign keys, and so ON DELETE rules, unless each connection turns them on
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create Base class for models
 Base = declarative_base()
 
-def get_db() -> Session:
+def get_db(request: Request) -> Session:
     """
     Dependency function to get database session
     """
+    # Sub-requests of POST /batch may run on the batch's session, which it closes itself
+    batch_db = getattr(request.state, "db", None)
+    if batch_db is not None:
+        yield batch_db
+        return
     db = SessionLocal()
     try:
         yield db
@@ -42,11 +59,172 @@ def create_tables():
     """
     try:
         Base.metadata.create_all(bind=engine)
+        # create_all skips tables that already exist; add any columns and indexes they are missing
+        add_missing_columns()
+        migrate_foreign_keys()
+        migrate_sqlite_autoincrement()
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
 
+def add_missing_columns():
+    """
+    Add model columns missing from existing tables. Only additive, nullable (or
+    server-defaulted) columns are handled; anything else needs a real migration.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                if not column.nullable and column.server_default is None:
+                    logger.warning(f"Cannot add NOT NULL column {table.name}.{column.name} without a default")
+                    continue
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+                logger.info(f"Added column {table.name}.{column.name}")
+
+def _ondelete(value):
+    return (value or "NO ACTION").upper()
+
+def migrate_foreign_keys():
+    """
+    Bring the ON DELETE rules of existing foreign keys in line with the models. Postgres
+    drops and re-adds each changed constraint; SQLite cannot alter a constraint in place,
+    so the tables concerned are rebuilt (see _rebuild_sqlite_tables).
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    rebuild = []
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            reflected = {
+                (tuple(fk["constrained_columns"]), fk["referred_table"]): fk
+                for fk in inspector.get_foreign_keys(table.name)
+            }
+            for constraint in table.foreign_key_constraints:
+                key = (tuple(constraint.column_keys), constraint.referred_table.name)
+                current = reflected.get(key)
+                if current is None:
+                    continue
+                if _ondelete(current.get("options", {}).get("ondelete")) == _ondelete(constraint.ondelete):
+                    continue
+                if engine.dialect.name == "sqlite":
+                    if table not in rebuild:
+                        rebuild.append(table)
+                    continue
+                if engine.dialect.name != "postgresql" or not current.get("name"):
+                    logger.warning(
+                        f"Foreign key {table.name}({', '.join(key[0])}) should be ON DELETE {_ondelete(constraint.ondelete)}; "
+                        f"rebuild the table to apply it"
+                    )
+                    continue
+                connection.execute(text(f'ALTER TABLE {table.name} DROP CONSTRAINT "{current["name"]}"'))
+                connection.execute(AddConstraint(constraint))
+                logger.info(f"Set ON DELETE {_ondelete(constraint.ondelete)} on {table.name}({', '.join(key[0])})")
+    _rebuild_sqlite_tables(rebuild)
+
+def _rebuild_sqlite_tables(tables):
+    """
+    Recreate SQLite tables from their models, keeping their rows, in one transaction with
+    foreign keys off (SQLite's documented procedure for changing a table's constraints):
+    create the new table under a temporary name, copy the rows, drop the old table, rename
+    the new one and recreate its indexes. Columns the model no longer has are dropped.
+    """
+    if not tables:
+        return
+    # The new tables' foreign keys must resolve, so copy the whole schema to a scratch MetaData
+    scratch = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(scratch)
+    # AUTOCOMMIT: the pragma is a no-op inside a transaction, so BEGIN/COMMIT are issued by hand
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        try:
+            connection.exec_driver_sql("BEGIN")
+            try:
+                for table in tables:
+                    sequence = _sqlite_sequence(connection, table.name)
+                    present = {c["name"] for c in inspect(connection).get_columns(table.name)}
+                    columns = ", ".join(f'"{c.name}"' for c in table.columns if c.name in present)
+                    new_table = scratch.tables[table.name].to_metadata(scratch, name=f"{table.name}__rebuild")
+                    connection.execute(CreateTable(new_table))
+                    connection.exec_driver_sql(
+                        f'INSERT INTO "{new_table.name}" ({columns}) SELECT {columns} FROM "{table.name}"'
+                    )
+                    connection.exec_driver_sql(f'DROP TABLE "{table.name}"')
+                    connection.exec_driver_sql(f'ALTER TABLE "{new_table.name}" RENAME TO "{table.name}"')
+                    for index in table.indexes:
+                        connection.execute(CreateIndex(index))
+                    # The copy only knows the surviving ids; keep the old high-water mark
+                    _raise_sqlite_sequence(connection, table.name, sequence)
+                    logger.info(f"Rebuilt {table.name} from its model")
+                orphans = connection.exec_driver_sql("PRAGMA foreign_key_check").fetchall()
+                connection.exec_driver_sql("COMMIT")
+            except Exception:
+                connection.exec_driver_sql("ROLLBACK")
+                raise
+        finally:
+            connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+    if orphans:
+        # Rows written while SQLite did not enforce foreign keys; kept, but worth cleaning up
+        tables_with_orphans = sorted({row[0] for row in orphans})
+        logger.warning(
+            f"{len(orphans)} foreign key violations in {', '.join(tables_with_orphans)}; see PRAGMA foreign_key_check"
+        )
+
+def migrate_sqlite_autoincrement():
+    """
+    Without AUTOINCREMENT, SQLite gives a new row the largest id in use plus one, so the
+    id of a deleted last row comes back. Rebuild tables whose model asks for
+    ``sqlite_autoincrement`` but were created without it, and start their sequence after
+    the ids kept in their archive table (``info["archive"]``) as well.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as connection:
+        ddl = dict(connection.exec_driver_sql("SELECT name, sql FROM sqlite_master WHERE type = 'table'").all())
+    tables = [
+        table for table in Base.metadata.sorted_tables
+        if table.dialect_options["sqlite"]["autoincrement"]
+        and table.name in ddl
+        and "AUTOINCREMENT" not in ddl[table.name].upper()
+    ]
+    _rebuild_sqlite_tables(tables)
+    with engine.begin() as connection:
+        for table in tables:
+            archive = table.info.get("archive")
+            if archive in ddl:
+                key = table.primary_key.columns.keys()[0]
+                last = connection.exec_driver_sql(f'SELECT max("{key}") FROM "{archive}"').scalar()
+                _raise_sqlite_sequence(connection, table.name, last)
+
+def _sqlite_sequence(connection, table_name):
+    if not connection.exec_driver_sql("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'").first():
+        return None
+    return connection.exec_driver_sql("SELECT seq FROM sqlite_sequence WHERE name = ?", (table_name,)).scalar()
+
+def _raise_sqlite_sequence(connection, table_name, value):
+    """Make the next AUTOINCREMENT id of ``table_name`` larger than ``value``."""
+    if not value:
+        return
+    current = _sqlite_sequence(connection, table_name)
+    if current is None:
+        connection.exec_driver_sql("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table_name, value))
+    elif current < value:
+        connection.exec_driver_sql("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (value, table_name))
+
 def test_connection():
     """
     Test database connection
@@ -0,0 +1,110 @@
+"""
+Query-plan inspection helpers.
+
+Capture the SQL a block of code emits against an engine, run ``EXPLAIN QUERY PLAN``
+(SQLite) or ``EXPLAIN (FORMAT JSON)`` (Postgres) for each statement, and report
+full-table scans on large tables. Normalized plans hash to a short fingerprint so
+plan changes show up as diffs in review.
+"""
+
+import hashlib
+import json
+import re
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+LARGE_TABLES = ("users", "properties", "applications", "shortlisted_properties")
+
+CapturedStatement = Tuple[str, object]
+
+
+@contextmanager
+def capture_sql(engine: Engine) -> Iterator[List[CapturedStatement]]:
+    """Record every SELECT/UPDATE/DELETE sent to ``engine`` while the block runs."""
+    captured: List[CapturedStatement] = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if verb in ("SELECT", "UPDATE", "DELETE", "WITH") and not executemany:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def _postgres_nodes(node: dict) -> Iterator[dict]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _postgres_nodes(child)
+
+
+def explain(conn: Connection, statement: str, parameters) -> List[str]:
+    """Return the plan for ``statement`` as normalized, human-readable lines."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        return [row[3] for row in rows]
+    if dialect == "postgresql":
+        raw = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        plan = raw if isinstance(raw, list) else json.loads(raw)
+        lines = []
+        for node in _postgres_nodes(plan[0]["Plan"]):
+            line = node["Node Type"]
+            if "Relation Name" in node:
+                line += f" on {node['Relation Name']}"
+            if "Index Name" in node:
+                line += f" using {node['Index Name']}"
+            lines.append(line)
+        return lines
+    raise NotImplementedError(f"EXPLAIN is not supported for dialect '{dialect}'")
+
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)")
+_POSTGRES_SCAN = re.compile(r"^Seq Scan on (\w+)")
+
+
+def full_scans(plan: Iterable[str], tables: Sequence[str] = LARGE_TABLES) -> List[str]:
+    """Tables from ``tables`` that ``plan`` reads with a full (sequential) scan."""
+    found = []
+    for line in plan:
+        match = _SQLITE_SCAN.match(line) or _POSTGRES_SCAN.match(line)
+        if match and match.group(1) in tables:
+            found.append(match.group(1))
+    return found
+
+
+def fingerprint(plans: Iterable[Iterable[str]]) -> str:
+    digest = hashlib.sha1()
+    for plan in plans:
+        for line in plan:
+            digest.update(line.encode())
+            digest.update(b"\n")
+        digest.update(b"--\n")
+    return digest.hexdigest()[:12]
+
+
+def explain_captured(engine: Engine, captured: Sequence[CapturedStatement]) -> List[List[str]]:
+    with engine.connect() as conn:
+        return [explain(conn, statement, parameters) for statement, parameters in captured]
+
+
+def scan_report(
+    plans: Sequence[Sequence[str]],
+    captured: Sequence[CapturedStatement],
+    allow: Optional[Iterable[str]] = None,
+    tables: Sequence[str] = LARGE_TABLES,
+) -> List[str]:
+    """Describe each disallowed full scan together with the statement that caused it."""
+    allowed = set(allow or ())
+    problems = []
+    for plan, (statement, _) in zip(plans, captured):
+        for table in full_scans(plan, tables):
+            if table not in allowed:
+                problems.append(f"full scan of {table}: {' '.join(statement.split())}")
+    return problems
@@ -0,0 +1,410 @@
+"""
+Synthetic dataset generator and bulk loader for load testing.
+
+Generates users, properties, applications and shortlists with a realistic skew
+(hot cities, log-normal rents, power-law popularity per listing) and loads them
+with batched ``executemany`` on SQLite and ``COPY`` on Postgres.
+
+The same seed (and ``--as-of`` date) always produces the same rows, so runs are
+reproducible. Every generated user can log in with ``SEED_PASSWORD``.
+
+Usage (from the repository root):
+    python -m server.db.seed --users 200000 --properties 1000000 --seed 42
+"""
+
+import argparse
+import csv
+import io
+import logging
+import math
+import random
+import time
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from server.core.security import get_password_hash
+from server.db.database import Base
+from server.models.model import User, Property, Application, ShortlistedProperty
+from server.services.property_service import PropertyService
+from server.services.popularity_service import PopularityService
+
+logger = logging.getLogger(__name__)
+
+SEED_PASSWORD = "seed-password"
+
+# (city, state, pincode prefix, median monthly rent for a 1BHK)
+HOT_CITIES: Sequence[Tuple[str, str, str, float]] = (
+    ("Bengaluru", "KA", "560", 18000.0),
+    ("Mumbai", "MH", "400", 32000.0),
+    ("Pune", "MH", "411", 15000.0),
+    ("Delhi", "DL", "110", 22000.0),
+    ("Hyderabad", "TS", "500", 14000.0),
+    ("Chennai", "TN", "600", 13000.0),
+    ("Gurugram", "HR", "122", 24000.0),
+    ("Noida", "UP", "201", 14000.0),
+    ("Kolkata", "WB", "700", 11000.0),
+    ("Ahmedabad", "GJ", "380", 10000.0),
+    ("Jaipur", "RJ", "302", 9000.0),
+    ("Kochi", "KL", "682", 11000.0),
+    ("Chandigarh", "CH", "160", 13000.0),
+    ("Indore", "MP", "452", 8000.0),
+    ("Lucknow", "UP", "226", 8500.0),
+    ("Coimbatore", "TN", "641", 9000.0),
+    ("Nagpur", "MH", "440", 8000.0),
+    ("Mysuru", "KA", "570", 9500.0),
+    ("Bhubaneswar", "OD", "751", 8500.0),
+    ("Visakhapatnam", "AP", "530", 9000.0),
+)
+
+LOCALITIES = (
+    "MG Road", "Indiranagar", "Koramangala", "Andheri West", "Powai", "Baner",
+    "Hinjewadi", "Saket", "Dwarka", "Gachibowli", "Madhapur", "Velachery",
+    "Salt Lake", "Satellite", "Sector 62", "Whitefield", "Bandra East",
+)
+PROPERTY_KINDS = ("Apartment", "Flat", "Villa", "Studio", "Penthouse", "Independent House")
+BEDROOM_WEIGHTS = ((1, 0.25), (2, 0.40), (3, 0.25), (4, 0.08), (5, 0.02))
+
+USER_COLUMNS = ("id", "name", "email", "phone", "password_hash", "user_type", "created_at")
+PROPERTY_COLUMNS = (
+    "id", "owner_id", "name", "address", "city", "state", "pincode", "price", "bedrooms",
+    "bathrooms", "area_sqft", "description", "status", "created_at",
+)
+APPLICATION_COLUMNS = ("id", "property_id", "tenant_id", "status", "created_at")
+SHORTLIST_COLUMNS = ("id", "user_id", "property_id", "created_at")
+
+
+@dataclass
+class SeedSpec:
+    users: int = 10_000
+    owner_ratio: float = 0.2
+    properties: int = 50_000
+    applications: int = 100_000
+    shortlists: int = 150_000
+    seed: int = 42
+    batch_size: int = 10_000
+    as_of: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    )
+
+
+def _zipf_weights(n: int, exponent: float) -> List[float]:
+    return [1.0 / ((rank + 1) ** exponent) for rank in range(n)]
+
+
+def _cumulative(weights: Iterable[float]) -> List[float]:
+    total = 0.0
+    out = []
+    for w in weights:
+        total += w
+        out.append(total)
+    return out
+
+
+def _batched(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _stochastic_round(rng: random.Random, value: float) -> int:
+    base = math.floor(value)
+    return base + (1 if rng.random() < value - base else 0)
+
+
+class DatasetGenerator:
+    """Deterministic row generator. Rows are yielded lazily so memory stays flat."""
+
+    def __init__(self, spec: SeedSpec, password_hash: str, id_offsets: Optional[Dict[str, int]] = None):
+        self.spec = spec
+        self.password_hash = password_hash
+        offsets = id_offsets or {}
+        self.user_offset = offsets.get("users", 0)
+        self.property_offset = offsets.get("properties", 0)
+        self.application_offset = offsets.get("applications", 0)
+        self.shortlist_offset = offsets.get("shortlisted_properties", 0)
+
+        self.n_owners = max(1, int(spec.users * spec.owner_ratio))
+        self.n_tenants = max(1, spec.users - self.n_owners)
+        self._city_cum = _cumulative(_zipf_weights(len(HOT_CITIES), 1.1))
+        # Agencies own many listings: owner popularity follows a power law too
+        self._owner_cum = _cumulative(_zipf_weights(self.n_owners, 0.8))
+        self._bedroom_cum = _cumulative(w for _, w in BEDROOM_WEIGHTS)
+        # Per-listing popularity drives both applications and shortlists
+        self._popularity: Optional[array] = None
+
+    def _rng(self, stream: str) -> random.Random:
+        # Independent stream per table keeps each table reproducible on its own
+        return random.Random(f"{self.spec.seed}:{stream}")
+
+    def _timestamp(self, rng: random.Random, max_days: int = 365) -> datetime:
+        return self.spec.as_of - timedelta(seconds=rng.randrange(max_days * 86400))
+
+    # ---- users ----
+    def owner_id(self, index: int) -> int:
+        return self.user_offset + 1 + index
+
+    def tenant_id(self, index: int) -> int:
+        return self.user_offset + 1 + self.n_owners + index
+
+    def users(self) -> Iterator[tuple]:
+        rng = self._rng("users")
+        for i in range(self.n_owners + self.n_tenants):
+            uid = self.user_offset + 1 + i
+            user_type = "OWNER" if i < self.n_owners else "TENANT"
+            yield (
+                uid,
+                f"Seed User {uid}",
+                f"seed.user{uid}@example.com",
+                f"9{rng.randrange(10 ** 9):09d}",
+                self.password_hash,
+                user_type,
+                self._timestamp(rng, 730),
+            )
+
+    # ---- properties ----
+    def properties(self) -> Iterator[tuple]:
+        rng = self._rng("properties")
+        bedroom_values = [b for b, _ in BEDROOM_WEIGHTS]
+        for i in range(self.spec.properties):
+            pid = self.property_offset + 1 + i
+            city, state, pin_prefix, base_rent = HOT_CITIES[
+                rng.choices(range(len(HOT_CITIES)), cum_weights=self._city_cum)[0]
+            ]
+            owner_index = rng.choices(range(self.n_owners), cum_weights=self._owner_cum)[0]
+            bedrooms = rng.choices(bedroom_values, cum_weights=self._bedroom_cum)[0]
+            bathrooms = max(1, bedrooms - rng.randrange(2))
+            area = int(bedrooms * rng.gauss(480, 90)) + 150
+            # Log-normal rent around the city median, scaled by size
+            price = round(base_rent * (0.75 + 0.45 * bedrooms) * rng.lognormvariate(0.0, 0.35), -2)
+            locality = LOCALITIES[rng.randrange(len(LOCALITIES))]
+            kind = PROPERTY_KINDS[rng.randrange(len(PROPERTY_KINDS))]
+            description = None
+            if rng.random() < 0.85:
+                description = (
+                    f"{bedrooms}BHK {kind.lower()} in {locality}, "
+                    f"{city}. " + "Well ventilated, close to transit and markets. " * rng.randrange(1, 6)
+                ).strip()
+            yield (
+                pid,
+                self.owner_id(owner_index),
+                f"{bedrooms}BHK {kind} in {locality}",
+                f"{rng.randrange(1, 999)}/{rng.randrange(1, 40)}, {locality}",
+                city,
+                state,
+                f"{pin_prefix}{rng.randrange(1000):03d}",
+                float(max(price, 2000.0)),
+                bedrooms,
+                bathrooms,
+                max(area, 250),
+                description,
+                "RENTED" if rng.random() < 0.18 else "AVAILABLE",
+                self._timestamp(rng),
+            )
+
+    def _popularity_weights(self) -> array:
+        if self._popularity is None:
+            rng = self._rng("popularity")
+            self._popularity = array("d", (rng.paretovariate(1.5) for _ in range(self.spec.properties)))
+        return self._popularity
+
+    def _per_listing(self, stream: str, target: int) -> Iterator[Tuple[int, List[int]]]:
+        """Yield (property_id, distinct tenant ids) with a power-law count per listing."""
+        rng = self._rng(stream)
+        weights = self._popularity_weights()
+        total_weight = sum(weights) or 1.0
+        scale = target / total_weight
+        for i, w in enumerate(weights):
+            count = min(self.n_tenants, _stochastic_round(rng, w * scale))
+            if count:
+                yield self.property_offset + 1 + i, rng.sample(range(self.n_tenants), count)
+
+    # ---- applications ----
+    def applications(self) -> Iterator[tuple]:
+        rng = self._rng("application-status")
+        statuses = ("SENT", "VIEWED", "ACCEPTED", "REJECTED")
+        status_cum = _cumulative((0.55, 0.25, 0.05, 0.15))
+        next_id = self.application_offset + 1
+        for property_id, tenants in self._per_listing("applications", self.spec.applications):
+            for tenant_index in tenants:
+                yield (
+                    next_id,
+                    property_id,
+                    self.tenant_id(tenant_index),
+                    rng.choices(statuses, cum_weights=status_cum)[0],
+                    self._timestamp(rng, 180),
+                )
+                next_id += 1
+
+    # ---- shortlists ----
+    def shortlists(self) -> Iterator[tuple]:
+        rng = self._rng("shortlist-time")
+        next_id = self.shortlist_offset + 1
+        for property_id, tenants in self._per_listing("shortlists", self.spec.shortlists):
+            for tenant_index in tenants:
+                yield (next_id, self.tenant_id(tenant_index), property_id, self._timestamp(rng, 180))
+                next_id += 1
+
+
+# -------------------- loaders --------------------
+
+def _sqlite_value(value):
+    # Matches SQLAlchemy's SQLite DateTime storage format
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+    return value
+
+
+def _load_sqlite(dbapi_conn, table: str, columns: Sequence[str], batches: Iterable[List[tuple]]) -> int:
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    cursor = dbapi_conn.cursor()
+    total = 0
+    for batch in batches:
+        cursor.executemany(sql, [tuple(_sqlite_value(v) for v in row) for row in batch])
+        dbapi_conn.commit()
+        total += len(batch)
+    cursor.close()
+    return total
+
+
+def _load_postgres(dbapi_conn, table: str, columns: Sequence[str], batches: Iterable[List[tuple]]) -> int:
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = dbapi_conn.cursor()
+    total = 0
+    for batch in batches:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in batch:
+            writer.writerow(
+                ["" if v is None else (v.isoformat() if isinstance(v, datetime) else v) for v in row]
+            )
+        buf.seek(0)
+        cursor.copy_expert(sql, buf)
+        dbapi_conn.commit()
+        total += len(batch)
+    # Keep SERIAL sequences ahead of the explicit ids we inserted
+    cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))")
+    dbapi_conn.commit()
+    cursor.close()
+    return total
+
+
+def _load_generic(engine: Engine, table: str, columns: Sequence[str], batches: Iterable[List[tuple]]) -> int:
+    # Fallback for other dialects: Core executemany without raw type handling
+    sa_table = Base.metadata.tables[table]
+    total = 0
+    with engine.begin() as conn:
+        for batch in batches:
+            conn.execute(sa_table.insert(), [dict(zip(columns, row)) for row in batch])
+            total += len(batch)
+    return total
+
+
+def _max_ids(engine: Engine) -> Dict[str, int]:
+    with engine.connect() as conn:
+        return {
+            model.__tablename__: conn.execute(select(func.coalesce(func.max(model.id), 0))).scalar_one()
+            for model in (User, Property, Application, ShortlistedProperty)
+        }
+
+
+def seed_database(engine: Engine, spec: SeedSpec, password_hash: Optional[str] = None) -> Dict[str, int]:
+    """Generate and bulk load a dataset. Returns the number of rows loaded per table."""
+    Base.metadata.create_all(bind=engine)
+    generator = DatasetGenerator(
+        spec,
+        password_hash or get_password_hash(SEED_PASSWORD),
+        id_offsets=_max_ids(engine),
+    )
+    plan = (
+        ("users", USER_COLUMNS, generator.users),
+        ("properties", PROPERTY_COLUMNS, generator.properties),
+        ("applications", APPLICATION_COLUMNS, generator.applications),
+        ("shortlisted_properties", SHORTLIST_COLUMNS, generator.shortlists),
+    )
+
+    loaded: Dict[str, int] = {}
+    dialect = engine.dialect.name
+    dbapi_conn = engine.raw_connection() if dialect in ("sqlite", "postgresql") else None
+    try:
+        if dialect == "sqlite":
+            # Durability is irrelevant for a throwaway load; trade it for speed
+            dbapi_conn.cursor().execute("PRAGMA synchronous = OFF")
+        for table, columns, rows in plan:
+            started = time.perf_counter()
+            batches = _batched(rows(), spec.batch_size)
+            if dialect == "sqlite":
+                count = _load_sqlite(dbapi_conn, table, columns, batches)
+            elif dialect == "postgresql":
+                count = _load_postgres(dbapi_conn, table, columns, batches)
+            else:
+                count = _load_generic(engine, table, columns, batches)
+            elapsed = time.perf_counter() - started
+            logger.info("Loaded %d %s rows in %.1fs (%.0f rows/s)", count, table, elapsed, count / max(elapsed, 1e-9))
+            loaded[table] = count
+    finally:
+        if dbapi_conn is not None:
+            dbapi_conn.close()
+
+    # Precompute the public listing projection for the new rows and invalidate search ETags
+    with Session(bind=engine) as db:
+        loaded["public_projection"] = PropertyService.backfill_public_projection(db, batch_size=spec.batch_size)
+        PopularityService.recount(db, batch_size=spec.batch_size)
+        PropertyService.bump_listing_versions(db, [city for (city,) in db.query(Property.city).distinct()])
+        db.commit()
+
+    if dialect == "postgresql":
+        with engine.begin() as conn:
+            for table, _, _ in plan:
+                conn.exec_driver_sql(f"ANALYZE {table}")
+    return loaded
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate and bulk load a synthetic NoBroker dataset.")
+    parser.add_argument("--database-url", help="Target database (defaults to the app's DATABASE_URL)")
+    parser.add_argument("--users", type=int, default=SeedSpec.users)
+    parser.add_argument("--owner-ratio", type=float, default=SeedSpec.owner_ratio)
+    parser.add_argument("--properties", type=int, default=SeedSpec.properties)
+    parser.add_argument("--applications", type=int, default=SeedSpec.applications)
+    parser.add_argument("--shortlists", type=int, default=SeedSpec.shortlists)
+    parser.add_argument("--seed", type=int, default=SeedSpec.seed)
+    parser.add_argument("--batch-size", type=int, default=SeedSpec.batch_size)
+    parser.add_argument("--as-of", type=datetime.fromisoformat, help="Anchor date for generated timestamps (ISO 8601)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from server.db.database import engine
+
+    spec = SeedSpec(
+        users=args.users,
+        owner_ratio=args.owner_ratio,
+        properties=args.properties,
+        applications=args.applications,
+        shortlists=args.shortlists,
+        seed=args.seed,
+        batch_size=args.batch_size,
+    )
+    if args.as_of:
+        spec.as_of = args.as_of if args.as_of.tzinfo else args.as_of.replace(tzinfo=timezone.utc)
+
+    started = time.perf_counter()
+    loaded = seed_database(engine, spec)
+    logger.info("Seeded %s in %.1fs", loaded, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Production entrypoint: a pre-forking supervisor around uvicorn.
+
+The master imports the app once (settings, models, routers), binds the listening
+socket and forks ``--workers`` children that share it, so startup cost and
+read-only memory are paid once. Each worker serves up to ``--max-requests``
+(plus jitter) requests and then exits after finishing them; the master forks a
+replacement. On SIGTERM/SIGINT the master stops replacing workers and forwards
+the signal: uvicorn stops accepting, drains in-flight requests for up to
+``--graceful-timeout`` seconds and runs shutdown hooks; stragglers are killed.
+
+Usage (from the repository root or server/):
+    python -m server.launcher --host 0.0.0.0 --port 8000 --workers 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+SERVER_DIR = Path(__file__).resolve().parent
+# server.main imports `path_setup` from the server directory
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+import uvicorn  # noqa: E402
+
+from server.core.config import settings  # noqa: E402
+
+logger = logging.getLogger("server.launcher")
+
+
+class DrainingServer(uvicorn.Server):
+    # Connections accepted just before the listener closes may not have delivered their
+    # request yet; uvicorn would close them as idle and the client would see a reset
+    ACCEPT_GRACE = 0.25
+
+    async def shutdown(self, sockets=None) -> None:
+        for server in self.servers:
+            server.close()
+        # Event streams never finish on their own; end them so clients reconnect to another worker
+        from server.core.events import application_events
+        application_events.disconnect_all()
+        await asyncio.sleep(self.ACCEPT_GRACE)
+        await super().shutdown(sockets)
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+    def __init__(self, app, sock: socket.socket, args: argparse.Namespace):
+        self.app = app
+        self.sock = sock
+        self.args = args
+        self.workers: Dict[int, float] = {}  # pid -> started at
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = self._run_worker()
+            finally:
+                os._exit(code)
+        self.workers[pid] = time.monotonic()
+
+    def _run_worker(self) -> int:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, signal.SIG_DFL)
+        # Pooled connections must never be shared across processes; drop the parent's
+        # (without closing them under the parent) so this worker opens its own
+        from server.db.database import engine
+        engine.dispose(close=False)
+
+        jitter = random.randint(0, self.args.max_requests_jitter) if self.args.max_requests_jitter else 0
+        config = uvicorn.Config(
+            self.app,
+            lifespan="on",
+            log_level=self.args.log_level,
+            limit_max_requests=(self.args.max_requests + jitter) or None,
+            timeout_graceful_shutdown=self.args.graceful_timeout,
+            timeout_keep_alive=self.args.keep_alive,
+        )
+        server = DrainingServer(config)
+        server.run(sockets=[self.sock])
+        return 0 if server.started else 1
+
+    def stop(self, signum, frame) -> None:
+        if not self.stopping:
+            logger.info("Received %s; draining %d workers", signal.Signals(signum).name, len(self.workers))
+        self.stopping = True
+        for pid in list(self.workers):
+            self._signal(pid, signal.SIGTERM)
+
+    def _signal(self, pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            self.workers.pop(pid, None)
+
+    def _reap(self, block: bool) -> Optional[int]:
+        try:
+            pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+        except ChildProcessError:
+            return None
+        except InterruptedError:
+            return None
+        if pid == 0:
+            return None
+        started = self.workers.pop(pid, None)
+        code = os.waitstatus_to_exitcode(status)
+        if not self.stopping:
+            uptime = time.monotonic() - started if started is not None else 0.0
+            logger.info("Worker %d exited with %d after %.0fs; starting a replacement", pid, code, uptime)
+            if code != 0 and uptime < 1.0:
+                # Crashing on boot: don't fork in a tight loop
+                time.sleep(1.0)
+        return pid
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for _ in range(self.args.workers):
+            self.spawn()
+        logger.info("Serving on %s:%d with %d workers (pid %d)", self.args.host, self.args.port, self.args.workers, os.getpid())
+
+        while not self.stopping:
+            self._reap(block=True)
+            while not self.stopping and len(self.workers) < self.args.workers:
+                self.spawn()
+
+        deadline = time.monotonic() + self.args.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            if self._reap(block=False) is None:
+                time.sleep(0.05)
+        for pid in list(self.workers):
+            logger.warning("Worker %d did not drain in time; killing it", pid)
+            self._signal(pid, signal.SIGKILL)
+            self._reap(block=True)
+        self.sock.close()
+        logger.info("Shut down cleanly")
+        return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY or os.cpu_count() or 1)
+    parser.add_argument("--max-requests", type=int, default=settings.MAX_REQUESTS, help="0 disables recycling")
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.MAX_REQUESTS_JITTER)
+    parser.add_argument("--graceful-timeout", type=int, default=settings.GRACEFUL_TIMEOUT)
+    parser.add_argument("--keep-alive", type=int, default=5)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(process)d %(levelname)s %(message)s")
+
+    # Preload: everything imported here is shared copy-on-write by the workers
+    from server.main import app
+    from server.db.database import engine
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    # Nothing should be connected yet, but never hand pooled connections to a fork
+    engine.dispose()
+    return Supervisor(app, sock, args).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
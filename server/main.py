@@ -1,3 +1,5 @@
+import asyncio
+import os
 import path_setup
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,8 +7,15 @@ from server.api.auth_routes import auth_router
 from server.api.property_routes import property_router, application_router
 from server.api.registereduser_routes import router as registereduser_router
 from server.api.tenant_routes import router as tenant_router
-from server.db.database import create_tables, test_connection
+from server.api.ops_routes import ops_router
+from server.api.batch_routes import batch_router
+from server.api.static_files import mount_client
+from server.db.database import create_tables, engine, test_connection
 from server.core.config import settings
+from server.core.invalidation import invalidation_bus, transport_from_settings
+from server.services.featured_service import featured_feed
+from server.services.job_service import job_worker
+from server.services.popularity_service import popularity_counters
 import logging
 
 # Configure logging
@@ -44,6 +53,31 @@ def on_startup():
         logger.error("Database connection failed. Aborting startup.")
         # In a real application, you might want to exit or prevent the app from starting
         # For now, we'll just log the error.
+    invalidation_bus.start(transport_from_settings())
+
+# Background tasks owned by this worker, cancelled on shutdown
+background_tasks = []
+
+@app.on_event("startup")
+async def start_background_tasks():
+    background_tasks.append(asyncio.create_task(featured_feed.run(engine)))
+    if settings.POPULARITY_COUNTERS != "exact":
+        background_tasks.append(asyncio.create_task(popularity_counters.run(engine)))
+    job_worker.start(engine)
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+    # Write the counter deltas this worker still holds
+    try:
+        await asyncio.to_thread(popularity_counters.flush, engine)
+    except Exception:
+        logger.exception("Final popularity counter flush failed")
+    # Let running jobs finish; anything cut off is requeued once its lock expires
+    await asyncio.to_thread(job_worker.stop, settings.GRACEFUL_TIMEOUT)
+    invalidation_bus.close()
 
 # Include routers
 app.include_router(auth_router)
@@ -51,7 +85,13 @@ app.include_router(property_router)
 app.include_router(application_router)
 app.include_router(registereduser_router)
 app.include_router(tenant_router)
+app.include_router(ops_router)
+app.include_router(batch_router)
 
-@app.get("/")
-def read_root():
-    return {"message": f"Welcome to {settings.APP_NAME}", "version": settings.APP_VERSION}
+if settings.STATIC_FILES_DIR and os.path.isdir(settings.STATIC_FILES_DIR):
+    # Serve the built client; mounted last so every API route matches first
+    mount_client(app, settings.STATIC_FILES_DIR)
+else:
+    @app.get("/")
+    def read_root():
+        return {"message": f"Welcome to {settings.APP_NAME}", "version": settings.APP_VERSION}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Float, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Float, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from server.db.database import Base
@@ -25,17 +25,23 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     properties = relationship("Property", back_populates="owner")
-    applications = relationship("Application", back_populates="tenant")
-    shortlisted_properties = relationship("ShortlistedProperty", back_populates="user")
+    # Dependent rows are removed by ON DELETE CASCADE; the ORM does not load them to delete them
+    applications = relationship("Application", back_populates="tenant", cascade="all, delete", passive_deletes=True)
+    shortlisted_properties = relationship(
+        "ShortlistedProperty", back_populates="user", cascade="all, delete", passive_deletes=True
+    )
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, user_type={self.user_type})>"
 
 class Property(Base):
     __tablename__ = "properties"
+    # Archived listings keep their id, so SQLite must never hand it out again
+    # (see database.migrate_sqlite_autoincrement)
+    __table_args__ = {"sqlite_autoincrement": True, "info": {"archive": "properties_archive"}}
 
     id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     address = Column(String(255), nullable=False)
     city = Column(String(100), nullable=False)
@@ -47,16 +53,39 @@ class Property(Base):
     area_sqft = Column(Integer, nullable=False)
     description = Column(Text, nullable=True)
     status = Column(Enum(PropertyStatus, native_enum=False), nullable=False, default=PropertyStatus.AVAILABLE)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Public projection maintained by PropertyService on write (NULL until backfilled)
+    masked_address = Column(String(255), nullable=True)
+    public_json = Column(Text, nullable=True)
+    # Optimistic concurrency: every update increments it; clients see it as the owner ETag
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Set by a soft delete (PROPERTY_SOFT_DELETE); the row is hidden until the purge job removes it
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    # Popularity counters maintained by PopularityService (buffered deltas or exact increments)
+    shortlist_count = Column(Integer, nullable=False, default=0, server_default="0")
+    application_count = Column(Integer, nullable=False, default=0, server_default="0")
+    view_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     owner = relationship("User", back_populates="properties")
-    applications = relationship("Application", back_populates="property")
-    shortlisted_by = relationship("ShortlistedProperty", back_populates="property")
+    applications = relationship("Application", back_populates="property", cascade="all, delete", passive_deletes=True)
+    shortlisted_by = relationship(
+        "ShortlistedProperty", back_populates="property", cascade="all, delete", passive_deletes=True
+    )
 
     def __repr__(self):
         return f"<Property(id={self.id}, name={self.name})>"
 
+class ListingVersion(Base):
+    """Per-city change counter used to validate cached search results (see PropertyService.bump_listing_versions)."""
+    __tablename__ = "listing_versions"
+
+    city = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ListingVersion(city={self.city}, version={self.version})>"
+
 class ApplicationStatus(enum.Enum):
     SENT = "sent"
     VIEWED = "viewed"
@@ -65,10 +94,18 @@ class ApplicationStatus(enum.Enum):
 
 class Application(Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        # Tenant inbox: filter by tenant, newest first
+        Index("ix_applications_tenant_id_created_at", "tenant_id", "created_at"),
+        # Duplicate check on apply and per-property cleanup
+        Index("ix_applications_property_id_tenant_id", "property_id", "tenant_id"),
+        # Ids are never reused on SQLite either, as archived applications keep theirs
+        {"sqlite_autoincrement": True, "info": {"archive": "applications_archive"}},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
-    tenant_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
+    tenant_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     status = Column(Enum(ApplicationStatus, native_enum=False), nullable=False, default=ApplicationStatus.SENT)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -80,10 +117,14 @@ class Application(Base):
 
 class ShortlistedProperty(Base):
     __tablename__ = "shortlisted_properties"
+    __table_args__ = (
+        Index("ix_shortlisted_properties_user_id_property_id", "user_id", "property_id"),
+        Index("ix_shortlisted_properties_property_id", "property_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="shortlisted_properties")
@@ -91,3 +132,94 @@ class ShortlistedProperty(Base):
 
     def __repr__(self):
         return f"<ShortlistedProperty(user_id={self.user_id}, property_id={self.property_id})>"
+
+class ArchivedProperty(Base):
+    """Rented listing moved out of ``properties`` by ArchiveService; only the owner's history endpoint reads it."""
+    __tablename__ = "properties_archive"
+
+    id = Column(Integer, primary_key=True)
+    owner_id = Column(Integer, nullable=False, index=True)
+    name = Column(String(255), nullable=False)
+    address = Column(String(255), nullable=False)
+    city = Column(String(100), nullable=False)
+    state = Column(String(100), nullable=False)
+    pincode = Column(String(10), nullable=False)
+    price = Column(Float, nullable=False)
+    bedrooms = Column(Integer, nullable=False)
+    bathrooms = Column(Integer, nullable=False)
+    area_sqft = Column(Integer, nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(Enum(PropertyStatus, native_enum=False), nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<ArchivedProperty(id={self.id}, name={self.name})>"
+
+class ArchivedApplication(Base):
+    """Old rejected application, or any application of an archived listing (see ArchiveService)."""
+    __tablename__ = "applications_archive"
+    __table_args__ = (
+        # Tenant history: filter by tenant, newest first
+        Index("ix_applications_archive_tenant_id_created_at", "tenant_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # No foreign key: the property may be live or archived itself
+    property_id = Column(Integer, nullable=False, index=True)
+    tenant_id = Column(Integer, nullable=False)
+    status = Column(Enum(ApplicationStatus, native_enum=False), nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<ArchivedApplication(id={self.id}, property_id={self.property_id}, status={self.status})>"
+
+class OwnerStats(Base):
+    """Dashboard counters per owner, kept in step by every listing, application and shortlist write (see OwnerStatsService)."""
+    __tablename__ = "owner_stats"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    # Live (not soft-deleted, not archived) listings
+    properties = Column(Integer, nullable=False, default=0)
+    available = Column(Integer, nullable=False, default=0)
+    rented = Column(Integer, nullable=False, default=0)
+    rent_total = Column(Float, nullable=False, default=0.0)
+    # Sent or viewed applications, and shortlist entries, on those listings
+    open_applications = Column(Integer, nullable=False, default=0)
+    shortlists = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return f"<OwnerStats(owner_id={self.owner_id}, properties={self.properties})>"
+
+class JobStatus(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+class Job(Base):
+    """Background job; enqueued by request handlers, claimed and run by JobWorker (see JobService)."""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claiming: next due queued jobs; stale-lock recovery scans running jobs by locked_at
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False, default="{}")
+    status = Column(Enum(JobStatus, native_enum=False), nullable=False, default=JobStatus.QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime(timezone=True), nullable=False)
+    locked_by = Column(String(64), nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status}, attempts={self.attempts})>"
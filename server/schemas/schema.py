@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Literal, Optional
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
 from server.models.model import PropertyStatus, ApplicationStatus
 
@@ -98,14 +98,60 @@ class PropertyUpdate(BaseModel):
     area_sqft: Optional[int] = None
     description: Optional[str] = None
 
-class PropertySearchQuery(BaseModel):
-    # Optional filters for GET /properties
+# PATCH /properties/mine/bulk: which of the owner's properties, and what to change on all of them
+class PropertyBulkFilter(BaseModel):
+    city: Optional[str] = None  # exact match, case-insensitive
+    bedrooms: Optional[int] = None
+    ids: Optional[List[int]] = Field(None, min_length=1)
+
+class PropertyBulkUpdateRequest(BaseModel):
+    filter: PropertyBulkFilter = PropertyBulkFilter()
+    # New rent, or a percentage change of the current rent (5 = +5%); not both
+    price: Optional[float] = Field(None, gt=0)
+    price_change_pct: Optional[float] = Field(None, gt=-100)
+    status: Optional[Literal["available", "rented"]] = None
+
+    @model_validator(mode="after")
+    def _one_change(self):
+        if self.price is not None and self.price_change_pct is not None:
+            raise ValueError("Send either price or price_change_pct, not both")
+        if self.price is None and self.price_change_pct is None and self.status is None:
+            raise ValueError("Nothing to update; send price, price_change_pct or status")
+        return self
+
+class PropertyBulkUpdateResponse(BaseModel):
+    updated: int
+    ids: List[int]
+
+class PropertySearchFilters(BaseModel):
+    # Optional filters shared by GET /properties and GET /properties/export
     city: Optional[str] = None
     max_price: Optional[float] = None
     min_bedrooms: Optional[int] = None
     min_area: Optional[int] = None
+
+class PropertySearchQuery(PropertySearchFilters):
     skip: int = 0
     limit: int = 100
+    # Comma-separated PropertyPublic fields to return (default: all)
+    fields: Optional[str] = None
+
+class PropertyExportQuery(PropertySearchFilters):
+    format: Literal["ndjson", "csv"] = "ndjson"
+
+class PropertyImportError(BaseModel):
+    # 1-based data row (CSV header excluded) and what is wrong with it
+    row: int
+    errors: List[str]
+
+class PropertyImportResponse(BaseModel):
+    mode: Literal["atomic", "chunked"]
+    received: int
+    created: int
+    failed: int
+    # At most BULK_IMPORT_MAX_ERRORS rows are listed; errors_truncated says there were more
+    errors: List[PropertyImportError]
+    errors_truncated: bool = False
 
 class PropertyDeleteResponse(BaseModel):
     id: int
@@ -134,6 +180,9 @@ class PropertyOwnerItem(BaseModel):
     bedrooms: int
     bathrooms: int
     area_sqft: int
+    shortlist_count: int = 0
+    application_count: int = 0
+    view_count: int = 0
 
 class PropertyOwnerDetail(BaseModel):
     # Full owner-facing property details (unmasked address and metadata)
@@ -153,6 +202,19 @@ class PropertyOwnerDetail(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+class PropertySummary(BaseModel):
+    # Owner dashboard totals, read from the owner's stats row
+    total: int
+    available: int
+    rented: int
+    average_rent: Optional[float] = None  # None without listings
+    open_applications: int  # sent or viewed
+    shortlists: int
+
+class ArchivedPropertyResponse(PropertyOwnerDetail):
+    # A listing moved to properties_archive; read-only history for its owner
+    archived_at: datetime
+
 # Application Schemas
 class ApplicationResponse(BaseModel):
     id: int
@@ -164,6 +226,9 @@ class ApplicationResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ArchivedApplicationResponse(ApplicationResponse):
+    archived_at: datetime
+
 class ApplicationUpdateRequest(BaseModel):
     # Owners can mark as viewed, accepted, or rejected
     status: Literal["viewed", "accepted", "rejected"]
@@ -184,3 +249,40 @@ class ShortlistResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+# Batch Schemas
+# Responses that stream until the client disconnects (SSE) or can be arbitrarily large
+# (exports); a batch buffers each item's body in memory, so these are called directly
+BATCH_STREAMING_PATHS = ("/applications/stream", "/properties/export")
+
+class BatchItem(BaseModel):
+    # One sub-request of POST /batch; path is an API path, optionally with a query string
+    id: Optional[str] = None
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+    @field_validator("path")
+    @classmethod
+    def _api_path(cls, path: str) -> str:
+        if not path.startswith("/") or path.startswith("//"):
+            raise ValueError("path must start with a single '/'")
+        route = path.partition("?")[0].rstrip("/")
+        if route == "/batch":
+            raise ValueError("batches cannot be nested")
+        if route in BATCH_STREAMING_PATHS:
+            raise ValueError(f"{route} streams its response and cannot be batched")
+        return path
+
+class BatchRequest(BaseModel):
+    requests: List[BatchItem] = Field(min_length=1)
+
+class BatchItemResult(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str]
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchItemResult]
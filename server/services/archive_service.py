@@ -0,0 +1,142 @@
+"""
+Hot/cold split for listings and applications.
+
+Rented listings that nobody has touched for ARCHIVE_RENTED_AFTER_DAYS, and rejected
+applications older than ARCHIVE_REJECTED_AFTER_DAYS, are moved into
+``properties_archive`` and ``applications_archive``. Every search, inbox and owner
+query then reads smaller tables and indexes. A listing takes all of its applications
+with it. Its shortlist entries are dropped by ON DELETE CASCADE.
+
+Rows move in id-ordered batches of ARCHIVE_BATCH_SIZE: one INSERT ... SELECT into the
+archive and one DELETE from the hot table per batch, each batch its own transaction,
+so locks stay short and an interrupted run resumes where it stopped. Archived rows
+are read only by the owner's and tenant's history endpoints.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from server.core.config import settings
+from server.core.invalidation import invalidation_bus
+from server.models.model import (
+    Application,
+    ApplicationStatus,
+    ArchivedApplication,
+    ArchivedProperty,
+    Property,
+    PropertyStatus,
+)
+from server.services.job_service import job_handler
+from server.services.owner_stats_service import OwnerStatsService
+from server.services.property_service import LIVE_PROPERTY, PropertyService
+
+# Columns copied into the archive tables (everything but archived_at)
+PROPERTY_COLUMNS = [c.name for c in ArchivedProperty.__table__.columns if c.name != "archived_at"]
+APPLICATION_COLUMNS = [c.name for c in ArchivedApplication.__table__.columns if c.name != "archived_at"]
+
+
+class ArchiveService:
+    @staticmethod
+    def archive_rented_properties(db: Session, older_than: datetime, batch_size: int = 500) -> Dict[str, int]:
+        """Move rented listings last changed before ``older_than``, with their applications."""
+        moved = {"properties": 0, "applications": 0}
+        last_modified = func.coalesce(Property.updated_at, Property.created_at)
+        while True:
+            rows = (
+                db.query(Property.id, Property.owner_id, Property.city)
+                .filter(Property.status == PropertyStatus.RENTED, last_modified < older_than, LIVE_PROPERTY)
+                .order_by(Property.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return moved
+            ids = [r.id for r in rows]
+            now = datetime.now(timezone.utc)
+            moved["applications"] += ArchiveService._copy(
+                db, ArchivedApplication, Application, APPLICATION_COLUMNS, Application.property_id.in_(ids), now
+            )
+            moved["properties"] += ArchiveService._copy(
+                db, ArchivedProperty, Property, PROPERTY_COLUMNS, Property.id.in_(ids), now
+            )
+            # Applications and shortlist entries go with the rows through ON DELETE CASCADE
+            db.execute(delete(Property).where(Property.id.in_(ids)))
+            OwnerStatsService.refresh(db, {r.owner_id for r in rows})
+            PropertyService.bump_listing_versions(db, [r.city for r in rows])
+            db.commit()
+            for property_id in ids:
+                invalidation_bus.publish("property", property_id)
+
+    @staticmethod
+    def archive_rejected_applications(db: Session, older_than: datetime, batch_size: int = 500) -> int:
+        """Move rejected applications created before ``older_than``."""
+        moved = 0
+        while True:
+            ids = [
+                r.id for r in (
+                    db.query(Application.id)
+                    .filter(Application.status == ApplicationStatus.REJECTED, Application.created_at < older_than)
+                    .order_by(Application.id)
+                    .limit(batch_size)
+                )
+            ]
+            if not ids:
+                return moved
+            moved += ArchiveService._copy(
+                db, ArchivedApplication, Application, APPLICATION_COLUMNS, Application.id.in_(ids), datetime.now(timezone.utc)
+            )
+            db.execute(delete(Application).where(Application.id.in_(ids)))
+            db.commit()
+
+    @staticmethod
+    def _copy(db: Session, archive, source, columns: Sequence[str], criterion, archived_at: datetime) -> int:
+        source_columns = [getattr(source, name) for name in columns]
+        stmt = insert(archive).from_select(
+            [*columns, "archived_at"],
+            select(*source_columns, literal(archived_at, archive.archived_at.type)).where(criterion),
+        )
+        return db.execute(stmt).rowcount
+
+    @staticmethod
+    def run(db: Session, now: Optional[datetime] = None, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """Archive everything past the configured thresholds; returns the rows moved per table."""
+        now = now or datetime.now(timezone.utc)
+        batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+        moved = ArchiveService.archive_rented_properties(
+            db, now - timedelta(days=settings.ARCHIVE_RENTED_AFTER_DAYS), batch_size
+        )
+        moved["applications"] += ArchiveService.archive_rejected_applications(
+            db, now - timedelta(days=settings.ARCHIVE_REJECTED_AFTER_DAYS), batch_size
+        )
+        return moved
+
+    @staticmethod
+    def get_archived_properties(db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> List[ArchivedProperty]:
+        return (
+            db.query(ArchivedProperty)
+            .filter(ArchivedProperty.owner_id == owner_id)
+            .order_by(ArchivedProperty.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def get_archived_applications(db: Session, tenant_id: int, skip: int = 0, limit: int = 100) -> List[ArchivedApplication]:
+        return (
+            db.query(ArchivedApplication)
+            .filter(ArchivedApplication.tenant_id == tenant_id)
+            .order_by(ArchivedApplication.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+
+@job_handler("archive.run")
+def _archive_job(db: Session, payload: dict) -> None:
+    # Every batch commits on its own, so a retry only moves what is still left
+    ArchiveService.run(db, batch_size=payload.get("batch_size"))
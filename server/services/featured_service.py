@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from server.core.config import settings
+from server.core.invalidation import invalidation_bus
+from server.models.model import Property, PropertyStatus
+from server.services.property_service import LIVE_PROPERTY, PropertyService
+
+logger = logging.getLogger(__name__)
+
+# Ranking: a new listing is worth RECENCY_WEIGHT, halving every RECENCY_HALF_LIFE_DAYS;
+# engagement counts are log-damped so a handful of viral listings don't take over the feed
+RECENCY_WEIGHT = 3.0
+RECENCY_HALF_LIFE_DAYS = 7.0
+SHORTLIST_WEIGHT = 1.0
+APPLICATION_WEIGHT = 2.0
+
+
+@dataclass(frozen=True)
+class FeaturedSnapshot:
+    body: bytes  # JSON array of PropertyPublic
+    ids: Tuple[int, ...]
+    # Property.version of each listing in ``ids``; with them, all the body depends on
+    versions: Tuple[int, ...]
+    built_at: datetime
+    version: int
+
+
+class FeaturedService:
+    @staticmethod
+    def featured_score(created_at: Optional[datetime], shortlists: int, applications: int, now: datetime) -> float:
+        score = SHORTLIST_WEIGHT * math.log1p(shortlists) + APPLICATION_WEIGHT * math.log1p(applications)
+        if created_at is not None:
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            age_days = max(0.0, (now - created_at).total_seconds() / 86400)
+            score += RECENCY_WEIGHT * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+        return score
+
+    @staticmethod
+    def rank_featured(db: Session, limit: int, candidates: int, now: Optional[datetime] = None) -> List[int]:
+        """Ids of the ``limit`` best available listings by recency, shortlists and applications.
+
+        Only the newest, most shortlisted and most applied-to ``candidates`` listings are
+        scored. Engagement comes from the properties' popularity counters (PopularityService),
+        so no query touches the shortlist or application tables.
+        """
+        now = now or datetime.now(timezone.utc)
+        available = (Property.status == PropertyStatus.AVAILABLE, LIVE_PROPERTY)
+        ids = set()
+        for order in (Property.created_at.desc(), Property.shortlist_count.desc(), Property.application_count.desc()):
+            ids.update(row.id for row in db.query(Property.id).filter(*available).order_by(order).limit(candidates))
+        if not ids:
+            return []
+
+        rows = (
+            db.query(Property.id, Property.created_at, Property.shortlist_count, Property.application_count)
+            .filter(Property.id.in_(ids), *available)
+            .all()
+        )
+        scored = sorted(
+            rows,
+            key=lambda r: (
+                -FeaturedService.featured_score(r.created_at, r.shortlist_count, r.application_count, now),
+                -r.id,
+            ),
+        )
+        return [r.id for r in scored[:limit]]
+
+    @staticmethod
+    def build_snapshot(db: Session, version: int = 0) -> FeaturedSnapshot:
+        ids = FeaturedService.rank_featured(db, settings.FEATURED_LIMIT, settings.FEATURED_CANDIDATES)
+        rows = {
+            r.id: r
+            for r in db.query(Property.id, Property.version, Property.public_json).filter(Property.id.in_(ids))
+        }
+        ranked = [rows[i] for i in ids if i in rows]
+        listings = PropertyService._public_json_for(db, ranked)
+        body = ("[" + ",".join(listings) + "]").encode()
+        return FeaturedSnapshot(
+            body=body,
+            ids=tuple(r.id for r in ranked),
+            versions=tuple(r.version for r in ranked),
+            built_at=datetime.now(timezone.utc),
+            version=version,
+        )
+
+
+class FeaturedFeed:
+    """Holds the current featured snapshot and rebuilds it in the background.
+
+    Readers take ``snapshot`` without locking; a rebuild swaps in a new immutable
+    snapshot by assigning one attribute. ``run`` refreshes every ``interval`` seconds
+    and shortly after ``mark_dirty`` (listing writes, via the invalidation bus).
+    """
+
+    def __init__(self, interval: float, debounce: float = 1.0):
+        self.interval = interval
+        self.debounce = debounce
+        self.snapshot: Optional[FeaturedSnapshot] = None
+        self._build_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dirty: Optional[asyncio.Event] = None
+        self._stats = {"refreshes": 0, "refresh_errors": 0, "last_build_ms": 0.0}
+
+    def get(self, db: Session) -> FeaturedSnapshot:
+        """Current snapshot, building the first one on demand if the refresher hasn't yet."""
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._build_lock:
+            if self.snapshot is None:
+                self.refresh(db)
+            return self.snapshot
+
+    def refresh(self, db: Session) -> FeaturedSnapshot:
+        started = time.perf_counter()
+        previous = self.snapshot
+        snapshot = FeaturedService.build_snapshot(db, version=previous.version + 1 if previous else 1)
+        self.snapshot = snapshot
+        self._stats["refreshes"] += 1
+        self._stats["last_build_ms"] = (time.perf_counter() - started) * 1000
+        return snapshot
+
+    def mark_dirty(self, _key: Any = None) -> None:
+        """Request an early refresh; safe to call from any thread."""
+        if self._loop is not None and self._dirty is not None:
+            self._loop.call_soon_threadsafe(self._dirty.set)
+
+    async def run(self, bind) -> None:
+        """Refresh loop; start once per worker from the app's startup."""
+        self._loop = asyncio.get_running_loop()
+        self._dirty = asyncio.Event()
+        while True:
+            try:
+                await asyncio.to_thread(self._refresh_with_session, bind)
+            except Exception:
+                self._stats["refresh_errors"] += 1
+                logger.exception("Featured feed refresh failed; keeping the previous snapshot")
+            try:
+                await asyncio.wait_for(self._dirty.wait(), timeout=self.interval)
+                # Coalesce bursts of writes into one rebuild
+                await asyncio.sleep(self.debounce)
+            except asyncio.TimeoutError:
+                pass
+            self._dirty.clear()
+
+    def _refresh_with_session(self, bind) -> None:
+        with Session(bind=bind) as db:
+            self.refresh(db)
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return {
+            **self._stats,
+            "version": snapshot.version if snapshot else 0,
+            "items": len(snapshot.ids) if snapshot else 0,
+            "age_seconds": (datetime.now(timezone.utc) - snapshot.built_at).total_seconds() if snapshot else None,
+        }
+
+
+featured_feed = FeaturedFeed(interval=settings.FEATURED_REFRESH_SECONDS)
+invalidation_bus.subscribe("property", featured_feed.mark_dirty)
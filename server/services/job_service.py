@@ -0,0 +1,332 @@
+"""
+Durable background jobs stored in the ``jobs`` table.
+
+Request handlers call ``JobService.enqueue`` in the same transaction as the write
+that needs follow-up work and return; a ``JobWorker`` pool claims due jobs and
+runs the handler registered for their ``kind`` with ``@job_handler``:
+
+- Postgres: ``SELECT ... FOR UPDATE SKIP LOCKED``, so workers in any number of
+  processes claim disjoint jobs without waiting on each other
+- SQLite: one claimer per process at a time, and a conditional
+  ``UPDATE ... WHERE status = 'queued'`` per job; SQLite serializes writers, so
+  exactly one claimer wins each job
+
+A failing job is retried with exponential backoff up to ``max_attempts`` and then
+left ``failed`` with its last error. Jobs held by a worker that died are requeued
+after ``JOB_LOCK_TIMEOUT_SECONDS`` (keep it above the longest job), so handlers
+must be idempotent.
+
+Workers run as ``JOB_WORKERS`` threads in every API worker, or on their own:
+    python -m server.worker --concurrency 4
+"""
+
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event, func, update
+from sqlalchemy.orm import Session
+
+from server.core.config import settings
+from server.models.model import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Session, Dict[str, Any]], None]
+_handlers: Dict[str, JobHandler] = {}
+
+# Set when a job is committed in this process so idle workers pick it up without waiting a poll
+_wakeup = threading.Event()
+_sqlite_claim_lock = threading.Lock()
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register ``fn(db, payload)`` to run jobs of ``kind``."""
+    def register(fn: JobHandler) -> JobHandler:
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number ``attempts``: doubling from JOB_BACKOFF_SECONDS, jittered, capped."""
+    delay = settings.JOB_BACKOFF_SECONDS * 2 ** max(0, attempts - 1)
+    return min(settings.JOB_BACKOFF_MAX_SECONDS, delay * random.uniform(0.8, 1.2))
+
+
+class JobService:
+    @staticmethod
+    def enqueue(
+        db: Session,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        delay: float = 0.0,
+        max_attempts: Optional[int] = None,
+    ) -> Job:
+        """Add a job to the caller's transaction; workers see it once the caller commits."""
+        if kind not in _handlers:
+            raise ValueError(f"No handler registered for job kind {kind!r}")
+        job = Job(
+            kind=kind,
+            payload=json.dumps(payload or {}),
+            status=JobStatus.QUEUED,
+            attempts=0,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            run_at=_utcnow() + timedelta(seconds=delay),
+        )
+        db.add(job)
+        db.flush()
+        event.listen(db, "after_commit", lambda _session: _wakeup.set(), once=True)
+        return job
+
+    @staticmethod
+    def claim(db: Session, worker_id: str, limit: int = 1, now: Optional[datetime] = None) -> List[Job]:
+        """Lock up to ``limit`` due jobs for ``worker_id``, oldest first, and commit the claim."""
+        now = now or _utcnow()
+        due = (
+            db.query(Job)
+            .filter(Job.status == JobStatus.QUEUED, Job.run_at <= now)
+            .order_by(Job.run_at, Job.id)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            jobs = due.limit(limit).with_for_update(skip_locked=True).all()
+            for job in jobs:
+                job.status = JobStatus.RUNNING
+                job.locked_by = worker_id
+                job.locked_at = now
+                job.attempts += 1
+            db.commit()
+            return jobs
+
+        claimed = []
+        with _sqlite_claim_lock:
+            # A few spare candidates in case another process claims some of them first
+            for (job_id,) in due.with_entities(Job.id).limit(limit * 4).all():
+                result = db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+                    .values(status=JobStatus.RUNNING, locked_by=worker_id, locked_at=now, attempts=Job.attempts + 1)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount:
+                    claimed.append(job_id)
+                    if len(claimed) == limit:
+                        break
+            db.commit()
+        if not claimed:
+            return []
+        return db.query(Job).filter(Job.id.in_(claimed)).order_by(Job.run_at, Job.id).all()
+
+    @staticmethod
+    def complete(db: Session, job: Job) -> None:
+        job.status = JobStatus.DONE
+        job.finished_at = _utcnow()
+        job.locked_by = None
+        job.locked_at = None
+        db.commit()
+
+    @staticmethod
+    def fail(db: Session, job: Job, error: str) -> bool:
+        """Record a failed attempt; reschedules with backoff and returns True while attempts remain."""
+        now = _utcnow()
+        retry = job.attempts < job.max_attempts
+        if retry:
+            job.status = JobStatus.QUEUED
+            job.run_at = now + timedelta(seconds=backoff_seconds(job.attempts))
+        else:
+            job.status = JobStatus.FAILED
+            job.finished_at = now
+        job.last_error = error[:2000]
+        job.locked_by = None
+        job.locked_at = None
+        db.commit()
+        return retry
+
+    @staticmethod
+    def requeue_stale(db: Session, lock_timeout: float, now: Optional[datetime] = None) -> int:
+        """Release jobs locked for longer than ``lock_timeout``: their worker died before finishing them."""
+        now = now or _utcnow()
+        stale = (Job.status == JobStatus.RUNNING, Job.locked_at < now - timedelta(seconds=lock_timeout))
+        failed = db.execute(
+            update(Job)
+            .where(*stale, Job.attempts >= Job.max_attempts)
+            .values(status=JobStatus.FAILED, finished_at=now, locked_by=None, locked_at=None, last_error="Lock expired")
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        requeued = db.execute(
+            update(Job)
+            .where(*stale)
+            .values(status=JobStatus.QUEUED, run_at=now, locked_by=None, locked_at=None, last_error="Lock expired")
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return failed + requeued
+
+    @staticmethod
+    def prune(db: Session, retention: float, now: Optional[datetime] = None) -> int:
+        """Delete jobs that finished successfully more than ``retention`` seconds ago."""
+        cutoff = (now or _utcnow()) - timedelta(seconds=retention)
+        deleted = (
+            db.query(Job)
+            .filter(Job.status == JobStatus.DONE, Job.finished_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return deleted
+
+    @staticmethod
+    def queue_stats(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Jobs per status, how many are due, and how long the oldest due job has waited."""
+        now = now or _utcnow()
+        counts = dict(db.query(Job.status, func.count()).group_by(Job.status).all())
+        due_count, oldest = (
+            db.query(func.count(), func.min(Job.run_at))
+            .filter(Job.status == JobStatus.QUEUED, Job.run_at <= now)
+            .one()
+        )
+        return {
+            "depth": {s.value: counts.get(s, 0) for s in JobStatus},
+            "due": due_count,
+            "oldest_due_seconds": (now - _as_utc(oldest)).total_seconds() if oldest is not None else 0.0,
+        }
+
+
+def _summary(samples) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+class JobWorker:
+    """A pool of threads claiming and running jobs, one at a time each, with their own sessions."""
+
+    def __init__(self, concurrency: int, poll_interval: float, lock_timeout: float, retention: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lock_timeout = lock_timeout
+        self.retention = retention
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self._bind = None
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._maintenance_lock = threading.Lock()
+        self._last_maintenance = 0.0
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(("claimed", "succeeded", "retried", "failed", "recovered"), 0)
+        self._wait_ms = deque(maxlen=1000)  # due -> claimed
+        self._run_ms = deque(maxlen=1000)
+
+    def start(self, bind) -> None:
+        """Start the threads (once per process, after fork)."""
+        if self._threads or self.concurrency <= 0:
+            return
+        self._bind = bind
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self._stopping.clear()
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._loop, args=(f"{self.worker_id}/{i}"[-64:],), name=f"jobs-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Started %d job worker threads", self.concurrency)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop claiming and wait up to ``timeout`` seconds for running jobs to finish."""
+        self._stopping.set()
+        _wakeup.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def _loop(self, thread_id: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._maintain()
+                ran = self.run_once(thread_id)
+            except Exception:
+                logger.exception("Job worker %s failed; backing off", thread_id)
+                ran = False
+            if not ran:
+                _wakeup.wait(self.poll_interval)
+                _wakeup.clear()
+
+    def _maintain(self) -> None:
+        if time.monotonic() - self._last_maintenance < self.lock_timeout / 2:
+            return
+        if not self._maintenance_lock.acquire(blocking=False):
+            return
+        try:
+            with Session(bind=self._bind) as db:
+                recovered = JobService.requeue_stale(db, self.lock_timeout)
+                JobService.prune(db, self.retention)
+            with self._lock:
+                self._stats["recovered"] += recovered
+            self._last_maintenance = time.monotonic()
+        finally:
+            self._maintenance_lock.release()
+
+    def run_once(self, thread_id: Optional[str] = None) -> bool:
+        """Claim and run one due job; False when none is due."""
+        with Session(bind=self._bind) as db:
+            jobs = JobService.claim(db, thread_id or self.worker_id)
+            if not jobs:
+                return False
+            job = jobs[0]
+            wait_ms = max(0.0, (_as_utc(job.locked_at) - _as_utc(job.run_at)).total_seconds() * 1000)
+            started = time.perf_counter()
+            try:
+                handler = _handlers.get(job.kind)
+                if handler is None:
+                    raise LookupError(f"No handler registered for job kind {job.kind!r}")
+                handler(db, json.loads(job.payload))
+                JobService.complete(db, job)
+                outcome = "succeeded"
+            except Exception as exc:
+                db.rollback()
+                logger.warning("Job %s (%s) attempt %s failed: %r", job.id, job.kind, job.attempts, exc)
+                outcome = "retried" if JobService.fail(db, job, repr(exc)) else "failed"
+            with self._lock:
+                self._stats["claimed"] += 1
+                self._stats[outcome] += 1
+                self._wait_ms.append(wait_ms)
+                self._run_ms.append((time.perf_counter() - started) * 1000)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "worker_id": self.worker_id,
+                "threads": len(self._threads),
+                **self._stats,
+                "wait_ms": _summary(self._wait_ms),
+                "run_ms": _summary(self._run_ms),
+            }
+
+
+job_worker = JobWorker(
+    concurrency=settings.JOB_WORKERS,
+    poll_interval=settings.JOB_POLL_SECONDS,
+    lock_timeout=settings.JOB_LOCK_TIMEOUT_SECONDS,
+    retention=settings.JOB_RETENTION_SECONDS,
+)
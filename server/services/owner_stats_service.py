@@ -0,0 +1,173 @@
+"""
+Per-owner dashboard counters (``owner_stats``), behind GET /properties/mine/summary.
+
+Every write that changes an owner's figures calls ``OwnerStatsService.apply`` with its
+deltas before committing, so the counters change in the same transaction as the rows
+they count: one ``UPDATE owner_stats SET x = x + :delta`` per write. An owner's first
+write creates the row from exact aggregates instead. Set-based paths (archival) call
+``refresh`` for the owners they touched.
+
+``reconcile`` (the ``owner_stats.reconcile`` job, or
+``python -m server.db.backfill owner-stats``) recomputes every owner in batches and
+corrects drift, e.g. after manual SQL or a write path that bypassed the service.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from server.models.model import (
+    Application,
+    ApplicationStatus,
+    OwnerStats,
+    Property,
+    PropertyStatus,
+    ShortlistedProperty,
+    User,
+    UserType,
+)
+from server.services.job_service import job_handler
+
+logger = logging.getLogger(__name__)
+
+# Applications the owner still has to act on
+OPEN_APPLICATION_STATUSES = (ApplicationStatus.SENT, ApplicationStatus.VIEWED)
+COUNTERS = ("properties", "available", "rented", "rent_total", "open_applications", "shortlists")
+
+# Same filter as property_service.LIVE_PROPERTY (which imports this module)
+_LIVE = Property.deleted_at.is_(None)
+
+
+def listing_counters(status: PropertyStatus, price: float, sign: int = 1) -> Dict[str, float]:
+    """Deltas for adding (``sign=1``) or removing (``sign=-1``) one listing."""
+    return {
+        "properties": sign,
+        "available": sign if status == PropertyStatus.AVAILABLE else 0,
+        "rented": sign if status == PropertyStatus.RENTED else 0,
+        "rent_total": sign * price,
+    }
+
+
+def is_open(status: Optional[ApplicationStatus]) -> bool:
+    return status in OPEN_APPLICATION_STATUSES
+
+
+class OwnerStatsService:
+    @staticmethod
+    def apply(db: Session, owner_id: int, **deltas: float) -> None:
+        """Add ``deltas`` (counter name -> change) to the owner's row (caller commits).
+
+        Call it after the write's own statements: without a row, the figures are computed
+        from the tables as they are at that point, and ``deltas`` is not applied on top.
+        """
+        values = {name: getattr(OwnerStats, name) + delta for name, delta in deltas.items() if delta}
+        if not values:
+            return
+        now = datetime.now(timezone.utc)
+        stmt = update(OwnerStats).where(OwnerStats.owner_id == owner_id).values(**values, updated_at=now)
+        if db.execute(stmt).rowcount:
+            return
+        # First write for this owner: start from exact figures, which already include this write
+        db.flush()
+        try:
+            with db.begin_nested():
+                db.add(OwnerStats(owner_id=owner_id, updated_at=now, **OwnerStatsService.compute(db, [owner_id])[owner_id]))
+        except IntegrityError:
+            # Another writer created the row first, from figures without this write
+            db.execute(stmt)
+
+    @staticmethod
+    def compute(db: Session, owner_ids: Iterable[int]) -> Dict[int, Dict[str, float]]:
+        """Exact counters for ``owner_ids`` from the listing, application and shortlist tables."""
+        owner_ids = list(owner_ids)
+        result = {owner_id: dict.fromkeys(COUNTERS, 0) for owner_id in owner_ids}
+        if not owner_ids:
+            return result
+        for row in db.execute(
+            select(
+                Property.owner_id,
+                func.count(),
+                func.sum(case((Property.status == PropertyStatus.AVAILABLE, 1), else_=0)),
+                func.sum(case((Property.status == PropertyStatus.RENTED, 1), else_=0)),
+                func.sum(Property.price),
+            )
+            .where(Property.owner_id.in_(owner_ids), _LIVE)
+            .group_by(Property.owner_id)
+        ):
+            result[row[0]].update(properties=row[1], available=row[2], rented=row[3], rent_total=row[4])
+        for model, name, criteria in (
+            (Application, "open_applications", [Application.status.in_(OPEN_APPLICATION_STATUSES)]),
+            (ShortlistedProperty, "shortlists", []),
+        ):
+            for owner_id, count in db.execute(
+                select(Property.owner_id, func.count())
+                .join(model, model.property_id == Property.id)
+                .where(Property.owner_id.in_(owner_ids), _LIVE, *criteria)
+                .group_by(Property.owner_id)
+            ):
+                result[owner_id][name] = count
+        return result
+
+    @staticmethod
+    def refresh(db: Session, owner_ids: Iterable[int]) -> int:
+        """Overwrite the rows of ``owner_ids`` with exact figures (caller commits); return rows changed."""
+        exact = OwnerStatsService.compute(db, set(owner_ids))
+        stored = {
+            s.owner_id: s
+            for s in db.query(OwnerStats).filter(OwnerStats.owner_id.in_(list(exact))).populate_existing()
+        }
+        now = datetime.now(timezone.utc)
+        changed = 0
+        for owner_id, counters in exact.items():
+            row = stored.get(owner_id)
+            if row is None:
+                db.add(OwnerStats(owner_id=owner_id, updated_at=now, **counters))
+            elif any(abs((getattr(row, name) or 0) - value) > 0.005 for name, value in counters.items()):
+                for name, value in counters.items():
+                    setattr(row, name, value)
+                row.updated_at = now
+            else:
+                continue
+            changed += 1
+        db.flush()
+        return changed
+
+    @staticmethod
+    def reconcile(db: Session, batch_size: int = 1000) -> int:
+        """Recompute every owner's row, committing per batch; return how many were missing or wrong."""
+        corrected = 0
+        last_id = 0
+        while True:
+            owner_ids = [
+                r.id for r in (
+                    db.query(User.id)
+                    .filter(User.user_type == UserType.OWNER, User.id > last_id)
+                    .order_by(User.id)
+                    .limit(batch_size)
+                )
+            ]
+            if not owner_ids:
+                break
+            corrected += OwnerStatsService.refresh(db, owner_ids)
+            db.commit()
+            last_id = owner_ids[-1]
+        if corrected:
+            logger.warning("Corrected owner stats for %d owners", corrected)
+        return corrected
+
+    @staticmethod
+    def get_summary(db: Session, owner_id: int) -> OwnerStats:
+        """The owner's stored counters; computed on the fly (not stored) before their first write."""
+        stats = db.get(OwnerStats, owner_id)
+        if stats is None:
+            stats = OwnerStats(owner_id=owner_id, **OwnerStatsService.compute(db, [owner_id])[owner_id])
+        return stats
+
+
+@job_handler("owner_stats.reconcile")
+def _reconcile_owner_stats_job(db: Session, payload: dict) -> None:
+    OwnerStatsService.reconcile(db, batch_size=payload.get("batch_size", 1000))
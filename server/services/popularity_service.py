@@ -0,0 +1,209 @@
+"""
+Popularity counters on ``properties``: shortlist_count, application_count and view_count.
+
+With ``POPULARITY_COUNTERS=buffered`` (the default) a write does not touch the
+property row. ``PopularityService.record`` notes the delta on the session, and once
+the session commits it is added to this worker's ``popularity_counters`` buffer.
+``PopularityCounters.run`` flushes the buffer every POPULARITY_FLUSH_SECONDS as one
+executemany ``UPDATE properties SET x = x + :delta WHERE id = :id``, in id order. A
+listing that is shortlisted or viewed a thousand times in an interval then takes one
+row lock instead of a thousand. Readers see counts up to one interval late, and deltas
+still buffered when a worker is killed (not stopped) are lost.
+
+With ``POPULARITY_COUNTERS=exact`` the same UPDATE runs in the write's own transaction.
+
+``recount`` (``python -m server.db.backfill popularity``) rebuilds shortlist and
+application counts from their tables, e.g. for rows created before these columns or
+after a lost flush. View counts cannot be rebuilt.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import bindparam, event, func, select, update
+from sqlalchemy.orm import Session
+
+from server.core.config import settings
+from server.models.model import Application, ArchivedApplication, Property, ShortlistedProperty
+from server.services.job_service import job_handler
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("shortlist_count", "application_count", "view_count")
+
+# Deltas recorded on a session, moved to the buffer when it commits
+_SESSION_KEY = "popularity_deltas"
+
+_properties = Property.__table__
+# Counters are not edits: every statement below sets updated_at to itself, so the
+# column's onupdate default leaves last-modified times, ETags and archival ages alone
+_UNCHANGED = {"updated_at": _properties.c.updated_at}
+# One statement for every flush; rows with a zero delta for a counter leave it unchanged
+_FLUSH_STATEMENT = (
+    update(_properties)
+    .where(_properties.c.id == bindparam("property_id"))
+    .values({**{name: _properties.c[name] + bindparam(f"{name}_delta") for name in COUNTERS}, **_UNCHANGED})
+)
+_RECOUNT_STATEMENT = (
+    update(_properties)
+    .where(_properties.c.id == bindparam("property_id"))
+    .values(
+        shortlist_count=bindparam("shortlists"),
+        application_count=bindparam("applications"),
+        **_UNCHANGED,
+    )
+)
+
+
+class PopularityCounters:
+    """Per-worker buffer of counter deltas, flushed in batches.
+
+    ``add`` only takes a lock and updates a dict, so it is cheap on the request path.
+    ``flush`` swaps the buffer out and writes it in one transaction; if that fails the
+    deltas are merged back and retried on the next flush.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending: Dict[int, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stats = {"recorded": 0, "flushes": 0, "flush_errors": 0, "rows_flushed": 0, "last_flush_ms": 0.0}
+
+    def add(self, property_id: int, counter: str, delta: int = 1) -> None:
+        with self._lock:
+            deltas = self._pending.get(property_id)
+            if deltas is None:
+                deltas = self._pending[property_id] = dict.fromkeys(COUNTERS, 0)
+            deltas[counter] += delta
+            self._stats["recorded"] += 1
+
+    def flush(self, bind) -> int:
+        """Write every buffered delta; return the number of properties updated."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            rows = [
+                {"property_id": property_id, **{f"{name}_delta": deltas[name] for name in COUNTERS}}
+                for property_id, deltas in sorted(pending.items())
+                if any(deltas.values())
+            ]
+            if not rows:
+                return 0
+            started = time.perf_counter()
+            try:
+                with bind.begin() as conn:
+                    conn.execute(_FLUSH_STATEMENT, rows)
+            except Exception:
+                self._stats["flush_errors"] += 1
+                self._merge(pending)
+                raise
+            self._stats["flushes"] += 1
+            self._stats["rows_flushed"] += len(rows)
+            self._stats["last_flush_ms"] = (time.perf_counter() - started) * 1000
+            return len(rows)
+
+    def _merge(self, pending: Dict[int, Dict[str, int]]) -> None:
+        with self._lock:
+            for property_id, deltas in pending.items():
+                current = self._pending.setdefault(property_id, dict.fromkeys(COUNTERS, 0))
+                for name, delta in deltas.items():
+                    current[name] += delta
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+
+    async def run(self, bind) -> None:
+        """Flush loop; start once per worker from the app's startup and flush once more on shutdown."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.flush, bind)
+            except Exception:
+                logger.exception("Popularity counter flush failed; keeping the deltas for the next one")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {**self._stats, "pending": pending, "mode": settings.POPULARITY_COUNTERS}
+
+
+popularity_counters = PopularityCounters(interval=settings.POPULARITY_FLUSH_SECONDS)
+
+
+@event.listens_for(Session, "after_commit")
+def _buffer_committed_deltas(session: Session) -> None:
+    for property_id, counter, delta in session.info.pop(_SESSION_KEY, ()):
+        popularity_counters.add(property_id, counter, delta)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_rolled_back_deltas(session: Session, previous_transaction) -> None:
+    # A rolled-back savepoint leaves the outer transaction's deltas in place
+    if previous_transaction.parent is None:
+        session.info.pop(_SESSION_KEY, None)
+
+
+class PopularityService:
+    @staticmethod
+    def record(db: Session, property_id: int, counter: str, delta: int = 1) -> None:
+        """Count a shortlist, application or view for ``property_id`` as part of ``db``'s transaction."""
+        if settings.POPULARITY_COUNTERS == "exact":
+            db.execute(
+                update(_properties).where(_properties.c.id == property_id)
+                .values({counter: _properties.c[counter] + delta, **_UNCHANGED})
+            )
+        else:
+            if not db.in_transaction():
+                # So that a rollback before any SQL still discards the delta
+                db.begin()
+            db.info.setdefault(_SESSION_KEY, []).append((property_id, counter, delta))
+
+    @staticmethod
+    def record_view(db: Session, property_id: int) -> None:
+        """Count a detail view; reads have no transaction of their own, so exact mode commits one."""
+        if settings.POPULARITY_COUNTERS == "exact":
+            PopularityService.record(db, property_id, "view_count")
+            db.commit()
+        else:
+            popularity_counters.add(property_id, "view_count")
+
+    @staticmethod
+    def recount(db: Session, batch_size: int = 1000) -> int:
+        """Set shortlist and application counts from their tables (archived applications included).
+
+        Walks properties in id order, one GROUP BY per table and one executemany UPDATE per
+        batch, committing each batch. Returns the number of properties written.
+        """
+        written = 0
+        last_id = 0
+        while True:
+            ids = list(
+                db.scalars(select(Property.id).where(Property.id > last_id).order_by(Property.id).limit(batch_size))
+            )
+            if not ids:
+                return written
+            counts: Dict[int, Dict[str, int]] = {i: {"shortlists": 0, "applications": 0} for i in ids}
+            for model, name in (
+                (ShortlistedProperty, "shortlists"),
+                (Application, "applications"),
+                (ArchivedApplication, "applications"),
+            ):
+                for property_id, count in db.execute(
+                    select(model.property_id, func.count()).where(model.property_id.in_(ids)).group_by(model.property_id)
+                ):
+                    counts[property_id][name] += count
+            rows: List[dict] = [{"property_id": i, **c} for i, c in counts.items()]
+            db.execute(_RECOUNT_STATEMENT, rows)
+            db.commit()
+            written += len(rows)
+            last_id = ids[-1]
+
+
+@job_handler("popularity.recount")
+def _recount_popularity_job(db: Session, payload: dict) -> None:
+    PopularityService.recount(db, batch_size=payload.get("batch_size", 1000))
@@ -1,19 +1,55 @@
+import re
+from collections import Counter
+from datetime import datetime, timezone
 from fastapi import HTTPException
+from sqlalchemy import Numeric, bindparam, cast, delete, func, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from server.models.model import User, UserType, Property, Application, ApplicationStatus
-from server.schemas.schema import PropertyCreate, PropertyUpdate, ApplicationUpdateRequest
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+from server.core.events import application_events
+from server.core.invalidation import invalidation_bus
+from server.core.config import settings
+from server.services.job_service import JobService, job_handler
+from server.services.owner_stats_service import OPEN_APPLICATION_STATUSES, OwnerStatsService, is_open, listing_counters
+from server.models.model import User, UserType, Property, PropertyStatus, Application, ApplicationStatus, ListingVersion, ShortlistedProperty
+from server.schemas.schema import PropertyCreate, PropertyUpdate, PropertyBulkUpdateRequest, ApplicationUpdateRequest, PropertyPublic
+
+_DIGITS = re.compile(r"\d")
+
+# Soft-deleted listings (PROPERTY_SOFT_DELETE) are invisible to every read and write path
+LIVE_PROPERTY = Property.deleted_at.is_(None)
+
+_properties = Property.__table__
+# Executemany write of stored projections by id. Setting updated_at to itself keeps the
+# column's onupdate default from stamping the row: a projection rebuild is not a change
+_PROJECTION_UPDATE = (
+    update(_properties)
+    .where(_properties.c.id == bindparam("property_id"))
+    .values(
+        masked_address=bindparam("projected_address"),
+        public_json=bindparam("projected_json"),
+        updated_at=_properties.c.updated_at,
+    )
+)
+
+
+def mask_address(addr: Optional[str]) -> str:
+    """Replace digits with 'x' to hide house numbers/apartment numbers."""
+    return _DIGITS.sub("x", addr or "")
+
+
+def public_view(prop) -> PropertyPublic:
+    """Public-safe view of a Property (or Row with the PropertyPublic columns)."""
+    data = {name: getattr(prop, name) for name in PropertyPublic.model_fields}
+    data["address"] = mask_address(prop.address)
+    return PropertyPublic(**data)
+
 
 class PropertyService:
     @staticmethod
     def create_property(db: Session, property_data: PropertyCreate, owner_id: int) -> Property:
         # Check if the user is an owner
-        owner = db.query(User).filter(User.id == owner_id).first()
-        if not owner or owner.user_type != UserType.OWNER:
-            raise HTTPException(
-                status_code=403,
-                detail="Only owners can list a new property"
-            )
+        PropertyService.require_owner(db, owner_id)
 
         # Create a new property instance
         new_property = Property(
@@ -22,22 +58,156 @@ class PropertyService:
         )
 
         # Add to the database
+        PropertyService._refresh_public_projection(new_property)
         db.add(new_property)
+        OwnerStatsService.apply(db, owner_id, **listing_counters(PropertyStatus.AVAILABLE, new_property.price))
+        PropertyService.bump_listing_versions(db, [new_property.city])
         db.commit()
         db.refresh(new_property)
+        invalidation_bus.publish("property", new_property.id)
 
         return new_property
 
     @staticmethod
-    def get_all_properties(db: Session, skip: int = 0, limit: int = 100) -> List[Property]:
+    def require_owner(db: Session, owner_id: int) -> User:
+        """Return the user, or 403 unless they are an owner."""
+        owner = db.query(User).filter(User.id == owner_id).first()
+        if not owner or owner.user_type != UserType.OWNER:
+            raise HTTPException(
+                status_code=403,
+                detail="Only owners can list a new property"
+            )
+        return owner
+
+    @staticmethod
+    def insert_properties(db: Session, owner_id: int, rows: Sequence[PropertyCreate], commit: bool = True) -> int:
+        """List ``rows`` for ``owner_id`` in one executemany INSERT, with their public projections.
+
+        SQLAlchemy sends the executemany as multi-row ``INSERT ... VALUES`` batches (psycopg2)
+        or one prepared statement (SQLite), so a chunk costs one round trip rather than an
+        INSERT and a refresh per row. The caller checks the owner role once (``require_owner``).
+        With ``commit=False`` the rows stay in the caller's transaction until
+        ``commit_imported_properties``.
+        """
+        values = []
+        for data in rows:
+            view = public_view(data)
+            values.append({
+                **data.model_dump(),
+                "owner_id": owner_id,
+                "masked_address": view.address,
+                "public_json": view.model_dump_json(),
+            })
+        if values:
+            db.execute(insert(Property), values)
+            counters = listing_counters(PropertyStatus.AVAILABLE, sum(data.price for data in rows))
+            OwnerStatsService.apply(db, owner_id, **{**counters, "properties": len(values), "available": len(values)})
+            PropertyService.bump_listing_versions(db, [data.city for data in rows])
+        if commit:
+            PropertyService.commit_imported_properties(db)
+        return len(values)
+
+    @staticmethod
+    def commit_imported_properties(db: Session) -> None:
+        db.commit()
+        # New ids are in no cache; one event per commit is enough to refresh the featured feed
+        invalidation_bus.publish("property", None)
+
+    @staticmethod
+    def _refresh_public_projection(prop: Property) -> None:
+        """Store the masked address and serialized PropertyPublic on ``prop`` (caller commits)."""
+        view = public_view(prop)
+        prop.masked_address = view.address
+        prop.public_json = view.model_dump_json()
+
+    @staticmethod
+    def bump_listing_versions(db: Session, cities: Iterable[str]) -> None:
+        """Increment the search version of each city (caller commits).
+
+        Every write that changes what a search can return bumps the affected cities,
+        so a search ETag built from ``get_search_version`` changes with it.
+        """
+        for city in sorted(set(cities)):
+            bumped = db.execute(
+                update(ListingVersion).where(ListingVersion.city == city).values(version=ListingVersion.version + 1)
+            ).rowcount
+            if bumped:
+                continue
+            try:
+                with db.begin_nested():
+                    db.add(ListingVersion(city=city, version=1))
+            except IntegrityError:
+                # Another writer created the row first
+                db.execute(
+                    update(ListingVersion).where(ListingVersion.city == city).values(version=ListingVersion.version + 1)
+                )
+
+    @staticmethod
+    def get_search_version(db: Session, city: str | None = None) -> int:
+        """Sum of the versions of every city a search with this ``city`` filter can match."""
+        query = db.query(func.coalesce(func.sum(ListingVersion.version), 0))
+        if city:
+            query = query.filter(ListingVersion.city.ilike(f"%{city}%"))
+        return query.scalar()
+
+    @staticmethod
+    def backfill_public_projection(db: Session, batch_size: int = 1000, rebuild: bool = False) -> int:
+        """Fill missing public projections (or rebuild all of them) in id-ordered batches."""
+        columns = PropertyService.columns_for(["id", *PropertyPublic.model_fields])
+        written = 0
+        last_id = 0
+        while True:
+            query = db.query(*columns).filter(Property.id > last_id)
+            if not rebuild:
+                query = query.filter(Property.public_json.is_(None))
+            rows = query.order_by(Property.id).limit(batch_size).all()
+            if not rows:
+                return written
+            PropertyService._write_projections(db, rows)
+            db.commit()
+            written += len(rows)
+            last_id = rows[-1].id
+
+    @staticmethod
+    def _write_projections(db: Session, rows: Sequence[Any]) -> None:
+        """Store the public projection of each row (Rows with id and the PropertyPublic columns)."""
+        params = []
+        for row in rows:
+            view = public_view(row)
+            params.append({"property_id": row.id, "projected_address": view.address, "projected_json": view.model_dump_json()})
+        db.execute(_PROJECTION_UPDATE, params)
+
+    @staticmethod
+    def columns_for(fields: Iterable[str]) -> list:
+        """Property columns for the given attribute names, for use as ``columns=`` below."""
+        return [getattr(Property, name) for name in fields]
+
+    @staticmethod
+    def public_columns(fields: Sequence[str]) -> list:
+        """Columns that build the given PropertyPublic fields; ``address`` comes from the masked copy."""
+        names = [name for name in fields if name != "address"]
+        if "address" in fields:
+            # The raw address is only needed for rows written before the projection existed
+            names += ["masked_address", "address"]
+        return PropertyService.columns_for(names)
+
+    @staticmethod
+    def _select(db: Session, columns: Optional[Sequence] = None):
+        # A column projection returns lightweight Row tuples that bypass the identity map
+        return (db.query(*columns) if columns else db.query(Property)).filter(LIVE_PROPERTY)
+
+    @staticmethod
+    def get_all_properties(db: Session, skip: int = 0, limit: int = 100, columns: Optional[Sequence] = None) -> List[Property]:
         """Retrieve all properties with pagination."""
-        return db.query(Property).offset(skip).limit(limit).all()
+        return PropertyService._select(db, columns).offset(skip).limit(limit).all()
 
     @staticmethod
-    def get_properties_by_owner(db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> List[Property]:
+    def get_properties_by_owner(
+        db: Session, owner_id: int, skip: int = 0, limit: int = 100, columns: Optional[Sequence] = None
+    ) -> List[Property]:
         """Retrieve properties owned by the specified user (owner)."""
         return (
-            db.query(Property)
+            PropertyService._select(db, columns)
             .filter(Property.owner_id == owner_id)
             .offset(skip)
             .limit(limit)
@@ -53,9 +223,17 @@ class PropertyService:
         min_area: int | None = None,
         skip: int = 0,
         limit: int = 100,
+        columns: Optional[Sequence] = None,
     ) -> List[Property]:
-        """Search properties with optional filters: city (ilike), price <= max_price, bedrooms >= min_bedrooms, area_sqft >= min_area with pagination."""
-        query = db.query(Property)
+        """Search properties with optional filters: city (ilike), price <= max_price, bedrooms >= min_bedrooms, area_sqft >= min_area with pagination.
+
+        Pass ``columns`` (see ``columns_for``) to load only those columns as Row tuples.
+        """
+        query = PropertyService._filter_search(PropertyService._select(db, columns), city, max_price, min_bedrooms, min_area)
+        return query.offset(skip).limit(limit).all()
+
+    @staticmethod
+    def _filter_search(query, city=None, max_price=None, min_bedrooms=None, min_area=None):
         if city:
             query = query.filter(Property.city.ilike(f"%{city}%"))
         if max_price is not None:
@@ -64,37 +242,211 @@ class PropertyService:
             query = query.filter(Property.bedrooms >= min_bedrooms)
         if min_area is not None:
             query = query.filter(Property.area_sqft >= min_area)
-        return query.offset(skip).limit(limit).all()
+        return query
+
+    @staticmethod
+    def _public_json_for(db: Session, rows) -> List[str]:
+        """Stored PropertyPublic JSON per (id, public_json) row, building any that are missing."""
+        missing = [r.id for r in rows if r.public_json is None]
+        built = {}
+        if missing:
+            columns = PropertyService.columns_for(["id", *PropertyPublic.model_fields])
+            for p in db.query(*columns).filter(Property.id.in_(missing)):
+                built[p.id] = public_view(p).model_dump_json()
+        return [r.public_json if r.public_json is not None else built[r.id] for r in rows]
+
+    @staticmethod
+    def search_public_listings(
+        db: Session,
+        city: str | None = None,
+        max_price: float | None = None,
+        min_bedrooms: int | None = None,
+        min_area: int | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[str]:
+        """Same filters as search_properties, returning each match as stored PropertyPublic JSON."""
+        query = PropertyService._filter_search(
+            db.query(Property.id, Property.public_json).filter(LIVE_PROPERTY), city, max_price, min_bedrooms, min_area
+        )
+        return PropertyService._public_json_for(db, query.offset(skip).limit(limit).all())
+
+    @staticmethod
+    def stream_public_listings(
+        db: Session,
+        city: str | None = None,
+        max_price: float | None = None,
+        min_bedrooms: int | None = None,
+        min_area: int | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator:
+        """Yield every matching listing as a Row (id, public_json, masked_address, PropertyPublic columns).
+
+        Rows come from a server-side cursor in ``batch_size`` chunks, so memory stays flat.
+        """
+        columns = PropertyService.columns_for(["id", "public_json", "masked_address", *PropertyPublic.model_fields])
+        query = PropertyService._filter_search(db.query(*columns).filter(LIVE_PROPERTY), city, max_price, min_bedrooms, min_area)
+        yield from query.order_by(Property.id).yield_per(batch_size)
+
+    @staticmethod
+    def get_public_listing(db: Session, property_id: int) -> str:
+        """Stored PropertyPublic JSON for one property, or 404 if not found."""
+        return PropertyService.get_versioned_public_listing(db, property_id)[0]
+
+    @staticmethod
+    def get_versioned_public_listing(db: Session, property_id: int) -> Tuple[str, datetime]:
+        """Stored PropertyPublic JSON and last-modified time for one property, or 404 if not found."""
+        row = (
+            db.query(Property.id, Property.public_json, Property.created_at, Property.updated_at)
+            .filter(Property.id == property_id, LIVE_PROPERTY)
+            .first()
+        )
+        if not row:
+            raise HTTPException(status_code=404, detail="Property not found")
+        return PropertyService._public_json_for(db, [row])[0], row.updated_at or row.created_at
+
+    @staticmethod
+    def get_public_listing_columns(db: Session, property_id: int, columns: Sequence) -> Tuple[Any, datetime]:
+        """Only ``columns`` of one property as a Row, and its last-modified time, or 404 if not found."""
+        row = (
+            db.query(*columns, Property.created_at, Property.updated_at)
+            .filter(Property.id == property_id, LIVE_PROPERTY)
+            .first()
+        )
+        if not row:
+            raise HTTPException(status_code=404, detail="Property not found")
+        return row, row.updated_at or row.created_at
 
     @staticmethod
     def get_property_by_id(db: Session, property_id: int) -> Property:
         """Fetch a single property by ID or return 404 if not found."""
-        prop = db.query(Property).filter(Property.id == property_id).first()
+        prop = db.query(Property).filter(Property.id == property_id, LIVE_PROPERTY).first()
         if not prop:
             raise HTTPException(status_code=404, detail="Property not found")
         return prop
 
     @staticmethod
-    def update_property(db: Session, property_id: int, owner_id: int, updates: PropertyUpdate) -> Property:
-        """Update an existing property if the current user is the owner."""
-        prop = db.query(Property).filter(Property.id == property_id).first()
-        if not prop:
-            raise HTTPException(status_code=404, detail="Property not found")
-
-        if prop.owner_id != owner_id:
-            raise HTTPException(status_code=403, detail="You can only update your own properties")
+    def update_property(
+        db: Session,
+        property_id: int,
+        owner_id: int,
+        updates: PropertyUpdate,
+        expected_versions: Optional[Sequence[int]] = None,
+    ) -> Any:
+        """Update an existing property if the current user is the owner; return the updated Row.
 
+        The write is one ``UPDATE ... WHERE id AND owner_id [AND version IN expected_versions]
+        ... RETURNING`` that also increments ``version``, so concurrent edits can't overwrite
+        each other silently. When ``expected_versions`` (from If-Match) is given and nothing
+        matched, it is a 412 with no further query; otherwise a SELECT on that failure path
+        tells 404 from 403. A change of city or price first reads the old values with the
+        same conditions and a row lock; that read is then the statement that fails.
+        """
         # Apply updates only for provided fields; ignore nulls
         data = updates.dict(exclude_unset=True, exclude_none=True)
         if not data:
+            PropertyService._check_owned(db, property_id, owner_id)
             raise HTTPException(status_code=400, detail="No fields provided to update")
-        for key, value in data.items():
-            setattr(prop, key, value)
+        criteria = [Property.id == property_id, Property.owner_id == owner_id, LIVE_PROPERTY]
+        if expected_versions is not None:
+            criteria.append(Property.version.in_(expected_versions))
+        # A move between cities also changes the old city's search results, and a new
+        # price the owner's rent total; lock the row so the old values stay current
+        old = None
+        if "city" in data or "price" in data:
+            old = db.query(Property.city, Property.price).filter(*criteria).with_for_update().first()
+            if old is None:
+                PropertyService._update_failed(db, property_id, owner_id, expected_versions)
+        old_city = old.city if old and "city" in data else None
 
-        db.add(prop)
+        stmt = update(Property).where(*criteria)
+        returning = PropertyService.columns_for(
+            ["id", "owner_id", "status", "created_at", "updated_at", "version", *PropertyPublic.model_fields]
+        )
+        # Set here rather than by the onupdate default: the database clock may only have
+        # second resolution, and detail ETags must change on every update
+        values = {**data, "updated_at": datetime.now(timezone.utc), "version": Property.version + 1}
+        row = db.execute(
+            stmt.values(**values).returning(*returning).execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            PropertyService._update_failed(db, property_id, owner_id, expected_versions)
+
+        PropertyService._write_projections(db, [row])
+        if old and "price" in data:
+            OwnerStatsService.apply(db, owner_id, rent_total=row.price - old.price)
+        PropertyService.bump_listing_versions(db, [city for city in (old_city, row.city) if city])
         db.commit()
-        db.refresh(prop)
-        return prop
+        invalidation_bus.publish("property", property_id)
+        return row
+
+    @staticmethod
+    def _update_failed(db: Session, property_id: int, owner_id: int, expected_versions: Optional[Sequence[int]]) -> None:
+        """Raise the error for an update whose conditions matched no row."""
+        db.rollback()
+        if expected_versions is not None:
+            raise HTTPException(status_code=412, detail="Property was changed or removed since it was read")
+        PropertyService._check_owned(db, property_id, owner_id)
+        # Deleted between the UPDATE and the check
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    @staticmethod
+    def _check_owned(db: Session, property_id: int, owner_id: int) -> None:
+        found = db.query(Property.owner_id).filter(Property.id == property_id, LIVE_PROPERTY).first()
+        if not found:
+            raise HTTPException(status_code=404, detail="Property not found")
+        if found.owner_id != owner_id:
+            raise HTTPException(status_code=403, detail="You can only update your own properties")
+
+    @staticmethod
+    def bulk_update_properties(db: Session, owner_id: int, request: PropertyBulkUpdateRequest) -> List[int]:
+        """Apply one price/status change to every matching property of ``owner_id``; return their ids.
+
+        Runs as a single ``UPDATE ... WHERE owner_id = :owner AND ... RETURNING``. The returned
+        columns rebuild the public projections of exactly those rows (one executemany by primary
+        key) before the commit, and only their cities' search versions and cached details are
+        invalidated. The matching rows' old price and status are read (and locked) first, for
+        the owner's dashboard counters.
+        """
+        values = {"updated_at": datetime.now(timezone.utc), "version": Property.version + 1}
+        if request.price is not None:
+            values["price"] = request.price
+        elif request.price_change_pct is not None:
+            values["price"] = func.round(cast(Property.price * (1 + request.price_change_pct / 100), Numeric), 2)
+        if request.status is not None:
+            values["status"] = PropertyStatus(request.status)
+
+        criteria = [Property.owner_id == owner_id, LIVE_PROPERTY]
+        if request.filter.city is not None:
+            criteria.append(func.lower(Property.city) == request.filter.city.lower())
+        if request.filter.bedrooms is not None:
+            criteria.append(Property.bedrooms == request.filter.bedrooms)
+        if request.filter.ids is not None:
+            criteria.append(Property.id.in_(request.filter.ids))
+        before = db.query(Property.price, Property.status).filter(*criteria).with_for_update().all()
+        if not before:
+            db.rollback()
+            return []
+        returning = PropertyService.columns_for(["id", "status", *PropertyPublic.model_fields])
+        rows = db.execute(
+            update(Property).where(*criteria).values(**values).returning(*returning)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        counters = Counter()
+        for old in before:
+            counters.update(listing_counters(old.status, old.price, sign=-1))
+        for row in rows:
+            counters.update(listing_counters(row.status, row.price))
+        OwnerStatsService.apply(db, owner_id, **counters)
+
+        PropertyService._write_projections(db, rows)
+        PropertyService.bump_listing_versions(db, [row.city for row in rows])
+        db.commit()
+        ids = sorted(row.id for row in rows)
+        for property_id in ids:
+            invalidation_bus.publish("property", property_id)
+        return ids
 
     @staticmethod
     def manage_application(
@@ -109,7 +461,7 @@ class PropertyService:
             raise HTTPException(status_code=404, detail="Application not found")
 
         # Ensure the application belongs to a property owned by the current user
-        prop = db.query(Property).filter(Property.id == application.property_id).first()
+        prop = db.query(Property).filter(Property.id == application.property_id, LIVE_PROPERTY).first()
         if not prop:
             raise HTTPException(status_code=404, detail="Property not found for application")
         if prop.owner_id != owner_id:
@@ -121,26 +473,98 @@ class PropertyService:
             "accepted": ApplicationStatus.ACCEPTED,
             "rejected": ApplicationStatus.REJECTED,
         }
+        was_open = is_open(application.status)
         application.status = new_status_map[payload.status]
+        OwnerStatsService.apply(db, owner_id, open_applications=int(is_open(application.status)) - int(was_open))
 
         db.add(application)
         db.commit()
         db.refresh(application)
+        # Pushed to the tenant's open GET /applications/stream connections
+        application_events.publish(
+            application.tenant_id,
+            "application_status",
+            {"application_id": application.id, "property_id": application.property_id, "status": application.status.value},
+        )
         return application
 
     @staticmethod
     def delete_property(db: Session, property_id: int, owner_id: int) -> int:
-        """Delete a property owned by the current user. Also clean up related applications."""
-        prop = db.query(Property).filter(Property.id == property_id).first()
+        """Delete a property owned by the current user.
+
+        Its applications and shortlist entries go with it through ON DELETE CASCADE. With
+        PROPERTY_SOFT_DELETE the property is only marked deleted, which hides it everywhere
+        at once, and ``purge_property`` removes the rows in small batches in the background.
+        """
+        prop = (
+            db.query(Property.id, Property.owner_id, Property.city, Property.price, Property.status)
+            .filter(Property.id == property_id, LIVE_PROPERTY)
+            .with_for_update()
+            .first()
+        )
         if not prop:
             raise HTTPException(status_code=404, detail="Property not found")
         if prop.owner_id != owner_id:
             raise HTTPException(status_code=403, detail="You can delete only your own properties")
 
-        # Delete related applications first (no cascade configured)
-        db.query(Application).filter(Application.property_id == property_id).delete(synchronize_session=False)
-
-        # Now delete the property
-        db.delete(prop)
+        open_applications = db.query(func.count(Application.id)).filter(
+            Application.property_id == property_id, Application.status.in_(OPEN_APPLICATION_STATUSES)
+        ).scalar()
+        shortlists = db.query(func.count(ShortlistedProperty.id)).filter(ShortlistedProperty.property_id == property_id).scalar()
+        PropertyService.bump_listing_versions(db, [prop.city])
+        if settings.PROPERTY_SOFT_DELETE:
+            now = datetime.now(timezone.utc)
+            db.execute(
+                update(Property)
+                .where(Property.id == property_id)
+                .values(deleted_at=now, updated_at=now, version=Property.version + 1)
+            )
+            JobService.enqueue(db, "property.purge", {"property_id": property_id})
+        else:
+            db.execute(delete(Property).where(Property.id == property_id))
+        # After the delete: an owner's first stats write counts the rows as they now are
+        db.flush()
+        OwnerStatsService.apply(
+            db, owner_id, **listing_counters(prop.status, prop.price, sign=-1),
+            open_applications=-open_applications, shortlists=-shortlists,
+        )
         db.commit()
+        invalidation_bus.publish("property", property_id)
         return property_id
+
+    @staticmethod
+    def purge_property(db: Session, property_id: int, batch_size: int = 500) -> int:
+        """Delete a soft-deleted property's applications, shortlist entries and row, committing every batch.
+
+        Each transaction touches at most ``batch_size`` rows, so no lock is held for long
+        however popular the listing was. Returns the number of rows deleted; safe to re-run.
+        """
+        deleted = 0
+        for model in (Application, ShortlistedProperty):
+            while True:
+                batch = db.query(model.id).filter(model.property_id == property_id).limit(batch_size)
+                count = db.execute(
+                    delete(model).where(model.id.in_(batch.scalar_subquery())).execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+                deleted += count
+                if count < batch_size:
+                    break
+        deleted += db.execute(
+            delete(Property).where(Property.id == property_id, Property.deleted_at.is_not(None))
+        ).rowcount
+        db.commit()
+        return deleted
+
+
+@job_handler("public_projection.backfill")
+def _backfill_public_projection_job(db: Session, payload: dict) -> None:
+    # Batches commit as they go, so a retry resumes with whatever is still missing
+    PropertyService.backfill_public_projection(
+        db, batch_size=payload.get("batch_size", 1000), rebuild=payload.get("rebuild", False)
+    )
+
+
+@job_handler("property.purge")
+def _purge_property_job(db: Session, payload: dict) -> None:
+    PropertyService.purge_property(db, payload["property_id"], batch_size=settings.PROPERTY_PURGE_BATCH_SIZE)
@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from server.core.invalidation import invalidation_bus
 from server.models.model import User
 from server.schemas.schema import UserMeResponse, UserMeUpdateRequest
 
@@ -18,5 +19,6 @@ class RegisteredUserService:
 
         db.add(user)
         db.commit()
+        invalidation_bus.publish("user", user.id)
         db.refresh(user)
         return UserMeResponse.from_orm(user)
@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from typing import List
 from server.models.model import User, UserType, Property, ShortlistedProperty, Application
 from server.schemas.schema import ShortlistRequest
+from server.services.owner_stats_service import OwnerStatsService
+from server.services.popularity_service import PopularityService
+from server.services.property_service import LIVE_PROPERTY
 
 class TenantService:
     @staticmethod
@@ -13,7 +16,7 @@ class TenantService:
             raise HTTPException(status_code=403, detail="Only tenants can shortlist properties")
 
         # Validate property exists
-        prop = db.query(Property).filter(Property.id == payload.property_id).first()
+        prop = db.query(Property).filter(Property.id == payload.property_id, LIVE_PROPERTY).first()
         if not prop:
             raise HTTPException(status_code=404, detail="Property not found")
 
@@ -32,6 +35,8 @@ class TenantService:
         # Create shortlist entry
         entry = ShortlistedProperty(user_id=tenant_id, property_id=payload.property_id)
         db.add(entry)
+        OwnerStatsService.apply(db, prop.owner_id, shortlists=1)
+        PopularityService.record(db, payload.property_id, "shortlist_count")
         db.commit()
         db.refresh(entry)
         return entry
@@ -47,7 +52,7 @@ class TenantService:
         shortlist_entries = (
             db.query(Property)
             .join(ShortlistedProperty, ShortlistedProperty.property_id == Property.id)
-            .filter(ShortlistedProperty.user_id == tenant_id)
+            .filter(ShortlistedProperty.user_id == tenant_id, LIVE_PROPERTY)
             .all()
         )
         return shortlist_entries
@@ -73,6 +78,11 @@ class TenantService:
             raise HTTPException(status_code=404, detail="Shortlisted property not found")
 
         db.delete(entry)
+        PopularityService.record(db, property_id, "shortlist_count", -1)
+        # A deleted listing's shortlists were already taken off its owner's counters
+        owner_id = db.query(Property.owner_id).filter(Property.id == property_id, LIVE_PROPERTY).scalar()
+        if owner_id is not None:
+            OwnerStatsService.apply(db, owner_id, shortlists=-1)
         db.commit()
         return None
 
@@ -84,7 +94,7 @@ class TenantService:
             raise HTTPException(status_code=403, detail="Only tenants can apply for properties")
 
         # Validate property exists
-        prop = db.query(Property).filter(Property.id == property_id).first()
+        prop = db.query(Property).filter(Property.id == property_id, LIVE_PROPERTY).first()
         if not prop:
             raise HTTPException(status_code=404, detail="Property not found")
 
@@ -103,6 +113,8 @@ class TenantService:
 
         application = Application(property_id=property_id, tenant_id=tenant_id)
         db.add(application)
+        OwnerStatsService.apply(db, prop.owner_id, open_applications=1)
+        PopularityService.record(db, property_id, "application_count")
         db.commit()
         db.refresh(application)
         return application
@@ -0,0 +1,97 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from server.core import security
+from server.models.model import Application, Property, ShortlistedProperty, User
+
+# Real authentication and sessions: sub-requests must see the batch's user and their own sessions,
+# which the conftest dependency overrides would replace
+
+
+@pytest.fixture
+def api(app, db_session):
+    app.dependency_overrides.clear()
+    client = TestClient(app)
+    yield client
+    db_session.rollback()
+    db_session.query(ShortlistedProperty).delete()
+    db_session.query(Application).delete()
+    db_session.query(Property).delete()
+    db_session.query(User).delete()
+    db_session.commit()
+
+
+def _login(api, email, user_type):
+    api.post("/auth/register", json={
+        "name": "Batch", "email": email, "phone": "1", "password": "pw", "user_type": user_type,
+    })
+    token = api.post("/auth/login", json={"email": email, "password": "pw"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _listing(**overrides):
+    return {
+        "name": "Flat", "address": "12 Road", "city": "Pune", "state": "MH", "pincode": "411001",
+        "price": 20000, "bedrooms": 2, "bathrooms": 1, "area_sqft": 800, **overrides,
+    }
+
+
+def test_batch_runs_dashboard_reads_with_one_auth(api, monkeypatch):
+    owner = _login(api, "owner@batch.example.com", "owner")
+    prop = api.post("/properties/", json=_listing(), headers=owner).json()
+
+    decodes = []
+    real_decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *a, **k: decodes.append(1) or real_decode(*a, **k))
+    r = api.post("/batch", headers=owner, json={"requests": [
+        {"id": "me", "path": "/users/me"},
+        {"id": "mine", "path": "/properties/mine"},
+        {"id": "detail", "path": f"/properties/{prop['id']}"},
+        {"id": "search", "path": "/properties/?city=Pune&limit=5"},
+        {"id": "missing", "path": "/properties/999999"},
+    ]})
+    assert r.status_code == 200
+    assert len(decodes) == 1
+    results = {item["id"]: item for item in r.json()["responses"]}
+    assert [item["id"] for item in r.json()["responses"]] == ["me", "mine", "detail", "search", "missing"]
+    assert results["me"]["status"] == 200 and results["me"]["body"]["email"] == "owner@batch.example.com"
+    assert [p["id"] for p in results["mine"]["body"]] == [prop["id"]]
+    assert results["detail"]["body"]["address"] == "xx Road" and "etag" in results["detail"]["headers"]
+    assert [p["name"] for p in results["search"]["body"]] == ["Flat"]
+    assert results["missing"]["status"] == 404 and results["missing"]["body"] == {"detail": "Property not found"}
+
+
+def test_writes_run_in_order_and_later_items_see_them(api):
+    owner = _login(api, "writer@batch.example.com", "owner")
+    r = api.post("/batch", headers=owner, json={"requests": [
+        {"method": "PUT", "path": "/users/me", "body": {"name": "Renamed"}},
+        {"method": "POST", "path": "/properties/", "body": _listing(name="Batched")},
+        {"method": "POST", "path": "/properties/", "body": {"name": "incomplete"}},
+        {"path": "/users/me"},
+        {"path": "/properties/mine"},
+    ]})
+    assert r.status_code == 200
+    statuses = [item["status"] for item in r.json()["responses"]]
+    assert statuses == [200, 201, 422, 200, 200]
+    me, mine = r.json()["responses"][3]["body"], r.json()["responses"][4]["body"]
+    assert me["name"] == "Renamed"
+    assert [p["name"] for p in mine] == ["Batched"]
+
+
+def test_batch_requires_authentication(api):
+    r = api.post("/batch", json={"requests": [{"path": "/users/me"}]})
+    assert r.status_code in (401, 403)
+
+
+def test_batch_limits(api, monkeypatch):
+    owner = _login(api, "limits@batch.example.com", "owner")
+    assert api.post("/batch", headers=owner, json={"requests": [{"path": "/batch"}]}).status_code == 422
+    # Streaming responses would hold the batch open (SSE) or buffer a whole export
+    for path in ("/applications/stream", "/applications/stream/", "/properties/export?format=csv"):
+        r = api.post("/batch", headers=owner, json={"requests": [{"path": "/users/me"}, {"path": path}]})
+        assert r.status_code == 422 and "cannot be batched" in r.text
+    assert api.post("/batch", headers=owner, json={"requests": [{"path": "users/me"}]}).status_code == 422
+    assert api.post("/batch", headers=owner, json={"requests": []}).status_code == 422
+    monkeypatch.setattr("server.api.batch_routes.settings.BATCH_MAX_ITEMS", 2)
+    r = api.post("/batch", headers=owner, json={"requests": [{"path": "/users/me"}] * 3})
+    assert r.status_code == 400
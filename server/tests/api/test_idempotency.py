@@ -0,0 +1,124 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from server.api import dependencies as api_deps
+from server.api.idempotency import idempotency_store, idempotent
+from server.models.model import Application, Property, ShortlistedProperty, User, UserType
+from server.schemas.schema import PropertyCreate
+
+
+@pytest.fixture(autouse=True)
+def _cleanup(db_session):
+    yield
+    db_session.rollback()
+    db_session.query(ShortlistedProperty).delete()
+    db_session.query(Application).delete()
+    db_session.query(Property).delete()
+    db_session.query(User).delete()
+    db_session.commit()
+
+
+def _listing(**overrides):
+    return {
+        "name": "Flat", "address": "12 Road", "city": "Pune", "state": "MH", "pincode": "411001",
+        "price": 20000, "bedrooms": 2, "bathrooms": 1, "area_sqft": 800, **overrides,
+    }
+
+
+def _as_user(app, db_session, email, user_type):
+    user = User(name="Idem", email=email, phone="1", password_hash="x", user_type=user_type)
+    db_session.add(user)
+    db_session.commit()
+    app.dependency_overrides[api_deps.get_current_user] = lambda: user
+    return user
+
+
+def test_retries_replay_the_first_response(client: TestClient, db_session):
+    headers = {"Idempotency-Key": "create-1"}
+    first = client.post("/properties/", json=_listing(), headers=headers)
+    retry = client.post("/properties/", json=_listing(), headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert "idempotent-replayed" not in first.headers and retry.headers["idempotent-replayed"] == "true"
+    assert db_session.query(Property).count() == 1
+    # A new key is a new request
+    assert client.post("/properties/", json=_listing(), headers={"Idempotency-Key": "create-2"}).json()["id"] != first.json()["id"]
+    assert idempotency_store.stats()["hits"] == 1
+
+
+def test_without_a_key_every_request_runs(client: TestClient, db_session):
+    client.post("/properties/", json=_listing())
+    client.post("/properties/", json=_listing())
+    assert db_session.query(Property).count() == 2
+
+
+def test_key_reuse_with_a_different_request_is_rejected(client: TestClient):
+    headers = {"Idempotency-Key": "reused"}
+    assert client.post("/properties/", json=_listing(), headers=headers).status_code == 201
+    r = client.post("/properties/", json=_listing(price=1), headers=headers)
+    assert r.status_code == 422 and "different request" in r.json()["detail"]
+    assert client.post("/properties/", json=_listing(), headers={"Idempotency-Key": ""}).status_code == 400
+
+
+def test_keys_are_scoped_to_the_user(app, client: TestClient, db_session):
+    headers = {"Idempotency-Key": "same"}
+    _as_user(app, db_session, "one@idem.example.com", UserType.OWNER)
+    one = client.post("/properties/", json=_listing(), headers=headers).json()
+    _as_user(app, db_session, "two@idem.example.com", UserType.OWNER)
+    two = client.post("/properties/", json=_listing(), headers=headers).json()
+    assert one["owner_id"] != two["owner_id"] and one["id"] != two["id"]
+
+
+def test_client_errors_are_replayed_too(app, client: TestClient, db_session):
+    _as_user(app, db_session, "tenant@idem.example.com", UserType.TENANT)
+    headers = {"Idempotency-Key": "apply-1"}
+    first = client.post("/applications/", json={"property_id": 999999}, headers=headers)
+    retry = client.post("/applications/", json={"property_id": 999999}, headers=headers)
+    assert first.status_code == retry.status_code == 404
+    assert retry.json() == {"detail": "Property not found"} and retry.headers["idempotent-replayed"] == "true"
+
+    assert client.post("/me/shortlist", json={"property_id": 999999}, headers={"Idempotency-Key": "s"}).status_code == 404
+
+
+def test_concurrent_duplicates_wait_for_the_first():
+    # Called directly with a stub ``run``: the threads share no client or database session
+    calls = []
+
+    class Created(BaseModel):
+        id: int
+
+    def run():
+        calls.append(1)
+        time.sleep(0.3)
+        return Created(id=len(calls))
+
+    def request():
+        return Request({
+            "type": "http", "method": "POST", "path": "/properties/", "query_string": b"",
+            "headers": [(b"idempotency-key", b"racing")],
+        })
+
+    owner = SimpleNamespace(id=1)
+    payload = PropertyCreate(**_listing())
+    responses = []
+
+    def post():
+        responses.append(idempotent(request(), owner, payload, Created, run, status_code=201))
+
+    threads = [threading.Thread(target=post) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert [r.status_code for r in responses] == [201, 201, 201]
+    assert {r.body for r in responses} == {b'{"id":1}'}
+    assert sorted(r.headers.get("idempotent-replayed", "") for r in responses) == ["", "true", "true"]
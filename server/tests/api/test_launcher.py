@@ -0,0 +1,87 @@
+"""End-to-end checks of the pre-forking launcher: real processes on a real socket."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="the launcher pre-forks workers")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, proc: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        assert proc.poll() is None, proc.stdout.read()
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise AssertionError("launcher did not become ready")
+
+
+@pytest.fixture
+def launch(tmp_path):
+    procs = []
+
+    def _launch(*args):
+        port = _free_port()
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp_path / 'launcher.db'}",
+            "SECRET_KEY": "launcher-test",
+            "DEBUG": "false",
+            "PYTHONPATH": f"{SERVER_DIR.parent}{os.pathsep}{os.environ.get('PYTHONPATH', '')}",
+        }
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "server.launcher", "--port", str(port), *args],
+            cwd=SERVER_DIR.parent, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )
+        procs.append(proc)
+        base = f"http://127.0.0.1:{port}"
+        _wait_ready(f"{base}/ops/ready", proc)
+        return proc, base
+
+    yield _launch
+    for proc in procs:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+def test_workers_are_recycled_after_max_requests(launch):
+    proc, base = launch("--workers", "2", "--max-requests", "5", "--max-requests-jitter", "0")
+    origins = set()
+    for _ in range(40):
+        r = httpx.get(f"{base}/ops/invalidation", timeout=10.0)
+        assert r.status_code == 200
+        origins.add(r.json()["origin"])
+    # 40 requests at 5 per worker: well past the first two workers
+    assert len(origins) > 2
+    assert proc.poll() is None
+
+
+def test_sigterm_drains_and_exits_cleanly(launch):
+    proc, base = launch("--workers", "2", "--graceful-timeout", "10")
+    assert httpx.get(f"{base}/", timeout=5.0).status_code == 200
+    proc.send_signal(signal.SIGTERM)
+    assert proc.wait(timeout=20) == 0
+    output = proc.stdout.read()
+    assert "Shut down cleanly" in output and "killing" not in output
+    with pytest.raises(httpx.TransportError):
+        httpx.get(f"{base}/", timeout=1.0)
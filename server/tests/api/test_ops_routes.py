@@ -0,0 +1,57 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from server.db.database import get_db
+
+
+def test_ready_checks_the_database(client: TestClient):
+    r = client.get("/ops/ready")
+    assert r.status_code == 200
+    assert r.json()["ready"] is True and "pool" in r.json()
+
+
+def test_ready_reports_a_saturated_pool(app, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ready.db'}", pool_size=1, max_overflow=0, pool_timeout=30)
+    held = engine.connect()  # the only connection, e.g. stuck in a slow request
+
+    def _get_db():
+        with Session(bind=engine) as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        r = TestClient(app).get("/ops/ready")
+        assert r.status_code == 503 and r.json()["ready"] is False
+        held.close()
+        assert TestClient(app).get("/ops/ready").status_code == 200
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+
+def test_ready_reports_database_errors(app):
+    class Broken(Session):
+        def execute(self, *args, **kwargs):
+            raise ConnectionError("db down")
+
+    engine = create_engine("sqlite://")
+
+    def _get_db():
+        with Broken(bind=engine) as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _get_db
+    try:
+        r = TestClient(app).get("/ops/ready")
+        assert r.status_code == 503 and r.json()["error"] == "ConnectionError"
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def test_job_stats_report_queue_depth(client: TestClient):
+    r = client.get("/ops/jobs")
+    assert r.status_code == 200
+    body = r.json()
+    assert set(body["queue"]["depth"]) == {"queued", "running", "done", "failed"}
+    assert "wait_ms" in body["worker"] and "run_ms" in body["worker"]
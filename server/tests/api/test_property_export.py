@@ -0,0 +1,114 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tracemalloc
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from server.api.property_routes import _export_chunks
+from server.core.security import get_password_hash
+from server.db.seed import SeedSpec, seed_database
+from server.models.model import User, UserType, Property
+from server.schemas.schema import PropertyExportQuery, PropertyPublic
+
+# Raise to 1_000_000 to check the full-catalog case locally (seeding takes a few minutes)
+MEMORY_ROWS = int(os.getenv("EXPORT_MEMORY_ROWS", "20000"))
+
+
+@pytest.fixture(autouse=True)
+def _cleanup(db_session):
+    yield
+    db_session.query(Property).delete()
+    db_session.query(User).delete()
+    db_session.commit()
+
+
+@pytest.fixture
+def listings(db_session):
+    owner = User(name="owner", email="export.owner@example.com", phone="1234567890",
+                 password_hash=get_password_hash("pass"), user_type=UserType.OWNER)
+    db_session.add(owner)
+    db_session.commit()
+    specs = [("York", 1200.0, 2), ("York", 3000.0, 3), ("Leeds", 900.0, 1)]
+    for i, (city, price, bedrooms) in enumerate(specs):
+        db_session.add(Property(
+            owner_id=owner.id, name=f"Home {i}", address=f"12/{i} Street 45", city=city, state="YK",
+            pincode="000001", price=price, bedrooms=bedrooms, bathrooms=1, area_sqft=700, description="desc",
+        ))
+    db_session.commit()
+
+
+def test_export_ndjson_matches_public_listing(client: TestClient, listings):
+    r = client.get("/properties/export", headers={"Accept-Encoding": "identity"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in r.headers["content-disposition"]
+    items = [json.loads(line) for line in r.text.splitlines()]
+    assert [i["name"] for i in items] == ["Home 0", "Home 1", "Home 2"]
+    assert set(items[0]) == set(PropertyPublic.model_fields)
+    assert items[0]["address"] == "xx/x Street xx"
+
+
+def test_export_applies_search_filters(client: TestClient, listings):
+    r = client.get("/properties/export", params={"city": "york", "max_price": 2000},
+                   headers={"Accept-Encoding": "identity"})
+    assert [json.loads(line)["name"] for line in r.text.splitlines()] == ["Home 0"]
+
+
+def test_export_csv(client: TestClient, listings):
+    r = client.get("/properties/export", params={"format": "csv", "min_bedrooms": 2},
+                   headers={"Accept-Encoding": "identity"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert list(rows[0]) == list(PropertyPublic.model_fields)
+    assert [row["name"] for row in rows] == ["Home 0", "Home 1"]
+    assert rows[1]["address"] == "xx/x Street xx"
+
+
+def test_export_rejects_unknown_format(client: TestClient):
+    assert client.get("/properties/export", params={"format": "xml"}).status_code == 422
+
+
+def test_export_gzip_on_the_fly(client: TestClient, listings):
+    plain = client.get("/properties/export", headers={"Accept-Encoding": "identity"})
+    # httpx decodes Content-Encoding transparently; read the raw stream to see the compressed body
+    with client.stream("GET", "/properties/export", headers={"Accept-Encoding": "gzip"}) as r:
+        assert r.headers["content-encoding"] == "gzip"
+        assert r.headers["vary"] == "Accept-Encoding"
+        raw = b"".join(r.iter_raw())
+    assert gzip.decompress(raw) == plain.content
+
+
+def _export_peak(engine, rows: int) -> int:
+    """Peak Python heap while streaming the first ``rows`` listings; the body is discarded."""
+    filters = PropertyExportQuery()
+    tracemalloc.start()
+    try:
+        total = 0
+        for chunk in _export_chunks(engine, filters):
+            total += chunk.count(b"\n")
+            if total >= rows:
+                break
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_export_memory_is_flat(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}")
+    spec = SeedSpec(users=max(100, MEMORY_ROWS // 50), properties=MEMORY_ROWS, applications=0, shortlists=0,
+                    seed=5, as_of=datetime(2025, 1, 1, tzinfo=timezone.utc))
+    seed_database(engine, spec, password_hash="x")
+    try:
+        small = _export_peak(engine, MEMORY_ROWS // 10)
+        large = _export_peak(engine, MEMORY_ROWS)
+    finally:
+        engine.dispose()
+    # 10x the rows must not mean materially more memory: only one batch and one chunk are held
+    assert large < small * 1.5 + 256 * 1024, (small, large)
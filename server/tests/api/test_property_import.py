@@ -0,0 +1,147 @@
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from server.api import dependencies as api_deps
+from server.api.streaming import csv_records, json_array_items
+from server.core.config import settings
+from server.models.model import ListingVersion, Property, User, UserType
+
+
+@pytest.fixture(autouse=True)
+def _cleanup(db_session):
+    yield
+    db_session.rollback()
+    db_session.query(Property).delete()
+    db_session.query(ListingVersion).delete()
+    db_session.query(User).delete()
+    db_session.commit()
+
+
+def _row(i, **overrides):
+    return {
+        "name": f"Unit {i}", "address": f"{i}/2 Tower Road", "city": "Pune", "state": "MH", "pincode": "411001",
+        "price": 20000 + i, "bedrooms": 2, "bathrooms": 1, "area_sqft": 800, **overrides,
+    }
+
+
+def _csv(rows):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=list(_row(0)) + ["description"])
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue()
+
+
+def _collect(decoder, body: bytes, chunk_size: int):
+    async def chunks():
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    async def run():
+        return [item async for item in decoder(chunks())]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+def test_json_array_items_across_chunk_boundaries(chunk_size):
+    items = [{"name": "é", "n": 12345}, 67890, [1, 2], "x"]
+    assert _collect(json_array_items, json.dumps(items).encode(), chunk_size) == items
+    assert _collect(json_array_items, b" [ ] ", chunk_size) == []
+
+
+@pytest.mark.parametrize("body", [b"", b"{}", b"[1,]", b"[1 2]", b"[1", b"[1] x"])
+def test_json_array_items_rejects_malformed_bodies(body):
+    with pytest.raises(ValueError):
+        _collect(json_array_items, body, 2)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_csv_records_handle_quoted_newlines_across_chunks(chunk_size):
+    body = '﻿name,description\r\nA,"two\r\nlines, ""quoted"""\r\n\r\nB,plain\r\nC,'.encode()
+    assert _collect(csv_records, body, chunk_size) == [
+        {"name": "A", "description": 'two\r\nlines, "quoted"'},
+        {"name": "B", "description": "plain"},
+        {"name": "C", "description": ""},
+    ]
+
+
+def test_json_import_inserts_rows_with_public_projection(client: TestClient, db_session):
+    r = client.post("/properties/bulk", json=[_row(i) for i in range(3)])
+    assert r.status_code == 200
+    assert r.json() == {"mode": "atomic", "received": 3, "created": 3, "failed": 0, "errors": [], "errors_truncated": False}
+
+    props = db_session.query(Property).order_by(Property.id).all()
+    assert [p.name for p in props] == ["Unit 0", "Unit 1", "Unit 2"]
+    assert props[1].masked_address == "x/x Tower Road"
+    assert json.loads(props[1].public_json)["address"] == "x/x Tower Road"
+    assert db_session.get(ListingVersion, "Pune").version >= 1
+    assert client.get(f"/properties/{props[0].id}").json()["name"] == "Unit 0"
+
+
+def test_csv_import_treats_empty_cells_as_missing(client: TestClient, db_session):
+    body = _csv([_row(0, description=""), _row(1, description="Corner flat")])
+    r = client.post("/properties/bulk", content=body, headers={"Content-Type": "text/csv"})
+    assert r.json()["created"] == 2
+    props = db_session.query(Property).order_by(Property.id).all()
+    assert [p.description for p in props] == [None, "Corner flat"]
+    assert props[0].price == 20000.0 and props[0].bedrooms == 2
+
+
+def test_atomic_import_reports_errors_and_inserts_nothing(client: TestClient, db_session):
+    rows = [_row(0), _row(1, price="cheap"), {"name": "Only a name"}, _row(3)]
+    r = client.post("/properties/bulk", json=rows)
+    body = r.json()
+    assert r.status_code == 200
+    assert body["received"] == 4 and body["failed"] == 2 and body["created"] == 0
+    assert [e["row"] for e in body["errors"]] == [2, 3]
+    assert any(msg.startswith("price:") for msg in body["errors"][0]["errors"])
+    assert db_session.query(Property).count() == 0
+
+
+def test_chunked_import_commits_valid_rows(client: TestClient, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_IMPORT_CHUNK_SIZE", 2)
+    rows = [_row(0), _row(1), _row(2, bedrooms="many"), _row(3), _row(4)]
+    body = client.post("/properties/bulk", params={"mode": "chunked"}, json=rows).json()
+    assert body["created"] == 4 and body["failed"] == 1 and body["errors"][0]["row"] == 3
+    assert db_session.query(Property).count() == 4
+
+
+def test_malformed_body_is_rejected(client: TestClient, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_IMPORT_CHUNK_SIZE", 1)
+    r = client.post(
+        "/properties/bulk", params={"mode": "chunked"},
+        content=b'[' + json.dumps(_row(0)).encode() + b', {"name": ',
+        headers={"Content-Type": "application/json"},
+    )
+    assert r.status_code == 400
+    assert "after row 1" in r.json()["detail"] and "1 rows were already committed" in r.json()["detail"]
+
+    r = client.post("/properties/bulk", content=b'[' + json.dumps(_row(0)).encode(), headers={"Content-Type": "application/json"})
+    assert r.status_code == 400
+    assert db_session.query(Property).count() == 1
+
+
+def test_import_limits_rows_and_listed_errors(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_ERRORS", 2)
+    body = client.post("/properties/bulk", json=[{}] * 5).json()
+    assert body["failed"] == 5 and len(body["errors"]) == 2 and body["errors_truncated"] is True
+
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_ROWS", 3)
+    r = client.post("/properties/bulk", json=[_row(i) for i in range(4)])
+    assert r.status_code == 400 and "at most 3 rows" in r.json()["detail"]
+
+
+def test_import_requires_owner(client: TestClient, db_session):
+    tenant = User(name="t", email="tenant@import.example.com", phone="1", password_hash="x", user_type=UserType.TENANT)
+    db_session.add(tenant)
+    db_session.commit()
+    client.app.dependency_overrides[api_deps.get_current_user] = lambda: tenant
+    r = client.post("/properties/bulk", json=[_row(0)])
+    assert r.status_code == 403
+    assert db_session.query(Property).count() == 0
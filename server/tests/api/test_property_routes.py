@@ -1,8 +1,11 @@
 import pytest
+from datetime import datetime, timezone
 from fastapi.testclient import TestClient
 from typing import Callable
 
-from server.models.model import User, UserType, Property, Application, ApplicationStatus
+from server.models.model import (
+    User, UserType, Property, PropertyStatus, Application, ApplicationStatus, ArchivedApplication, ArchivedProperty,
+)
 from server.core.security import get_password_hash
 from server.api import dependencies as api_deps
 
@@ -13,6 +16,8 @@ def _cleanup(db_session):
     yield
     db_session.query(Application).delete()
     db_session.query(Property).delete()
+    db_session.query(ArchivedApplication).delete()
+    db_session.query(ArchivedProperty).delete()
     db_session.query(User).delete()
     db_session.commit()
 
@@ -207,6 +212,75 @@ def test_update_property_owner_success_and_errors(client: TestClient, db_session
     _clear_override(app)
 
 
+def test_update_property_if_match_versions(client: TestClient, db_session):
+    app = client.app
+    owner = _mk_user(db_session, "occ@example.com", UserType.OWNER)
+    prop = _mk_property(db_session, owner, price=1000)
+    _override_current_user(app, owner)
+
+    etag = client.get(f"/properties/{prop.id}/mine").headers["etag"]
+    assert etag == '"v1"'
+    first = client.put(f"/properties/{prop.id}", json={"price": 1100}, headers={"If-Match": etag})
+    assert first.status_code == 200 and first.headers["etag"] == '"v2"'
+    assert first.json()["owner"]["email"] == "occ@example.com"
+
+    # A second device still holding v1 loses instead of overwriting
+    stale = client.put(f"/properties/{prop.id}", json={"price": 900}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert client.put(f"/properties/{prop.id}", json={"price": 900}, headers={"If-Match": 'W/"v2"'}).status_code == 412
+    db_session.expire_all()
+    assert db_session.get(Property, prop.id).price == 1100
+
+    # A list of tags, "*" and no header all work against the current version
+    assert client.put(f"/properties/{prop.id}", json={"price": 1200}, headers={"If-Match": '"v1", "v2"'}).headers["etag"] == '"v3"'
+    assert client.put(f"/properties/{prop.id}", json={"price": 1300}, headers={"If-Match": "*"}).headers["etag"] == '"v4"'
+    assert client.put(f"/properties/{prop.id}", json={"price": 1400}).headers["etag"] == '"v5"'
+    assert client.get(f"/properties/{prop.id}/mine").headers["etag"] == '"v5"'
+    assert client.put("/properties/99999", json={"price": 1}, headers={"If-Match": '"v1"'}).status_code == 412
+    _clear_override(app)
+
+
+def test_bulk_update_changes_only_matching_own_properties(client: TestClient, db_session):
+    app = client.app
+    owner = _mk_user(db_session, "bulk.o1@example.com", UserType.OWNER)
+    other = _mk_user(db_session, "bulk.o2@example.com", UserType.OWNER)
+    pune_2bhk = _mk_property(db_session, owner, city="Pune", bedrooms=2, price=20000, address="4/5 Lane")
+    pune_3bhk = _mk_property(db_session, owner, city="Pune", bedrooms=3, price=30000)
+    mumbai_2bhk = _mk_property(db_session, owner, city="Mumbai", bedrooms=2, price=40000)
+    others = _mk_property(db_session, other, city="Pune", bedrooms=2, price=20000)
+    # Warm the detail cache so the invalidation is visible
+    assert client.get(f"/properties/{pune_2bhk.id}").json()["price"] == 20000
+    etag = client.get("/properties/", params={"city": "Pune"}).headers["etag"]
+
+    _override_current_user(app, owner)
+    started = datetime.now(timezone.utc).replace(tzinfo=None)
+    r = client.patch("/properties/mine/bulk", json={"filter": {"city": "pune", "bedrooms": 2}, "price_change_pct": 5})
+    assert r.status_code == 200
+    assert r.json() == {"updated": 1, "ids": [pune_2bhk.id]}
+    db_session.expire_all()
+    assert db_session.get(Property, pune_2bhk.id).price == 21000
+    # The projection write keeps the update's full-precision updated_at (not CURRENT_TIMESTAMP)
+    assert db_session.get(Property, pune_2bhk.id).updated_at >= started
+    assert [db_session.get(Property, p.id).price for p in (pune_3bhk, mumbai_2bhk, others)] == [30000, 40000, 20000]
+    detail = client.get(f"/properties/{pune_2bhk.id}").json()
+    assert detail["price"] == 21000 and detail["address"] == "x/x Lane"
+    assert client.get("/properties/", params={"city": "Pune"}).headers["etag"] != etag
+
+    # Ids of someone else's listings never match; absolute price and status together
+    r = client.patch("/properties/mine/bulk", json={
+        "filter": {"ids": [pune_3bhk.id, others.id]}, "price": 25000, "status": "rented",
+    })
+    assert r.json() == {"updated": 1, "ids": [pune_3bhk.id]}
+    db_session.expire_all()
+    assert db_session.get(Property, pune_3bhk.id).status.value == "rented"
+    assert db_session.get(Property, others.id).price == 20000
+
+    assert client.patch("/properties/mine/bulk", json={"filter": {"city": "Delhi"}, "price": 1}).json()["updated"] == 0
+    assert client.patch("/properties/mine/bulk", json={"filter": {}}).status_code == 422
+    assert client.patch("/properties/mine/bulk", json={"price": 1, "price_change_pct": 5}).status_code == 422
+    _clear_override(app)
+
+
 def test_manage_application_status_success_and_errors(client: TestClient, db_session):
     app = client.app
     owner1 = _mk_user(db_session, "o1@example.com", UserType.OWNER)
@@ -235,9 +309,8 @@ def test_manage_application_status_success_and_errors(client: TestClient, db_ses
     r_404 = client.put("/applications/99999", json={"status": "viewed"})
     assert r_404.status_code == 404
 
-    # Simulate missing property for the application
-    app_obj.property_id = 99999
-    db_session.add(app_obj)
+    # The application's property was soft-deleted
+    prop.deleted_at = datetime.now(timezone.utc)
     db_session.commit()
 
     _override_current_user(app, owner1)
@@ -274,3 +347,322 @@ def test_apply_and_list_applications_tenant_and_owner_rules(client: TestClient,
     assert r_404.status_code == 404
 
     _clear_override(app)
+
+
+def test_property_detail_etag_and_conditional_get(client: TestClient, db_session):
+    app = client.app
+    owner = _mk_user(db_session, "etag.owner@example.com", UserType.OWNER)
+    prop = _mk_property(db_session, owner)
+
+    r = client.get(f"/properties/{prop.id}")
+    etag = r.headers["etag"]
+    assert etag.startswith('"') and r.headers["cache-control"].startswith("public, max-age=")
+
+    r_304 = client.get(f"/properties/{prop.id}", headers={"If-None-Match": etag})
+    assert r_304.status_code == 304
+    assert r_304.content == b"" and r_304.headers["etag"] == etag
+    assert client.get(f"/properties/{prop.id}", headers={"If-None-Match": f'"x", W/{etag}'}).status_code == 304
+
+    # Any update changes the validator
+    _override_current_user(app, owner)
+    assert client.put(f"/properties/{prop.id}", json={"price": 1200}).status_code == 200
+    _clear_override(app)
+    r_changed = client.get(f"/properties/{prop.id}", headers={"If-None-Match": etag})
+    assert r_changed.status_code == 200
+    assert r_changed.headers["etag"] != etag and r_changed.json()["price"] == 1200
+
+    assert client.get("/properties/99999", headers={"If-None-Match": etag}).status_code == 404
+
+
+def test_search_etag_tracks_city_versions(client: TestClient, db_session):
+    app = client.app
+    owner = _mk_user(db_session, "etag.search@example.com", UserType.OWNER)
+    _override_current_user(app, owner)
+    payload = {"name": "Flat", "address": "1 Road", "city": "Etagville", "state": "KA", "pincode": "560001",
+               "price": 1000, "bedrooms": 2, "bathrooms": 1, "area_sqft": 600}
+    assert client.post("/properties/", json=payload).status_code == 201
+
+    params = {"city": "etagville"}
+    r = client.get("/properties/", params=params)
+    etag = r.headers["etag"]
+    assert len(r.json()) == 1
+    assert client.get("/properties/", params=params, headers={"If-None-Match": etag}).status_code == 304
+    # Different query parameters are a different representation
+    assert client.get("/properties/", params={**params, "limit": 5}).headers["etag"] != etag
+
+    # A write in another city leaves the search valid
+    assert client.post("/properties/", json={**payload, "city": "Elsewhere"}).status_code == 201
+    assert client.get("/properties/", params=params, headers={"If-None-Match": etag}).status_code == 304
+
+    # A write in a matching city invalidates it
+    assert client.post("/properties/", json={**payload, "name": "Flat 2"}).status_code == 201
+    r_changed = client.get("/properties/", params=params, headers={"If-None-Match": etag})
+    assert r_changed.status_code == 200 and len(r_changed.json()) == 2
+    _clear_override(app)
+
+
+def test_property_detail_cache_hits_and_invalidation(client: TestClient, db_session):
+    from server.core.cache import property_detail_cache
+
+    app = client.app
+    owner = _mk_user(db_session, "cache.owner@example.com", UserType.OWNER)
+    prop = _mk_property(db_session, owner, price=1000)
+    before = client.get("/ops/cache").json()["property_detail"]
+
+    assert client.get(f"/properties/{prop.id}").json()["price"] == 1000
+    assert client.get(f"/properties/{prop.id}").json()["price"] == 1000
+    stats = client.get("/ops/cache").json()["property_detail"]
+    assert stats["misses"] - before["misses"] == 1 and stats["hits"] - before["hits"] == 1
+    assert stats["entries"] == 1 and 0 < stats["hit_ratio"] <= 1
+
+    # Owner writes drop the entry, so the next read sees them
+    _override_current_user(app, owner)
+    assert client.put(f"/properties/{prop.id}", json={"price": 1500}).status_code == 200
+    assert client.get(f"/properties/{prop.id}").json()["price"] == 1500
+    assert client.delete(f"/properties/{prop.id}").status_code == 200
+    _clear_override(app)
+    assert client.get(f"/properties/{prop.id}").status_code == 404
+    assert property_detail_cache.stats()["invalidations"] - before["invalidations"] == 2
+
+
+def test_featured_properties_snapshot(client: TestClient, db_session):
+    from server.schemas.schema import PropertyUpdate
+    from server.services.featured_service import featured_feed
+    from server.services.property_service import PropertyService
+    owner = _mk_user(db_session, "featured.route@example.com", UserType.OWNER)
+    prop = _mk_property(db_session, owner, name="Featured Home", address="9 Lane 4")
+
+    r = client.get("/properties/featured")
+    assert r.status_code == 200
+    assert [p["name"] for p in r.json()] == ["Featured Home"]
+    assert r.json()[0]["address"] == "x Lane x"
+    assert client.get("/properties/featured", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+    # A refresh with the same ranking keeps the ETag; an edit to a featured listing changes it
+    featured_feed.refresh(db_session)
+    assert client.get("/properties/featured", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+    PropertyService.update_property(db_session, prop.id, owner.id, PropertyUpdate(price=1800))
+    featured_feed.refresh(db_session)
+    r2 = client.get("/properties/featured", headers={"If-None-Match": r.headers["etag"]})
+    assert r2.status_code == 200 and r2.json()[0]["price"] == 1800
+    assert r2.headers["etag"] != r.headers["etag"]
+
+
+def _capture_selects(engine):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    from sqlalchemy import event
+    event.listen(engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _record)
+
+
+def test_search_sparse_fields_are_pushed_into_the_select(client: TestClient, db_session):
+    owner = _mk_user(db_session, "sparse@example.com", UserType.OWNER)
+    _mk_property(db_session, owner, name="Card", city="Sparseville", price=1500, description="long " * 500)
+
+    full = client.get("/properties/", params={"city": "Sparseville"})
+    statements, stop = _capture_selects(db_session.get_bind())
+    try:
+        r = client.get("/properties/", params={"city": "Sparseville", "fields": "price,name,city,bedrooms,name"})
+    finally:
+        stop()
+    assert r.status_code == 200
+    assert r.json() == [{"name": "Card", "city": "Sparseville", "price": 1500.0, "bedrooms": 2}]
+    listing_selects = [s for s in statements if "FROM properties" in s]
+    assert listing_selects and all("description" not in s and "public_json" not in s for s in listing_selects)
+    assert r.headers["etag"] != full.headers["etag"]
+    # Same selection in another order is the same representation
+    same = client.get("/properties/", params={"city": "Sparseville", "fields": "bedrooms,city,name,price"})
+    assert same.headers["etag"] == r.headers["etag"]
+    assert client.get("/properties/", params={"city": "Sparseville", "fields": "address"}).json() == [{"address": "xx/x Street xx"}]
+
+    bad = client.get("/properties/", params={"fields": "name,owner_id"})
+    assert bad.status_code == 422 and "owner_id" in bad.json()["detail"]
+
+
+def test_property_detail_and_mine_sparse_fields(client: TestClient, db_session):
+    app = client.app
+    owner = _mk_user(db_session, "sparse.detail@example.com", UserType.OWNER)
+    prop = _mk_property(db_session, owner, address="7 Lane", description="long " * 500)
+
+    r = client.get(f"/properties/{prop.id}", params={"fields": "name,address"})
+    assert r.status_code == 200 and r.json() == {"name": "Nice Home", "address": "x Lane"}
+    assert client.get(
+        f"/properties/{prop.id}", params={"fields": "address,name"}, headers={"If-None-Match": r.headers["etag"]}
+    ).status_code == 304
+    assert client.get(f"/properties/{prop.id}").headers["etag"] != r.headers["etag"]
+    assert client.get("/properties/99999", params={"fields": "name"}).status_code == 404
+    assert client.get(f"/properties/{prop.id}", params={"fields": "password_hash"}).status_code == 422
+
+    _override_current_user(app, owner)
+    mine = client.get("/properties/mine", params={"fields": "id,price"})
+    assert mine.json() == [{"id": prop.id, "price": 1000.0}]
+    _clear_override(app)
+
+
+def _parse_sse(body: str):
+    events = []
+    for frame in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append(fields)
+    return events
+
+
+def _end_streams_when(condition):
+    import threading
+    import time
+    from server.core.events import application_events
+
+    def run():
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        application_events.disconnect_all()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_application_stream_pushes_status_changes_to_the_tenant(client: TestClient, db_session):
+    import json
+    from sqlalchemy.orm import Session
+    from server.core.events import application_events
+    from server.schemas.schema import ApplicationUpdateRequest
+    from server.services.property_service import PropertyService
+
+    app = client.app
+    owner = _mk_user(db_session, "sse.owner@example.com", UserType.OWNER)
+    tenant = _mk_user(db_session, "sse.tenant@example.com", UserType.TENANT)
+    prop = _mk_property(db_session, owner)
+    application = Application(property_id=prop.id, tenant_id=tenant.id)
+    db_session.add(application)
+    db_session.commit()
+    application_id, tenant_id, owner_id = application.id, tenant.id, owner.id
+
+    def owner_accepts():
+        if application_events.subscriber_count(tenant_id) == 0:
+            return False
+        with Session(bind=db_session.get_bind()) as db:
+            PropertyService.manage_application(db, application_id, owner_id, ApplicationUpdateRequest(status="accepted"))
+        return True
+
+    _override_current_user(app, tenant)
+    thread = _end_streams_when(owner_accepts)
+    r = client.get("/applications/stream")
+    thread.join()
+    _clear_override(app)
+
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/event-stream")
+    assert r.text.startswith("retry: ")
+    events = _parse_sse(r.text)
+    assert [e["event"] for e in events] == ["application_status"]
+    assert json.loads(events[0]["data"]) == {"application_id": application_id, "property_id": prop.id, "status": "accepted"}
+
+
+def test_application_stream_resumes_from_last_event_id(client: TestClient, db_session):
+    from server.core.events import application_events
+
+    app = client.app
+    tenant = _mk_user(db_session, "sse.resume@example.com", UserType.TENANT)
+    seen = application_events.publish(tenant.id, "application_status", {"status": "viewed"})
+    application_events.publish(tenant.id + 1, "application_status", {"status": "viewed"})
+    application_events.publish(tenant.id, "application_status", {"status": "rejected"})
+
+    _override_current_user(app, tenant)
+    thread = _end_streams_when(lambda: application_events.subscriber_count(tenant.id) > 0)
+    r = client.get("/applications/stream", headers={"Last-Event-ID": str(seen)})
+    thread.join()
+    thread = _end_streams_when(lambda: application_events.subscriber_count(tenant.id) > 0)
+    stale = client.get("/applications/stream", headers={"Last-Event-ID": "1"})
+    thread.join()
+    _clear_override(app)
+
+    assert [e["data"] for e in _parse_sse(r.text)] == ['{"status": "rejected"}']
+    assert _parse_sse(stale.text)[0]["event"] == "reset"
+
+
+def test_history_endpoints_list_archived_rows(client: TestClient, db_session):
+    from datetime import datetime, timedelta, timezone
+    from server.services.archive_service import ArchiveService
+
+    app = client.app
+    owner = _mk_user(db_session, "history.owner@example.com", UserType.OWNER)
+    tenant = _mk_user(db_session, "history.tenant@example.com", UserType.TENANT)
+    prop = _mk_property(db_session, owner, name="Let long ago")
+    prop.status = PropertyStatus.RENTED
+    db_session.add(Application(property_id=prop.id, tenant_id=tenant.id, status=ApplicationStatus.ACCEPTED))
+    db_session.commit()
+    prop_id = prop.id
+    ArchiveService.run(db_session, now=datetime.now(timezone.utc) + timedelta(days=365))
+
+    _override_current_user(app, owner)
+    assert client.get("/properties/mine").json() == []
+    r = client.get("/properties/mine/history")
+    assert r.status_code == 200
+    [item] = r.json()
+    assert item["id"] == prop_id and item["address"] == "12/3 Street 45" and item["status"] == "rented"
+    assert item["archived_at"]
+    assert client.get(f"/properties/{prop_id}").status_code == 404
+
+    _override_current_user(app, tenant)
+    assert client.get("/applications/").json() == []
+    r = client.get("/applications/history", params={"limit": 1})
+    assert [(a["property_id"], a["status"]) for a in r.json()] == [(prop_id, "accepted")]
+    _clear_override(app)
+
+
+def test_my_properties_summary(client: TestClient, db_session):
+    app = client.app
+    owner = _mk_user(db_session, "summary.owner@example.com", UserType.OWNER)
+    _override_current_user(app, owner)
+    assert client.get("/properties/mine/summary").json() == {
+        "total": 0, "available": 0, "rented": 0, "average_rent": None, "open_applications": 0, "shortlists": 0,
+    }
+
+    for price in (10000, 15000, 20000):
+        r = client.post("/properties/", json={
+            "name": "Flat", "address": "1 Main Rd", "city": "Pune", "state": "MH", "pincode": "411001",
+            "price": price, "bedrooms": 2, "bathrooms": 1, "area_sqft": 700,
+        })
+        assert r.status_code == 201
+    prop_id = r.json()["id"]
+    client.patch("/properties/mine/bulk", json={"filter": {"ids": [prop_id]}, "status": "rented"})
+
+    tenant = _mk_user(db_session, "summary.tenant@example.com", UserType.TENANT)
+    _override_current_user(app, tenant)
+    client.post("/applications/", json={"property_id": prop_id})
+    client.post("/me/shortlist", json={"property_id": prop_id})
+
+    _override_current_user(app, owner)
+    assert client.get("/properties/mine/summary").json() == {
+        "total": 3, "available": 2, "rented": 1, "average_rent": 15000.0, "open_applications": 1, "shortlists": 1,
+    }
+    _clear_override(app)
+
+
+def test_detail_views_and_shortlists_show_in_owner_list(client: TestClient, db_session):
+    from server.services.popularity_service import popularity_counters
+
+    app = client.app
+    owner = _mk_user(db_session, "popular.owner@example.com", UserType.OWNER)
+    tenant = _mk_user(db_session, "popular.tenant@example.com", UserType.TENANT)
+    prop = _mk_property(db_session, owner)
+
+    first = client.get(f"/properties/{prop.id}")
+    client.get(f"/properties/{prop.id}", headers={"If-None-Match": first.headers["ETag"]})
+    client.get(f"/properties/{prop.id}", params={"fields": "name"})
+    _override_current_user(app, tenant)
+    client.post("/me/shortlist", json={"property_id": prop.id})
+    popularity_counters.flush(db_session.get_bind())
+
+    _override_current_user(app, owner)
+    [item] = client.get("/properties/mine").json()
+    assert (item["view_count"], item["shortlist_count"], item["application_count"]) == (3, 1, 0)
+    assert client.get("/ops/counters").json()["pending"] == 0
+    _clear_override(app)
@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from server.api.responses import construct, dump_list
+from server.models.model import ApplicationStatus, PropertyStatus, UserType
+from server.schemas.schema import ApplicationResponse, Property as PropertyResponse, PropertyPublic
+
+
+def _owner():
+    return SimpleNamespace(
+        id=7, name="Åsa Owner", email="o@example.com", phone="1", user_type=UserType.OWNER,
+        created_at=datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc),
+    )
+
+
+def _rows():
+    return [
+        SimpleNamespace(
+            id=i, owner_id=7, name=f"Home {i} — 2BHK", address=f"{i} Main St", city="Pune", state="MH",
+            pincode="411001", price=12500.0 + i, bedrooms=2, bathrooms=1, area_sqft=900,
+            description=None if i % 2 else "Sunny \"corner\" flat", status=PropertyStatus.AVAILABLE,
+            created_at=datetime(2024, 6, i + 1, 8, 0), updated_at=None, owner=_owner(),
+        )
+        for i in range(5)
+    ]
+
+
+def _default_fastapi_body(model, rows) -> bytes:
+    """What FastAPI itself produces for response_model=List[model]."""
+    app = FastAPI()
+
+    @app.get("/items", response_model=List[model])
+    def items():
+        return rows
+
+    return TestClient(app).get("/items").content
+
+
+def test_fast_path_matches_fastapi_for_flat_model():
+    rows = _rows()
+    assert dump_list(PropertyPublic, (construct(PropertyPublic, r) for r in rows)) == _default_fastapi_body(PropertyPublic, rows)
+
+
+def test_fast_path_matches_fastapi_for_nested_model_with_enums():
+    rows = _rows()
+    fast = dump_list(PropertyResponse, (construct(PropertyResponse, r) for r in rows))
+    assert fast == _default_fastapi_body(PropertyResponse, rows)
+    assert b'"user_type":"owner"' in fast
+
+
+def test_fast_path_matches_fastapi_for_applications():
+    rows = [
+        SimpleNamespace(id=1, property_id=2, tenant_id=3, status=ApplicationStatus.VIEWED,
+                        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc)),
+    ]
+    fast = dump_list(ApplicationResponse, (construct(ApplicationResponse, r) for r in rows))
+    assert fast == _default_fastapi_body(ApplicationResponse, rows)
+
+
+def test_construct_overrides_attributes():
+    row = _rows()[1]
+    item = construct(PropertyPublic, row, address="x Main St")
+    assert item.address == "x Main St" and item.name == row.name
@@ -0,0 +1,109 @@
+import gzip
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from server.api.static_files import IMMUTABLE, REVALIDATE, mount_client
+
+INDEX = b"<!doctype html><div id=root></div>"
+BUNDLE = b"console.log('app');" * 200
+
+
+@pytest.fixture
+def dist(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_bytes(INDEX)
+    (tmp_path / "assets" / "index-B3f9a1c2.js").write_bytes(BUNDLE)
+    (tmp_path / "assets" / "index-B3f9a1c2.js.gz").write_bytes(gzip.compress(BUNDLE))
+    (tmp_path / "assets" / "index-B3f9a1c2.js.br").write_bytes(b"pretend-brotli")
+    (tmp_path / "hero-background.png").write_bytes(b"\x89PNG")
+    return tmp_path
+
+
+@pytest.fixture
+def db_calls():
+    return []
+
+
+@pytest.fixture
+def static_client(dist, db_calls):
+    app = FastAPI()
+
+    def _db():
+        db_calls.append(1)
+
+    @app.get("/properties/")
+    def search(db=Depends(_db)):
+        return []
+
+    @app.post("/properties/")
+    def create(db=Depends(_db)):
+        return {}
+
+    mount_client(app, str(dist))
+    return TestClient(app)
+
+
+def test_index_and_spa_fallback(static_client):
+    r = static_client.get("/")
+    assert r.status_code == 200 and r.content == INDEX
+    assert r.headers["content-type"].startswith("text/html")
+    assert r.headers["cache-control"] == REVALIDATE
+
+    # Browser navigation to a client-side route gets the app shell
+    r = static_client.get("/properties-page/42", headers={"Accept": "text/html,application/xhtml+xml"})
+    assert r.status_code == 200 and r.content == INDEX
+    # API clients and missing assets still get a 404
+    assert static_client.get("/nope/42", headers={"Accept": "application/json"}).status_code == 404
+    assert static_client.get("/assets/missing-12345678.js", headers={"Accept": "text/html"}).status_code == 404
+
+
+def test_precompressed_variants_and_immutable_caching(static_client):
+    r = static_client.get("/assets/index-B3f9a1c2.js", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.content == BUNDLE  # transparently decoded by the client
+    assert r.headers["content-type"].startswith("text/javascript")
+    assert r.headers["cache-control"] == IMMUTABLE and r.headers["vary"] == "Accept-Encoding"
+
+    with static_client.stream("GET", "/assets/index-B3f9a1c2.js", headers={"Accept-Encoding": "br, gzip"}) as r:
+        assert r.headers["content-encoding"] == "br"
+        assert b"".join(r.iter_raw()) == b"pretend-brotli"
+
+    r = static_client.get("/assets/index-B3f9a1c2.js", headers={"Accept-Encoding": "identity, gzip;q=0"})
+    assert "content-encoding" not in r.headers and r.content == BUNDLE
+
+    # Un-hashed files outside assets/ are revalidated even if their name looks hashed
+    assert static_client.get("/hero-background.png").headers["cache-control"] == REVALIDATE
+
+
+def test_etag_and_range(static_client):
+    r = static_client.get("/assets/index-B3f9a1c2.js", headers={"Accept-Encoding": "identity"})
+    etag = r.headers["etag"]
+    r_304 = static_client.get(
+        "/assets/index-B3f9a1c2.js", headers={"Accept-Encoding": "identity", "If-None-Match": etag}
+    )
+    assert r_304.status_code == 304
+    gz = static_client.get("/assets/index-B3f9a1c2.js", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["etag"] != etag  # each encoding is its own representation
+
+    r = static_client.get("/assets/index-B3f9a1c2.js", headers={"Accept-Encoding": "identity", "Range": "bytes=0-9"})
+    assert r.status_code == 206 and r.content == BUNDLE[:10]
+    assert r.headers["content-range"] == f"bytes 0-9/{len(BUNDLE)}"
+
+
+def test_static_requests_skip_request_dependencies(static_client, db_calls):
+    static_client.get("/")
+    static_client.get("/assets/index-B3f9a1c2.js")
+    static_client.get("/some/page", headers={"Accept": "text/html"})
+    assert db_calls == []
+
+
+def test_api_routes_win_and_keep_slash_redirects(static_client, db_calls):
+    assert static_client.get("/properties/").json() == []
+    assert db_calls == [1]
+    r = static_client.get("/properties", follow_redirects=False)
+    assert r.status_code == 307 and r.headers["location"].endswith("/properties/")
+    r = static_client.post("/properties", follow_redirects=False)
+    assert r.status_code == 307
+    assert static_client.delete("/index.html").status_code == 405
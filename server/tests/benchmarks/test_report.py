@@ -0,0 +1,38 @@
+import pytest
+
+from server.benchmarks.report import percentile, summarize, compare_to_baseline
+from server.benchmarks.http_load import parse_weights, DEFAULT_WEIGHTS
+
+
+def test_percentile_nearest_rank():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_reports_per_endpoint_percentiles_in_ms():
+    report = summarize({"GET /x": [0.001] * 90 + [0.010] * 10}, {"GET /x": 2}, elapsed=2.0)
+    row = report["endpoints"]["GET /x"]
+    assert row["count"] == 100 and row["errors"] == 2
+    assert row["throughput_rps"] == 50.0
+    assert row["p50_ms"] == 1.0 and row["p99_ms"] == 10.0
+    assert report["requests"] == 100 and report["throughput_rps"] == 50.0
+
+
+def test_compare_to_baseline_flags_only_regressions_past_threshold():
+    baseline = summarize({"GET /a": [0.010] * 100, "GET /b": [0.010] * 100}, {}, elapsed=1.0)
+    current = summarize({"GET /a": [0.011] * 100, "GET /b": [0.020] * 100}, {}, elapsed=1.0)
+    regressions = compare_to_baseline(current, baseline, max_regression=0.2)
+    assert len(regressions) == 1 and regressions[0].startswith("GET /b")
+
+    slower = summarize({"GET /a": [0.010] * 50}, {}, elapsed=1.0)
+    assert any("throughput" in r for r in compare_to_baseline(slower, baseline, max_regression=0.2))
+
+
+def test_parse_weights():
+    assert parse_weights(None) == DEFAULT_WEIGHTS
+    assert parse_weights("search=3,detail=1") == {"search": 3, "detail": 1}
+    with pytest.raises(ValueError):
+        parse_weights("unknown=1")
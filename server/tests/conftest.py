@@ -40,10 +40,26 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Create all tables once for the test database (models imported above register tables)
+# Recreate all tables once for the test database (models imported above register tables),
+# so a test DB left over from an older schema never leaks into the run
+Base.metadata.drop_all(bind=engine)
 Base.metadata.create_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    """In-process caches outlive a test; start each one cold (ids are reused across tests)."""
+    from server.api.idempotency import idempotency_store
+    from server.core.cache import property_detail_cache
+    from server.services.featured_service import featured_feed
+    from server.services.popularity_service import popularity_counters
+    property_detail_cache.clear()
+    idempotency_store.clear()
+    featured_feed.snapshot = None
+    popularity_counters.clear()
+    yield
+
+
 @pytest.fixture(scope="function")
 def db_session() -> Generator[Session, None, None]:
     """Provide a transactional scope around a series of operations."""
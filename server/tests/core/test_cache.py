@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+
+from server.core.cache import ENTRY_OVERHEAD, DetailCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _loader(payload=b"x", calls=None):
+    def load():
+        if calls is not None:
+            calls.append(1)
+        return payload, "meta"
+    return load
+
+
+def test_fresh_hit_and_metrics():
+    cache = DetailCache(max_bytes=10_000, ttl=10)
+    calls = []
+    assert cache.get_or_load(1, _loader(b"one", calls)) == (b"one", "meta")
+    assert cache.get_or_load(1, _loader(b"other", calls)) == (b"one", "meta")
+    stats = cache.stats()
+    assert len(calls) == 1
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_ratio"] == 0.5
+    assert stats["entries"] == 1 and stats["bytes"] == 3 + ENTRY_OVERHEAD
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = DetailCache(max_bytes=3 * (100 + ENTRY_OVERHEAD), ttl=10)
+    for key in (1, 2, 3):
+        cache.get_or_load(key, _loader(b"a" * 100))
+    cache.get_or_load(1, _loader())  # touch 1 so 2 is the oldest
+    cache.get_or_load(4, _loader(b"b" * 100))
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["evictions"] == 1 and stats["bytes"] <= cache.max_bytes
+    calls = []
+    cache.get_or_load(2, _loader(b"a" * 100, calls))
+    assert calls == [1]
+    # A value larger than the whole budget is served but never stored
+    cache.get_or_load(5, _loader(b"c" * cache.max_bytes))
+    assert 5 not in cache._entries
+
+
+def test_stale_while_revalidate_refreshes_once_in_background():
+    clock = FakeClock()
+    cache = DetailCache(max_bytes=10_000, ttl=10, stale_ttl=60, clock=clock)
+    cache.get_or_load(1, _loader(b"old"))
+    clock.now = 30
+    release = threading.Event()
+    calls = []
+
+    def slow_reload():
+        calls.append(1)
+        release.wait(5)
+        return b"new", "meta"
+
+    # Stale entries are served immediately while one refresh runs
+    assert cache.get_or_load(1, slow_reload)[0] == b"old"
+    assert cache.get_or_load(1, slow_reload)[0] == b"old"
+    release.set()
+    for _ in range(100):
+        if cache._entries[1].value[0] == b"new":
+            break
+        time.sleep(0.01)
+    assert cache.get_or_load(1, _loader(b"unused"))[0] == b"new"
+    assert len(calls) == 1 and cache.stats()["stale_hits"] == 2
+
+    # Past the stale window the entry is reloaded in the foreground
+    clock.now = 200
+    assert cache.get_or_load(1, _loader(b"newest"))[0] == b"newest"
+
+
+def test_single_flight_coalesces_concurrent_misses():
+    cache = DetailCache(max_bytes=10_000, ttl=10)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return b"value", "meta"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load(7, slow_load))) for _ in range(20)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    while cache.stats()["coalesced"] < 19:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 1
+    assert results == [(b"value", "meta")] * 20
+
+
+def test_load_errors_reach_waiters_and_are_not_cached():
+    cache = DetailCache(max_bytes=10_000, ttl=10)
+
+    def failing():
+        raise LookupError("gone")
+
+    with pytest.raises(LookupError):
+        cache.get_or_load(1, failing)
+    assert cache.stats()["load_errors"] == 1 and cache.stats()["entries"] == 0
+
+
+def test_invalidate_discards_in_flight_load():
+    cache = DetailCache(max_bytes=10_000, ttl=10)
+    cache.get_or_load(1, _loader(b"v1"))
+    cache.invalidate(1)
+    calls = []
+    assert cache.get_or_load(1, _loader(b"v2", calls))[0] == b"v2"
+    assert calls == [1]
+
+    # A load that started before the write still answers its caller but is not kept
+    started, release = threading.Event(), threading.Event()
+
+    def racing_load():
+        started.set()
+        release.wait(5)
+        return b"before-write", "meta"
+
+    cache.invalidate(2)
+    t = threading.Thread(target=cache.get_or_load, args=(2, racing_load))
+    t.start()
+    started.wait(5)
+    cache.invalidate(2)
+    release.set()
+    t.join(5)
+    assert 2 not in cache._entries
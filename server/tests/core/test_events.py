@@ -0,0 +1,99 @@
+import asyncio
+
+from server.api.streaming import sse_chunks
+from server.core.events import EventHub
+from server.core.invalidation import InvalidationBus, LocalTransport
+
+
+def _hub(replay_size=10, queue_size=10):
+    return EventHub("test_events", replay_size=replay_size, queue_size=queue_size, bus=InvalidationBus(LocalTransport()))
+
+
+async def _drain(sub):
+    events = []
+    while not sub.queue.empty():
+        events.append(sub.queue.get_nowait())
+    return events
+
+
+def test_events_reach_only_the_keys_subscribers():
+    async def scenario():
+        hub = _hub()
+        mine, other = hub.subscribe(1), hub.subscribe(2)
+        event_id = hub.publish(1, "application_status", {"status": "viewed"})
+        await asyncio.sleep(0)  # deliveries are scheduled on the loop
+        events = await _drain(mine)
+        assert [(e.id, e.event, e.data) for e in events] == [(event_id, "application_status", {"status": "viewed"})]
+        assert events[0].encode() == f'id: {event_id}\nevent: application_status\ndata: {{"status": "viewed"}}\n\n'.encode()
+        assert await _drain(other) == []
+        hub.unsubscribe(mine)
+        assert hub.subscriber_count(1) == 0 and hub.subscriber_count() == 1
+
+    asyncio.run(scenario())
+
+
+def test_resume_replays_missed_events_or_asks_for_a_reset():
+    async def scenario():
+        hub = _hub(replay_size=3)
+        first = hub.publish(1, "application_status", {"n": 1})
+        hub.publish(2, "application_status", {"n": 2})
+        hub.publish(1, "application_status", {"n": 3})
+
+        resumed = hub.subscribe(1, last_event_id=first)
+        assert [e.data for e in await _drain(resumed)] == [{"n": 3}]
+
+        # Evicting the event a client last saw loses nothing; evicting one after it might have
+        hub.publish(3, "application_status", {"n": 4})
+        assert [e.data for e in await _drain(hub.subscribe(1, last_event_id=first))] == [{"n": 3}]
+        hub.publish(3, "application_status", {"n": 5})
+        stale = hub.subscribe(1, last_event_id=first)
+        assert [e.event for e in await _drain(stale)] == ["reset", "application_status"]
+        # Ids from before this hub existed (e.g. another worker before a restart) are stale too
+        assert [e.event for e in await _drain(hub.subscribe(1, last_event_id=1))][0] == "reset"
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscribers_are_disconnected():
+    async def scenario():
+        hub = _hub(queue_size=2)
+        sub = hub.subscribe(1)
+        for n in range(3):
+            hub.publish(1, "application_status", {"n": n})
+        await asyncio.sleep(0)
+        assert await _drain(sub) == [None]
+
+    asyncio.run(scenario())
+
+
+def test_bus_reset_tells_every_subscriber_to_refetch():
+    async def scenario():
+        hub = _hub()
+        subs = [hub.subscribe(1), hub.subscribe(2)]
+        hub.publish(1, "application_status", {})
+        hub.reset()
+        await asyncio.sleep(0)
+        assert [e.event for e in await _drain(subs[0])] == ["application_status", "reset"]
+        assert [e.event for e in await _drain(subs[1])] == ["reset"]
+        assert hub.stats()["resets"] == 1 and hub.stats()["buffered"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_sse_chunks_send_heartbeats_and_end_on_disconnect():
+    async def scenario():
+        hub = _hub()
+        stream = sse_chunks(hub, 1, None, heartbeat=0.01)
+        assert (await stream.__anext__()).startswith(b"retry: ")
+        assert await stream.__anext__() == b": keep-alive\n\n"
+        hub.publish(1, "application_status", {"status": "accepted"})
+        frame = await stream.__anext__()
+        while frame.startswith(b":"):
+            frame = await stream.__anext__()
+        assert b"event: application_status" in frame
+        hub.disconnect_all()
+        frames = [f async for f in stream]
+        assert all(f.startswith(b":") for f in frames)
+        assert hub.subscriber_count() == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,116 @@
+import json
+import socket
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from server.core.invalidation import (
+    InvalidationBus,
+    LocalTransport,
+    PostgresTransport,
+    UnixSocketTransport,
+    transport_from_settings,
+)
+from server.core import invalidation as invalidation_module
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def socket_dir():
+    # Short path: AF_UNIX socket paths are limited to ~108 bytes
+    with tempfile.TemporaryDirectory(prefix="inv") as d:
+        yield d
+
+
+def test_publish_applies_locally_without_a_transport():
+    bus = InvalidationBus(LocalTransport())
+    seen = []
+    bus.subscribe("property", seen.append)
+    bus.publish("property", 7)
+    bus.publish("user", 1)  # no subscribers is fine
+    assert seen == [7]
+    stats = bus.stats()
+    assert stats["published"] == 2 and stats["applied"] == 2 and stats["dropped"] == 0
+
+
+def test_unix_transport_broadcasts_to_other_workers(socket_dir):
+    workers = [InvalidationBus(UnixSocketTransport(socket_dir)) for _ in range(3)]
+    seen = {i: [] for i in range(3)}
+    for i, bus in enumerate(workers):
+        bus.subscribe("property", seen[i].append)
+        bus.start()
+    try:
+        workers[0].publish("property", 42)
+        assert _wait_for(lambda: seen[1] == [42] and seen[2] == [42])
+        # The publisher applied it once, locally, and ignores its own broadcast
+        time.sleep(0.05)
+        assert seen[0] == [42]
+        stats = workers[1].stats()
+        assert stats["received"] == 1 and stats["lag_ms"]["max"] >= 0
+    finally:
+        for bus in workers:
+            bus.close()
+
+
+def test_unix_transport_cleans_up_sockets_of_exited_workers(socket_dir):
+    # A crashed worker leaves its socket file behind with nobody reading it
+    dead = Path(socket_dir) / "dead.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.bind(str(dead))
+    live = InvalidationBus(UnixSocketTransport(socket_dir))
+    live.start()
+    try:
+        live.publish("property", 1)
+        assert not dead.exists()
+        assert live.stats()["dropped"] == 0
+    finally:
+        live.close()
+
+
+def test_malformed_events_are_counted_as_dropped():
+    bus = InvalidationBus(LocalTransport())
+    bus._on_message(b"not json")
+    bus._on_message(json.dumps({"topic": "property"}).encode())
+    assert bus.stats()["dropped"] == 2 and bus.stats()["applied"] == 0
+
+
+def test_send_failures_are_counted_and_do_not_raise():
+    class Broken(LocalTransport):
+        def send(self, payload):
+            raise ConnectionError("down")
+
+    bus = InvalidationBus(Broken())
+    seen = []
+    bus.subscribe("property", seen.append)
+    bus.publish("property", 3)
+    assert seen == [3] and bus.stats()["dropped"] == 1
+
+
+def test_reset_clears_subscribed_caches():
+    bus = InvalidationBus(LocalTransport())
+    resets = []
+    bus.subscribe("property", lambda key: None, reset=lambda: resets.append(1))
+    bus._reset()
+    assert resets == [1] and bus.stats()["resets"] == 1
+
+
+def test_transport_from_settings(monkeypatch):
+    settings = invalidation_module.settings
+    monkeypatch.setattr(settings, "INVALIDATION_TRANSPORT", "postgres")
+    monkeypatch.setattr(settings, "INVALIDATION_URL", "postgresql+psycopg2://nb:secret@db:5432/nb")
+    transport = transport_from_settings()
+    assert isinstance(transport, PostgresTransport)
+    assert transport.dsn == "postgresql://nb:secret@db:5432/nb"
+    monkeypatch.setattr(settings, "INVALIDATION_TRANSPORT", "carrier-pigeon")
+    with pytest.raises(ValueError):
+        transport_from_settings()
@@ -0,0 +1,100 @@
+import logging
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.schema import CreateTable
+
+from server.db import database
+
+
+def _legacy_properties(conn):
+    """The current properties table as created before it was AUTOINCREMENT, with one row and its owner."""
+    database.Base.metadata.tables["users"].create(conn)
+    conn.exec_driver_sql(
+        "INSERT INTO users (id, name, email, phone, password_hash, user_type) VALUES (1, 'O', 'o@x', '0', 'h', 'OWNER')"
+    )
+    ddl = str(CreateTable(database.Base.metadata.tables["properties"]).compile(dialect=conn.dialect))
+    conn.exec_driver_sql(ddl.replace(" AUTOINCREMENT", ""))
+    conn.exec_driver_sql(
+        "INSERT INTO properties (id, owner_id, name, address, city, state, pincode, price, bedrooms, bathrooms, "
+        "area_sqft, status, version, shortlist_count, application_count, view_count) "
+        "VALUES (1, 1, 'Live', 'a', 'c', 's', 'p', 1, 1, 1, 1, 'AVAILABLE', 1, 0, 0, 0)"
+    )
+
+
+def test_create_tables_adds_missing_columns_and_indexes(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    # A properties table from before the public projection columns and owner index existed
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE properties (id INTEGER PRIMARY KEY, owner_id INTEGER NOT NULL, name VARCHAR(255) NOT NULL)"
+        )
+    monkeypatch.setattr(database, "engine", engine)
+
+    database.create_tables()
+
+    inspector = inspect(engine)
+    columns = {c["name"] for c in inspector.get_columns("properties")}
+    assert {"masked_address", "public_json"} <= columns
+    assert "ix_properties_owner_id" in {i["name"] for i in inspector.get_indexes("properties")}
+    engine.dispose()
+
+
+def test_foreign_keys_are_enforced_and_cascade(tmp_path, monkeypatch, caplog):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fk.db'}")
+    # A shortlist table from before its foreign keys had ON DELETE rules
+    with engine.begin() as conn:
+        _legacy_properties(conn)
+        conn.exec_driver_sql(
+            "CREATE TABLE shortlisted_properties (id INTEGER PRIMARY KEY, created_at DATETIME, "
+            "user_id INTEGER NOT NULL REFERENCES users(id), property_id INTEGER NOT NULL REFERENCES properties(id))"
+        )
+        conn.exec_driver_sql("INSERT INTO shortlisted_properties (id, user_id, property_id) VALUES (7, 1, 1)")
+    monkeypatch.setattr(database, "engine", engine)
+
+    with caplog.at_level(logging.INFO, logger=database.logger.name):
+        database.create_tables()
+
+    # The old table is rebuilt with the model's rules and keeps its rows and indexes
+    assert "Rebuilt shortlisted_properties" in caplog.text
+    inspector = inspect(engine)
+    shortlists = {tuple(fk["constrained_columns"]): fk for fk in inspector.get_foreign_keys("shortlisted_properties")}
+    assert shortlists[("property_id",)]["options"]["ondelete"] == "CASCADE"
+    assert "ix_shortlisted_properties_property_id" in {i["name"] for i in inspector.get_indexes("shortlisted_properties")}
+    with engine.begin() as conn:
+        assert conn.exec_driver_sql("SELECT id, user_id, property_id FROM shortlisted_properties").all() == [(7, 1, 1)]
+        conn.exec_driver_sql("DELETE FROM properties WHERE id = 1")
+        assert conn.exec_driver_sql("SELECT count(*) FROM shortlisted_properties").scalar() == 0
+
+    applications = {tuple(fk["constrained_columns"]): fk for fk in inspect(engine).get_foreign_keys("applications")}
+    assert applications[("property_id",)]["options"]["ondelete"] == "CASCADE"
+    with engine.begin() as conn:
+        assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+    engine.dispose()
+
+
+def test_sqlite_ids_are_not_reused_after_migration(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ids.db'}")
+    # A properties table from before AUTOINCREMENT, whose highest ids were archived
+    with engine.begin() as conn:
+        _legacy_properties(conn)
+        database.Base.metadata.tables["properties_archive"].create(conn)
+        conn.exec_driver_sql(
+            "INSERT INTO properties_archive (id, owner_id, name, address, city, state, pincode, price, bedrooms, "
+            "bathrooms, area_sqft, status, archived_at) VALUES (5, 1, 'Gone', 'a', 'c', 's', 'p', 1, 1, 1, 1, 'RENTED', '2025-01-01')"
+        )
+    monkeypatch.setattr(database, "engine", engine)
+
+    database.create_tables()
+    database.create_tables()  # a second start changes nothing
+
+    with engine.connect() as conn:
+        ddl = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = 'properties'").scalar()
+        assert "AUTOINCREMENT" in ddl
+        assert conn.exec_driver_sql("SELECT id, name FROM properties").all() == [(1, "Live")]
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.exec_driver_sql(
+            "INSERT INTO properties (owner_id, name, address, city, state, pincode, price, bedrooms, bathrooms, "
+            "area_sqft, status) VALUES (1, 'New', 'a', 'c', 's', 'p', 1, 1, 1, 1, 'AVAILABLE')"
+        )
+        assert conn.exec_driver_sql("SELECT id FROM properties WHERE name = 'New'").scalar() == 6
+    engine.dispose()
@@ -0,0 +1,174 @@
+"""
+Query-plan regression tests for the service layer.
+
+Each case runs a service method against a seeded SQLite database, EXPLAINs every
+statement it emitted and fails on full scans of large tables. Normalized plans are
+stored in query_plans.json; regenerate it after an intentional change with
+    UPDATE_QUERY_PLANS=1 pytest tests/db/test_query_plans.py
+and review the diff.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from server.db.query_plan import capture_sql, explain_captured, fingerprint, scan_report
+from server.db.seed import SeedSpec, seed_database
+from server.models.model import Application, Property, ShortlistedProperty, User
+from server.schemas.schema import (
+    ApplicationUpdateRequest, PropertyBulkFilter, PropertyBulkUpdateRequest, ShortlistRequest, UserLoginRequest,
+)
+from server.services.archive_service import ArchiveService
+from server.services.auth_service import AuthService
+from server.services.featured_service import FeaturedService
+from server.services.owner_stats_service import OwnerStatsService
+from server.services.property_service import PropertyService
+from server.services.tenant_service import TenantService
+from server.core.security import get_password_hash
+
+PLANS_FILE = Path(__file__).with_name("query_plans.json")
+UPDATE = os.getenv("UPDATE_QUERY_PLANS") == "1"
+PASSWORD = "plan-password"
+
+
+@pytest.fixture(scope="module")
+def seeded(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    spec = SeedSpec(users=500, properties=5000, applications=10000, shortlists=10000, seed=3,
+                    as_of=datetime(2025, 1, 1, tzinfo=timezone.utc))
+    seed_database(engine, spec, password_hash=get_password_hash(PASSWORD))
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+        application = conn.execute(select(Application.id, Application.tenant_id, Application.property_id)).first()
+        owner_id = conn.execute(select(Property.owner_id).where(Property.id == application.property_id)).scalar_one()
+        tenant_email = conn.execute(select(User.email).where(User.id == application.tenant_id)).scalar_one()
+        shortlisted = conn.execute(
+            select(ShortlistedProperty.property_id).where(ShortlistedProperty.user_id == application.tenant_id)
+        ).scalar()
+        # An owner no write case touches, so their counters row never exists
+        other_owner_id = conn.execute(select(Property.owner_id).where(Property.owner_id != owner_id)).scalar()
+    fixtures = {
+        "application_id": application.id,
+        "tenant_id": application.tenant_id,
+        "tenant_email": tenant_email,
+        "owner_id": owner_id,
+        "other_owner_id": other_owner_id,
+        "property_id": application.property_id,
+        "shortlisted_property_id": shortlisted or application.property_id,
+    }
+    yield engine, fixtures
+    engine.dispose()
+
+
+# name -> (service call, tables allowed to be scanned with the reason)
+CASES = {
+    "login": (
+        lambda db, fx: AuthService.login_user(UserLoginRequest(email=fx["tenant_email"], password=PASSWORD), db),
+        (),
+    ),
+    "list_all_properties": (
+        lambda db, fx: PropertyService.get_all_properties(db, limit=20),
+        ("properties",),  # unfiltered page: the scan stops at LIMIT
+    ),
+    "search_properties": (
+        lambda db, fx: PropertyService.search_public_listings(db, city="Pune", max_price=20000, min_bedrooms=2, limit=20),
+        ("properties",),  # substring ILIKE on city cannot use a b-tree index; bounded by LIMIT
+    ),
+    "property_detail": (
+        lambda db, fx: PropertyService.get_public_listing(db, fx["property_id"]),
+        (),
+    ),
+    "featured_rank": (
+        lambda db, fx: FeaturedService.rank_featured(db, limit=20, candidates=500),
+        # newest listings walk ix_properties_created_at up to LIMIT; engagement leaders sort the
+        # unindexed popularity counters (background refresher only)
+        ("properties",),
+    ),
+    "owner_listing": (
+        lambda db, fx: PropertyService.get_properties_by_owner(db, fx["owner_id"]),
+        (),
+    ),
+    "owner_summary": (
+        # No stored row for this owner: the first read aggregates their listings
+        lambda db, fx: OwnerStatsService.get_summary(db, fx["other_owner_id"]),
+        (),
+    ),
+    "owner_history": (
+        lambda db, fx: ArchiveService.get_archived_properties(db, fx["owner_id"]),
+        (),
+    ),
+    "owner_bulk_update": (
+        lambda db, fx: PropertyService.bulk_update_properties(
+            db, fx["owner_id"], PropertyBulkUpdateRequest(filter=PropertyBulkFilter(bedrooms=2), price_change_pct=5)
+        ),
+        (),
+    ),
+    "shortlist_add": (
+        lambda db, fx: TenantService.shortlist_property(db, fx["tenant_id"], ShortlistRequest(property_id=fx["shortlisted_property_id"])),
+        (),
+    ),
+    "shortlist_list": (
+        lambda db, fx: TenantService.get_shortlisted_properties(db, fx["tenant_id"]),
+        (),
+    ),
+    "apply": (
+        lambda db, fx: TenantService.apply_for_property(db, fx["tenant_id"], fx["property_id"]),
+        (),
+    ),
+    "applications_list": (
+        lambda db, fx: TenantService.get_my_applications(db, fx["tenant_id"]),
+        (),
+    ),
+    "applications_history": (
+        lambda db, fx: ArchiveService.get_archived_applications(db, fx["tenant_id"]),
+        (),
+    ),
+    "manage_application": (
+        lambda db, fx: PropertyService.manage_application(
+            db, fx["application_id"], fx["owner_id"], ApplicationUpdateRequest(status="viewed")
+        ),
+        (),
+    ),
+}
+
+
+def _stored():
+    if PLANS_FILE.exists():
+        return json.loads(PLANS_FILE.read_text())
+    return {"sqlite_version": sqlite3.sqlite_version, "cases": {}}
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_service_query_plans(seeded, name):
+    engine, fx = seeded
+    call, allowed = CASES[name]
+    db = sessionmaker(bind=engine)()
+    try:
+        with capture_sql(engine) as captured:
+            call(db, fx)
+    finally:
+        db.close()
+
+    assert captured, f"{name} emitted no SQL"
+    plans = explain_captured(engine, captured)
+    problems = scan_report(plans, captured, allow=allowed)
+    assert not problems, "\n".join(problems)
+
+    stored = _stored()
+    entry = {"fingerprint": fingerprint(plans), "plans": plans}
+    if UPDATE:
+        stored["sqlite_version"] = sqlite3.sqlite_version
+        stored["cases"][name] = entry
+        PLANS_FILE.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        return
+    if stored["sqlite_version"] != sqlite3.sqlite_version or name not in stored["cases"]:
+        pytest.skip("no stored plan for this SQLite version; regenerate with UPDATE_QUERY_PLANS=1")
+    assert entry == stored["cases"][name], (
+        f"Query plan for {name} changed; review and regenerate with UPDATE_QUERY_PLANS=1"
+    )
@@ -0,0 +1,138 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from server.core.config import settings
+from server.services.archive_service import ArchiveService
+from server.models.model import (
+    User,
+    UserType,
+    Property,
+    PropertyStatus,
+    ShortlistedProperty,
+    Application,
+    ApplicationStatus,
+    ArchivedApplication,
+    ArchivedProperty,
+    ListingVersion,
+)
+
+
+# -------------------- fixtures & helpers --------------------
+
+@pytest.fixture(autouse=True)
+def _cleanup_tables(db_session):
+    """Ensure isolation: clean hot and archive tables after each test."""
+    try:
+        yield
+    finally:
+        try:
+            db_session.rollback()
+        except Exception:
+            pass
+        db_session.query(Application).delete()
+        db_session.query(ShortlistedProperty).delete()
+        db_session.query(Property).delete()
+        db_session.query(ArchivedApplication).delete()
+        db_session.query(ArchivedProperty).delete()
+        db_session.query(ListingVersion).delete()
+        db_session.query(User).delete()
+        db_session.commit()
+
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+OLD = NOW - timedelta(days=400)
+RECENT = NOW - timedelta(days=10)
+
+
+def _mk_user(db_session, email: str, user_type: UserType) -> User:
+    u = User(name="U", email=email, phone="0000000000", password_hash="h", user_type=user_type)
+    db_session.add(u)
+    db_session.commit()
+    return u
+
+
+def _mk_property(db_session, owner: User, status: PropertyStatus, changed_at: datetime, name: str) -> Property:
+    p = Property(
+        owner_id=owner.id, name=name, address="12 Lake Road", city="Pune", state="MH", pincode="411001",
+        price=20000.0, bedrooms=2, bathrooms=1, area_sqft=800, status=status,
+        created_at=changed_at, updated_at=changed_at,
+    )
+    db_session.add(p)
+    db_session.commit()
+    return p
+
+
+def _mk_application(db_session, prop: Property, tenant: User, status: ApplicationStatus, created_at: datetime) -> Application:
+    a = Application(property_id=prop.id, tenant_id=tenant.id, status=status, created_at=created_at)
+    db_session.add(a)
+    db_session.commit()
+    return a
+
+
+# -------------------- run --------------------
+
+def test_run_moves_only_cold_rows(db_session):
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    tenant = _mk_user(db_session, "t@example.com", UserType.TENANT)
+    cold = _mk_property(db_session, owner, PropertyStatus.RENTED, OLD, "Cold")
+    rented_recently = _mk_property(db_session, owner, PropertyStatus.RENTED, RECENT, "Warm")
+    available = _mk_property(db_session, owner, PropertyStatus.AVAILABLE, OLD, "Open")
+    on_cold = _mk_application(db_session, cold, tenant, ApplicationStatus.ACCEPTED, OLD)
+    db_session.add(ShortlistedProperty(user_id=tenant.id, property_id=cold.id))
+    old_rejection = _mk_application(db_session, available, tenant, ApplicationStatus.REJECTED, OLD)
+    _mk_application(db_session, rented_recently, tenant, ApplicationStatus.REJECTED, RECENT)
+    _mk_application(db_session, available, tenant, ApplicationStatus.SENT, OLD)
+    cold_id, on_cold_id, old_rejection_id = cold.id, on_cold.id, old_rejection.id
+
+    assert ArchiveService.run(db_session, now=NOW, batch_size=1) == {"properties": 1, "applications": 2}
+    db_session.expire_all()
+
+    assert {p.name for p in db_session.query(Property)} == {"Warm", "Open"}
+    assert db_session.query(Application).count() == 2
+    assert db_session.query(ShortlistedProperty).count() == 0
+
+    archived = db_session.query(ArchivedProperty).one()
+    assert (archived.id, archived.name, archived.owner_id, archived.status) == (cold_id, "Cold", owner.id, PropertyStatus.RENTED)
+    assert archived.address == "12 Lake Road" and archived.archived_at is not None
+    assert {a.id for a in db_session.query(ArchivedApplication)} == {on_cold_id, old_rejection_id}
+
+    # A second run finds nothing left to move
+    assert ArchiveService.run(db_session, now=NOW) == {"properties": 0, "applications": 0}
+
+
+def test_archived_ids_are_not_reused(db_session):
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    tenant = _mk_user(db_session, "t@example.com", UserType.TENANT)
+    # Each run archives the newest listing and application, whose ids SQLite would hand out again
+    archived_ids = set()
+    for name in ("First", "Second"):
+        prop = _mk_property(db_session, owner, PropertyStatus.RENTED, OLD, name)
+        _mk_application(db_session, prop, tenant, ApplicationStatus.REJECTED, OLD)
+        assert prop.id not in archived_ids
+        archived_ids.add(prop.id)
+        assert ArchiveService.run(db_session, now=NOW) == {"properties": 1, "applications": 1}
+
+    db_session.expire_all()
+    assert {p.id for p in db_session.query(ArchivedProperty)} == archived_ids
+    assert {a.property_id for a in db_session.query(ArchivedApplication)} == archived_ids
+
+
+def test_run_uses_configured_thresholds(db_session, monkeypatch):
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    _mk_property(db_session, owner, PropertyStatus.RENTED, RECENT, "Warm")
+    monkeypatch.setattr(settings, "ARCHIVE_RENTED_AFTER_DAYS", 5)
+    assert ArchiveService.run(db_session, now=NOW)["properties"] == 1
+
+
+def test_history_is_scoped_to_user(db_session):
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    other = _mk_user(db_session, "other@example.com", UserType.OWNER)
+    tenant = _mk_user(db_session, "t@example.com", UserType.TENANT)
+    for o in (owner, other):
+        prop = _mk_property(db_session, o, PropertyStatus.RENTED, OLD, f"Home of {o.email}")
+        _mk_application(db_session, prop, tenant, ApplicationStatus.ACCEPTED, OLD)
+    ArchiveService.run(db_session, now=NOW)
+
+    assert [p.name for p in ArchiveService.get_archived_properties(db_session, owner.id)] == ["Home of o@example.com"]
+    assert len(ArchiveService.get_archived_applications(db_session, tenant.id)) == 2
+    assert ArchiveService.get_archived_applications(db_session, owner.id) == []
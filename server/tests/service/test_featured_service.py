@@ -0,0 +1,95 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from server.models.model import Application, Property, PropertyStatus, ShortlistedProperty, User, UserType
+from server.services.featured_service import FeaturedFeed, FeaturedService
+from server.services.popularity_service import PopularityService
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _cleanup_tables(db_session):
+    yield
+    db_session.rollback()
+    db_session.query(ShortlistedProperty).delete()
+    db_session.query(Application).delete()
+    db_session.query(Property).delete()
+    db_session.query(User).delete()
+    db_session.commit()
+
+
+def _mk_user(db_session, email, user_type):
+    u = User(name="U", email=email, phone="0000000000", password_hash="h", user_type=user_type)
+    db_session.add(u)
+    db_session.commit()
+    return u
+
+
+def _mk_property(db_session, owner, name, age_days, status=PropertyStatus.AVAILABLE):
+    p = Property(owner_id=owner.id, name=name, address="1 Road", city="City", state="S", pincode="1", price=1000.0,
+                 bedrooms=1, bathrooms=1, area_sqft=500, status=status, created_at=NOW - timedelta(days=age_days))
+    db_session.add(p)
+    db_session.commit()
+    return p
+
+
+@pytest.fixture
+def listings(db_session):
+    owner = _mk_user(db_session, "featured.owner@example.com", UserType.OWNER)
+    tenants = [_mk_user(db_session, f"featured.t{i}@example.com", UserType.TENANT) for i in range(4)]
+    popular = _mk_property(db_session, owner, "popular", age_days=60)
+    fresh = _mk_property(db_session, owner, "fresh", age_days=0)
+    old = _mk_property(db_session, owner, "old", age_days=90)
+    rented = _mk_property(db_session, owner, "rented", age_days=0, status=PropertyStatus.RENTED)
+    for t in tenants:
+        db_session.add(ShortlistedProperty(user_id=t.id, property_id=popular.id))
+        db_session.add(Application(property_id=popular.id, tenant_id=t.id))
+        db_session.add(ShortlistedProperty(user_id=t.id, property_id=rented.id))
+    db_session.commit()
+    # Ranking reads the popularity counters, which the service write paths maintain
+    PopularityService.recount(db_session)
+    return {"popular": popular.id, "fresh": fresh.id, "old": old.id, "rented": rented.id}
+
+
+def test_featured_score_combines_recency_and_engagement():
+    score = FeaturedService.featured_score
+    assert score(NOW, 0, 0, NOW) > score(NOW - timedelta(days=7), 0, 0, NOW) > score(NOW - timedelta(days=70), 0, 0, NOW)
+    assert score(NOW - timedelta(days=70), 5, 0, NOW) > score(NOW - timedelta(days=70), 0, 0, NOW)
+    assert score(None, 0, 5, NOW) > score(None, 5, 0, NOW)
+    # Naive timestamps (SQLite) are treated as UTC
+    assert score(NOW.replace(tzinfo=None), 0, 0, NOW) == score(NOW, 0, 0, NOW)
+
+
+def test_rank_featured_orders_by_score_and_skips_rented(db_session, listings):
+    ranked = FeaturedService.rank_featured(db_session, limit=10, candidates=10, now=NOW)
+    assert ranked == [listings["popular"], listings["fresh"], listings["old"]]
+    assert FeaturedService.rank_featured(db_session, limit=1, candidates=10, now=NOW) == [listings["popular"]]
+
+
+def test_feed_swaps_snapshots_and_refreshes_when_dirty(db_session, listings):
+    feed = FeaturedFeed(interval=3600, debounce=0)
+    first = feed.get(db_session)
+    assert first.version == 1
+    assert [p["name"] for p in json.loads(first.body)][:1] == ["popular"]
+    assert feed.get(db_session) is first
+
+    async def scenario():
+        task = asyncio.create_task(feed.run(db_session.get_bind()))
+        for _ in range(200):
+            if feed.snapshot.version >= 2:
+                break
+            await asyncio.sleep(0.01)
+        feed.mark_dirty(listings["old"])
+        for _ in range(200):
+            if feed.snapshot.version >= 3:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(scenario())
+    assert feed.snapshot.version == 3
+    assert feed.stats()["refreshes"] == 3 and feed.stats()["items"] == 3
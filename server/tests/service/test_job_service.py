@@ -0,0 +1,170 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from server.models.model import Job, JobStatus
+from server.services import job_service
+from server.services.job_service import JobService, JobWorker, job_handler
+
+calls = []
+
+
+@job_handler("test.record")
+def _record(db, payload):
+    calls.append(payload)
+
+
+@job_handler("test.flaky")
+def _flaky(db, payload):
+    calls.append(payload)
+    if len(calls) < payload["fail_times"] + 1:
+        raise RuntimeError("transient")
+
+
+@pytest.fixture(autouse=True)
+def _cleanup_jobs(db_session):
+    calls.clear()
+    db_session.query(Job).delete()
+    db_session.commit()
+    yield
+    db_session.rollback()
+    db_session.query(Job).delete()
+    db_session.commit()
+
+
+def _worker(**kwargs):
+    options = {"concurrency": 1, "poll_interval": 0.05, "lock_timeout": 600, "retention": 3600}
+    return JobWorker(**{**options, **kwargs})
+
+
+def test_enqueue_rejects_unknown_kinds(db_session):
+    with pytest.raises(ValueError):
+        JobService.enqueue(db_session, "test.nope")
+
+
+def test_claim_locks_due_jobs_once(db_session):
+    first = JobService.enqueue(db_session, "test.record", {"n": 1})
+    JobService.enqueue(db_session, "test.record", {"n": 2}, delay=3600)
+    db_session.commit()
+
+    claimed = JobService.claim(db_session, "w1", limit=5)
+    assert [j.id for j in claimed] == [first.id]
+    assert claimed[0].status == JobStatus.RUNNING and claimed[0].attempts == 1 and claimed[0].locked_by == "w1"
+    assert JobService.claim(db_session, "w2", limit=5) == []
+    # The delayed job becomes due later
+    later = datetime.now(timezone.utc) + timedelta(hours=2)
+    assert len(JobService.claim(db_session, "w2", now=later)) == 1
+
+
+def test_concurrent_claimers_never_share_a_job(db_session):
+    for n in range(40):
+        JobService.enqueue(db_session, "test.record", {"n": n})
+    db_session.commit()
+    bind = db_session.get_bind()
+    seen, lock = [], threading.Lock()
+
+    def claimer(name):
+        with Session(bind=bind) as db:
+            while True:
+                jobs = JobService.claim(db, name, limit=3)
+                if not jobs:
+                    return
+                with lock:
+                    seen.extend(j.id for j in jobs)
+
+    threads = [threading.Thread(target=claimer, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(seen) == 40 and len(set(seen)) == 40
+
+
+def test_failures_back_off_then_give_up(db_session, monkeypatch):
+    monkeypatch.setattr(job_service.settings, "JOB_BACKOFF_SECONDS", 10.0)
+    JobService.enqueue(db_session, "test.record", max_attempts=2)
+    db_session.commit()
+
+    job = JobService.claim(db_session, "w")[0]
+    before = datetime.now(timezone.utc)
+    assert JobService.fail(db_session, job, "boom") is True
+    assert job.status == JobStatus.QUEUED and job.last_error == "boom"
+    delay = (job.run_at.replace(tzinfo=timezone.utc) - before).total_seconds()
+    assert 8 <= delay <= 12.5
+
+    job = JobService.claim(db_session, "w", now=before + timedelta(seconds=13))[0]
+    assert JobService.fail(db_session, job, "boom again") is False
+    assert job.status == JobStatus.FAILED and job.attempts == 2 and job.finished_at is not None
+
+
+def test_backoff_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(job_service.settings, "JOB_BACKOFF_SECONDS", 1.0)
+    monkeypatch.setattr(job_service.settings, "JOB_BACKOFF_MAX_SECONDS", 30.0)
+    monkeypatch.setattr(job_service.random, "uniform", lambda a, b: 1.0)
+    assert [job_service.backoff_seconds(n) for n in (1, 2, 3, 6, 20)] == [1.0, 2.0, 4.0, 30.0, 30.0]
+
+
+def test_stale_locks_are_requeued(db_session):
+    JobService.enqueue(db_session, "test.record")
+    JobService.enqueue(db_session, "test.record", max_attempts=1)
+    db_session.commit()
+    claimed = JobService.claim(db_session, "dead-worker", limit=2)
+    assert len(claimed) == 2
+
+    later = datetime.now(timezone.utc) + timedelta(seconds=120)
+    assert JobService.requeue_stale(db_session, lock_timeout=300, now=later) == 0
+    assert JobService.requeue_stale(db_session, lock_timeout=60, now=later) == 2
+    statuses = sorted(j.status.value for j in db_session.query(Job))
+    assert statuses == ["failed", "queued"]
+
+
+def test_queue_stats_and_prune(db_session):
+    JobService.enqueue(db_session, "test.record")
+    JobService.enqueue(db_session, "test.record", delay=3600)
+    db_session.commit()
+    job = JobService.claim(db_session, "w")[0]
+    JobService.complete(db_session, job)
+    JobService.enqueue(db_session, "test.record")
+    db_session.commit()
+
+    stats = JobService.queue_stats(db_session)
+    assert stats["depth"] == {"queued": 2, "running": 0, "done": 1, "failed": 0}
+    assert stats["due"] == 1 and stats["oldest_due_seconds"] >= 0
+
+    assert JobService.prune(db_session, retention=3600) == 0
+    assert JobService.prune(db_session, retention=0, now=datetime.now(timezone.utc) + timedelta(seconds=1)) == 1
+
+
+def test_worker_retries_until_the_handler_succeeds(db_session, monkeypatch):
+    monkeypatch.setattr(job_service.settings, "JOB_BACKOFF_SECONDS", 0.0)
+    job = JobService.enqueue(db_session, "test.flaky", {"fail_times": 2})
+    db_session.commit()
+    worker = _worker()
+    worker._bind = db_session.get_bind()
+
+    assert [worker.run_once() for _ in range(4)] == [True, True, True, False]
+    db_session.expire_all()
+    job = db_session.get(Job, job.id)
+    assert job.status == JobStatus.DONE and job.attempts == 3 and len(calls) == 3
+    stats = worker.stats()
+    assert stats["retried"] == 2 and stats["succeeded"] == 1 and stats["run_ms"]["max"] >= 0
+
+
+def test_worker_threads_pick_up_committed_jobs_without_polling(db_session):
+    # A poll interval far longer than the test: only the commit wake-up can get the job run in time
+    worker = _worker(concurrency=2, poll_interval=30)
+    worker.start(db_session.get_bind())
+    try:
+        # Let the threads finish their first (empty) claim and go idle
+        threading.Event().wait(0.2)
+        JobService.enqueue(db_session, "test.record", {"n": 1})
+        db_session.commit()
+        deadline = datetime.now() + timedelta(seconds=5)
+        while not calls and datetime.now() < deadline:
+            threading.Event().wait(0.01)
+        assert calls == [{"n": 1}]
+    finally:
+        worker.stop(timeout=5)
+    assert worker.stats()["succeeded"] == 1
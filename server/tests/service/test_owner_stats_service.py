@@ -0,0 +1,165 @@
+import pytest
+
+from server.core.config import settings
+from server.services.owner_stats_service import OwnerStatsService, COUNTERS
+from server.services.property_service import PropertyService
+from server.services.tenant_service import TenantService
+from server.models.model import (
+    User,
+    UserType,
+    Property,
+    ShortlistedProperty,
+    Application,
+    ListingVersion,
+    OwnerStats,
+    Job,
+)
+from server.schemas.schema import (
+    ApplicationUpdateRequest,
+    PropertyBulkFilter,
+    PropertyBulkUpdateRequest,
+    PropertyCreate,
+    PropertyUpdate,
+    ShortlistRequest,
+)
+
+
+# -------------------- fixtures & helpers --------------------
+
+@pytest.fixture(autouse=True)
+def _cleanup_tables(db_session):
+    """Ensure isolation: clean dependent tables after each test."""
+    try:
+        yield
+    finally:
+        try:
+            db_session.rollback()
+        except Exception:
+            pass
+        db_session.query(OwnerStats).delete()
+        db_session.query(Application).delete()
+        db_session.query(ShortlistedProperty).delete()
+        db_session.query(Property).delete()
+        db_session.query(ListingVersion).delete()
+        db_session.query(User).delete()
+        db_session.commit()
+
+
+def _mk_user(db_session, email: str, user_type: UserType) -> User:
+    u = User(name="U", email=email, phone="0000000000", password_hash="h", user_type=user_type)
+    db_session.add(u)
+    db_session.commit()
+    return u
+
+
+def _create(db_session, owner: User, price: float, city: str = "Pune") -> Property:
+    payload = PropertyCreate(
+        name="Home", address="1 Main Rd", city=city, state="MH", pincode="411001",
+        price=price, bedrooms=2, bathrooms=1, area_sqft=800,
+    )
+    return PropertyService.create_property(db_session, payload, owner_id=owner.id)
+
+
+def _stored(db_session, owner: User) -> dict:
+    db_session.expire_all()
+    row = db_session.get(OwnerStats, owner.id)
+    return {name: getattr(row, name) for name in COUNTERS}
+
+
+def _exact(db_session, owner: User) -> dict:
+    return OwnerStatsService.compute(db_session, [owner.id])[owner.id]
+
+
+# -------------------- write paths --------------------
+
+def test_write_paths_keep_counters_exact(db_session):
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    tenants = [_mk_user(db_session, f"t{i}@example.com", UserType.TENANT) for i in range(2)]
+
+    first = _create(db_session, owner, 10000)
+    second = _create(db_session, owner, 20000, city="Mumbai")
+    PropertyService.insert_properties(db_session, owner.id, [
+        PropertyCreate(name="Bulk", address="2 Main Rd", city="Pune", state="MH", pincode="411001",
+                       price=30000, bedrooms=3, bathrooms=2, area_sqft=1200),
+    ])
+    assert _stored(db_session, owner) == {
+        "properties": 3, "available": 3, "rented": 0, "rent_total": 60000,
+        "open_applications": 0, "shortlists": 0,
+    }
+
+    PropertyService.update_property(db_session, first.id, owner.id, PropertyUpdate(price=12500))
+    PropertyService.bulk_update_properties(
+        db_session, owner.id, PropertyBulkUpdateRequest(filter=PropertyBulkFilter(city="pune"), status="rented")
+    )
+    apps = [TenantService.apply_for_property(db_session, t.id, second.id) for t in tenants]
+    TenantService.apply_for_property(db_session, tenants[0].id, second.id)  # duplicate, not counted
+    for t in tenants:
+        TenantService.shortlist_property(db_session, t.id, ShortlistRequest(property_id=first.id))
+    TenantService.remove_shortlisted_property(db_session, tenants[1].id, first.id)
+    PropertyService.manage_application(db_session, apps[0].id, owner.id, ApplicationUpdateRequest(status="viewed"))
+    PropertyService.manage_application(db_session, apps[1].id, owner.id, ApplicationUpdateRequest(status="rejected"))
+
+    stats = _stored(db_session, owner)
+    assert stats == {
+        "properties": 3, "available": 1, "rented": 2, "rent_total": 62500,
+        "open_applications": 1, "shortlists": 1,
+    }
+    assert stats == _exact(db_session, owner)
+
+    PropertyService.delete_property(db_session, second.id, owner.id)
+    PropertyService.delete_property(db_session, first.id, owner.id)
+    assert _stored(db_session, owner) == _exact(db_session, owner) == {
+        "properties": 1, "available": 0, "rented": 1, "rent_total": 30000,
+        "open_applications": 0, "shortlists": 0,
+    }
+
+
+def test_first_write_starts_from_existing_rows(db_session):
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    _create(db_session, owner, 10000)
+    db_session.query(OwnerStats).delete()
+    db_session.commit()
+
+    summary = OwnerStatsService.get_summary(db_session, owner.id)
+    assert (summary.properties, summary.rent_total) == (1, 10000)
+    assert db_session.get(OwnerStats, owner.id) is None  # reads never write
+
+    _create(db_session, owner, 20000)
+    assert _stored(db_session, owner)["properties"] == 2
+
+
+@pytest.mark.parametrize("soft", [False, True])
+def test_delete_is_counted_on_first_write(db_session, monkeypatch, soft):
+    monkeypatch.setattr(settings, "PROPERTY_SOFT_DELETE", soft)
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    tenant = _mk_user(db_session, "t@example.com", UserType.TENANT)
+    _create(db_session, owner, 1000)
+    gone = _create(db_session, owner, 1000)
+    TenantService.shortlist_property(db_session, tenant.id, ShortlistRequest(property_id=gone.id))
+    TenantService.apply_for_property(db_session, tenant.id, gone.id)
+    db_session.query(OwnerStats).delete()
+    db_session.commit()
+
+    PropertyService.delete_property(db_session, gone.id, owner.id)
+    assert _stored(db_session, owner) == _exact(db_session, owner) == {
+        "properties": 1, "available": 1, "rented": 0, "rent_total": 1000,
+        "open_applications": 0, "shortlists": 0,
+    }
+    db_session.query(Job).delete()
+    db_session.commit()
+
+
+# -------------------- reconcile --------------------
+
+def test_reconcile_corrects_drift_and_missing_rows(db_session):
+    owners = [_mk_user(db_session, f"o{i}@example.com", UserType.OWNER) for i in range(3)]
+    for owner in owners:
+        _create(db_session, owner, 15000)
+    db_session.query(OwnerStats).filter(OwnerStats.owner_id == owners[0].id).update({"properties": 7})
+    db_session.query(OwnerStats).filter(OwnerStats.owner_id == owners[1].id).delete()
+    db_session.commit()
+
+    assert OwnerStatsService.reconcile(db_session, batch_size=2) == 2
+    for owner in owners:
+        assert _stored(db_session, owner) == _exact(db_session, owner)
+    assert OwnerStatsService.reconcile(db_session) == 0
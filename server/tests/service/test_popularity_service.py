@@ -0,0 +1,141 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from server.core.config import settings
+from server.services.popularity_service import PopularityCounters, PopularityService, popularity_counters
+from server.services.tenant_service import TenantService
+from server.models.model import User, UserType, Property, ShortlistedProperty, Application, OwnerStats
+from server.schemas.schema import ShortlistRequest
+
+
+# -------------------- fixtures & helpers --------------------
+
+@pytest.fixture(autouse=True)
+def _cleanup_tables(db_session):
+    """Ensure isolation: clean dependent tables after each test."""
+    try:
+        yield
+    finally:
+        try:
+            db_session.rollback()
+        except Exception:
+            pass
+        db_session.query(OwnerStats).delete()
+        db_session.query(Application).delete()
+        db_session.query(ShortlistedProperty).delete()
+        db_session.query(Property).delete()
+        db_session.query(User).delete()
+        db_session.commit()
+
+
+@pytest.fixture
+def listing(db_session):
+    owner = User(name="O", email="o@example.com", phone="0", password_hash="h", user_type=UserType.OWNER)
+    tenants = [
+        User(name="T", email=f"t{i}@example.com", phone="0", password_hash="h", user_type=UserType.TENANT)
+        for i in range(3)
+    ]
+    db_session.add_all([owner, *tenants])
+    db_session.commit()
+    prop = Property(owner_id=owner.id, name="Home", address="1 Road", city="Pune", state="MH", pincode="411001",
+                    price=1000.0, bedrooms=1, bathrooms=1, area_sqft=500)
+    db_session.add(prop)
+    db_session.commit()
+    return prop.id, [t.id for t in tenants]
+
+
+def _counts(db_session, property_id):
+    db_session.expire_all()
+    p = db_session.get(Property, property_id)
+    return p.shortlist_count, p.application_count, p.view_count
+
+
+# -------------------- buffered --------------------
+
+def test_buffered_counts_land_on_flush(db_session, listing):
+    property_id, tenants = listing
+    bind = db_session.get_bind()
+    for tenant_id in tenants:
+        TenantService.shortlist_property(db_session, tenant_id, ShortlistRequest(property_id=property_id))
+        TenantService.apply_for_property(db_session, tenant_id, property_id)
+    TenantService.remove_shortlisted_property(db_session, tenants[0], property_id)
+    PopularityService.record_view(db_session, property_id)
+    assert _counts(db_session, property_id) == (0, 0, 0)
+    assert popularity_counters.stats()["pending"] == 1
+
+    assert popularity_counters.flush(bind) == 1
+    assert _counts(db_session, property_id) == (2, 3, 1)
+    assert popularity_counters.flush(bind) == 0
+
+
+def test_rolled_back_writes_are_not_counted(db_session, listing):
+    property_id, _ = listing
+    PopularityService.record(db_session, property_id, "shortlist_count")
+    db_session.rollback()
+    PopularityService.record(db_session, property_id, "application_count")
+    db_session.commit()
+    popularity_counters.flush(db_session.get_bind())
+    assert _counts(db_session, property_id) == (0, 1, 0)
+
+
+def test_failed_flush_keeps_deltas(db_session, listing):
+    property_id, _ = listing
+    counters = PopularityCounters(interval=60)
+    counters.add(property_id, "view_count", 5)
+
+    class BrokenBind:
+        def begin(self):
+            raise OperationalError("UPDATE", {}, Exception("database is locked"))
+
+    with pytest.raises(OperationalError):
+        counters.flush(BrokenBind())
+    counters.add(property_id, "view_count")
+    assert counters.flush(db_session.get_bind()) == 1
+    assert _counts(db_session, property_id)[2] == 6
+    assert counters.stats()["flush_errors"] == 1
+
+
+# -------------------- exact --------------------
+
+def test_exact_mode_increments_in_the_write_transaction(db_session, listing, monkeypatch):
+    monkeypatch.setattr(settings, "POPULARITY_COUNTERS", "exact")
+    property_id, tenants = listing
+    TenantService.shortlist_property(db_session, tenants[0], ShortlistRequest(property_id=property_id))
+    TenantService.apply_for_property(db_session, tenants[1], property_id)
+    PopularityService.record_view(db_session, property_id)
+    assert _counts(db_session, property_id) == (1, 1, 1)
+    assert popularity_counters.stats()["pending"] == 0
+
+
+# -------------------- recount --------------------
+
+def test_recount_rebuilds_from_tables(db_session, listing):
+    property_id, tenants = listing
+    for tenant_id in tenants:
+        db_session.add(ShortlistedProperty(user_id=tenant_id, property_id=property_id))
+    db_session.add(Application(property_id=property_id, tenant_id=tenants[0]))
+    db_session.commit()
+
+    assert PopularityService.recount(db_session, batch_size=1) == 1
+    assert _counts(db_session, property_id) == (3, 1, 0)
+
+
+# -------------------- updated_at --------------------
+
+def test_counters_do_not_touch_updated_at(db_session, listing, monkeypatch):
+    property_id, tenants = listing
+
+    def updated_at():
+        db_session.expire_all()
+        return db_session.get(Property, property_id).updated_at
+
+    assert updated_at() is None
+    PopularityService.record_view(db_session, property_id)
+    popularity_counters.flush(db_session.get_bind())
+    monkeypatch.setattr(settings, "POPULARITY_COUNTERS", "exact")
+    PopularityService.record_view(db_session, property_id)
+    db_session.add(ShortlistedProperty(user_id=tenants[0], property_id=property_id))
+    db_session.commit()
+    PopularityService.recount(db_session)
+    assert _counts(db_session, property_id) == (1, 0, 2)
+    assert updated_at() is None
@@ -1,8 +1,12 @@
+import json
 import pytest
+from datetime import datetime, timezone
 from fastapi import HTTPException
+from sqlalchemy import event
 
 from server.services.property_service import PropertyService
-from server.models.model import User, UserType, Property, Application, ApplicationStatus
+from server.core.config import settings
+from server.models.model import User, UserType, Property, Application, ApplicationStatus, ListingVersion, ShortlistedProperty, Job
 from server.schemas.schema import PropertyCreate, PropertyUpdate, ApplicationUpdateRequest
 
 
@@ -121,6 +125,62 @@ def test_search_properties_filters(db_session):
     assert all(p.area_sqft >= 600 for p in res)
 
 
+def test_projected_reads_return_rows_outside_identity_map(db_session):
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    _mk_property(db_session, owner, name="R1", city="Pune", price=900.0)
+    _mk_property(db_session, owner, name="R2", city="Delhi", price=1900.0)
+    owner_id = owner.id
+    db_session.expunge_all()
+
+    columns = PropertyService.columns_for(["id", "name", "price"])
+    rows = PropertyService.search_properties(db_session, city="pune", columns=columns)
+    assert [(r.name, r.price) for r in rows] == [("R1", 900.0)]
+    assert rows[0]._fields == ("id", "name", "price")
+
+    owned = PropertyService.get_properties_by_owner(db_session, owner_id, columns=columns)
+    assert sorted(r.name for r in owned) == ["R1", "R2"]
+    assert len(PropertyService.get_all_properties(db_session, limit=1, columns=columns)) == 1
+    # No ORM instances were hydrated
+    assert len(db_session.identity_map) == 0
+
+
+# -------------------- public projection --------------------
+
+def test_public_projection_written_on_create_and_update(db_session):
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    prop = _mk_property(db_session, owner, address="12 Main St", price=1000.0)
+    assert prop.masked_address == "xx Main St"
+    assert json.loads(prop.public_json)["price"] == 1000.0
+
+    PropertyService.update_property(db_session, prop.id, owner.id, PropertyUpdate(address="7 Side Rd", price=1100.0))
+    stored = json.loads(PropertyService.get_public_listing(db_session, prop.id))
+    assert stored["address"] == "x Side Rd" and stored["price"] == 1100.0
+
+
+def test_public_listings_fall_back_and_backfill(db_session):
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    # Written outside the service: no projection yet
+    legacy = Property(owner_id=owner.id, name="Legacy", address="4 Old Rd", city="Pune", state="MH", pincode="411001",
+                      price=800.0, bedrooms=1, bathrooms=1, area_sqft=400)
+    db_session.add(legacy)
+    db_session.commit()
+    _mk_property(db_session, owner, name="Fresh", city="Pune", address="9 New Rd")
+
+    listings = [json.loads(x) for x in PropertyService.search_public_listings(db_session, city="pune")]
+    assert sorted((x["name"], x["address"]) for x in listings) == [("Fresh", "x New Rd"), ("Legacy", "x Old Rd")]
+
+    assert PropertyService.backfill_public_projection(db_session, batch_size=1) == 1
+    db_session.refresh(legacy)
+    assert legacy.masked_address == "x Old Rd"
+    assert legacy.updated_at is None  # a backfill is not a modification
+    assert PropertyService.backfill_public_projection(db_session) == 0
+    assert PropertyService.backfill_public_projection(db_session, rebuild=True) == 2
+
+    with pytest.raises(HTTPException) as ei:
+        PropertyService.get_public_listing(db_session, 999999)
+    assert ei.value.status_code == 404
+
+
 # -------------------- get_property_by_id --------------------
 
 def test_get_property_by_id_success_and_404(db_session):
@@ -135,6 +195,43 @@ def test_get_property_by_id_success_and_404(db_session):
     assert ei.value.status_code == 404
 
 
+# -------------------- listing versions --------------------
+
+def test_listing_versions_bumped_by_writes(db_session):
+    owner = _mk_user(db_session, "versions@example.com", UserType.OWNER)
+    base_all = PropertyService.get_search_version(db_session)
+    base_north = PropertyService.get_search_version(db_session, city="northvers")
+
+    prop = _mk_property(db_session, owner, city="Northvers")
+    assert PropertyService.get_search_version(db_session, city="northvers") == base_north + 1
+    assert PropertyService.get_search_version(db_session, city="southvers") == 0
+
+    # Moving a listing bumps both the old and the new city
+    PropertyService.update_property(db_session, prop.id, owner.id, PropertyUpdate(city="Southvers"))
+    assert PropertyService.get_search_version(db_session, city="northvers") == base_north + 2
+    assert PropertyService.get_search_version(db_session, city="southvers") == 1
+
+    PropertyService.delete_property(db_session, prop.id, owner.id)
+    assert PropertyService.get_search_version(db_session, city="southvers") == 2
+    assert PropertyService.get_search_version(db_session) == base_all + 4
+    db_session.query(ListingVersion).filter(ListingVersion.city.in_(["Northvers", "Southvers"])).delete()
+    db_session.commit()
+
+
+def test_update_property_advances_modified_at(db_session):
+    owner = _mk_user(db_session, "modified@example.com", UserType.OWNER)
+    prop = _mk_property(db_session, owner)
+    first = PropertyService.get_versioned_public_listing(db_session, prop.id)[1]
+    PropertyService.update_property(db_session, prop.id, owner.id, PropertyUpdate(price=1700.0))
+    second = PropertyService.get_versioned_public_listing(db_session, prop.id)[1]
+    PropertyService.update_property(db_session, prop.id, owner.id, PropertyUpdate(price=1800.0))
+    # Distinct even when both updates land within the same second
+    assert PropertyService.get_versioned_public_listing(db_session, prop.id)[1] > second != first
+    with pytest.raises(HTTPException) as e:
+        PropertyService.get_versioned_public_listing(db_session, 999999)
+    assert e.value.status_code == 404
+
+
 # -------------------- update_property --------------------
 
 def test_update_property_not_found_and_forbidden_and_empty(db_session):
@@ -170,6 +267,33 @@ def test_update_property_success_partial_fields(db_session):
     assert updated.city == "Old City"  # unchanged
 
 
+def test_update_property_checks_and_increments_version(db_session):
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    prop = _mk_property(db_session, owner, price=1000.0)
+    assert prop.version == 1
+
+    updated = PropertyService.update_property(db_session, prop.id, owner.id, PropertyUpdate(price=1100.0), expected_versions=[1])
+    assert updated.version == 2 and updated.price == 1100.0
+    assert json.loads(PropertyService.get_public_listing(db_session, prop.id))["price"] == 1100.0
+
+    # A stale If-Match fails on its first statement, even when the old price is needed
+    property_id, owner_id = prop.id, owner.id
+    statements = []
+    engine = db_session.get_bind()
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        for updates in (PropertyUpdate(price=900.0), PropertyUpdate(name="Renamed")):
+            with pytest.raises(HTTPException) as ei:
+                PropertyService.update_property(db_session, property_id, owner_id, updates, expected_versions=[1])
+            assert ei.value.status_code == 412
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert len(statements) == 2
+    db_session.refresh(prop)
+    assert (prop.price, prop.version, prop.name) == (1100.0, 2, "Home")
+
+
 # -------------------- manage_application --------------------
 
 def test_manage_application_paths(db_session):
@@ -191,9 +315,8 @@ def test_manage_application_paths(db_session):
     db_session.commit()
     db_session.refresh(app)
 
-    # property not found for application (simulate by pointing to a non-existent property id)
-    app.property_id = 999999  # ensure this ID does not exist
-    db_session.add(app)
+    # property not found for application (it was soft-deleted)
+    prop.deleted_at = datetime.now(timezone.utc)
     db_session.commit()
     with pytest.raises(HTTPException) as ei:
         PropertyService.manage_application(
@@ -252,3 +375,47 @@ def test_delete_property_paths_and_cascade_cleanup(db_session):
     # applications for that property should be gone
     remaining_apps = db_session.query(Application).filter(Application.property_id == prop.id).all()
     assert remaining_apps == []
+
+    # ... and so are its shortlist entries, through ON DELETE CASCADE
+    prop = _mk_property(db_session, owner)
+    db_session.add(ShortlistedProperty(user_id=tenant.id, property_id=prop.id))
+    db_session.commit()
+    PropertyService.delete_property(db_session, prop.id, owner.id)
+    assert db_session.query(ShortlistedProperty).count() == 0
+
+
+def test_soft_delete_hides_at_once_and_purges_in_batches(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "PROPERTY_SOFT_DELETE", True)
+    owner = _mk_user(db_session, "o@example.com", UserType.OWNER)
+    tenants = [_mk_user(db_session, f"t{i}@example.com", UserType.TENANT) for i in range(5)]
+    prop = _mk_property(db_session, owner, city="Softvers")
+    for t in tenants:
+        db_session.add(Application(property_id=prop.id, tenant_id=t.id))
+        db_session.add(ShortlistedProperty(user_id=t.id, property_id=prop.id))
+    db_session.commit()
+
+    PropertyService.delete_property(db_session, prop.id, owner.id)
+    assert PropertyService.search_public_listings(db_session, city="softvers") == []
+    for call in (
+        lambda: PropertyService.get_public_listing(db_session, prop.id),
+        lambda: PropertyService.delete_property(db_session, prop.id, owner.id),
+    ):
+        with pytest.raises(HTTPException) as ei:
+            call()
+        assert ei.value.status_code == 404
+    job = db_session.query(Job).filter(Job.kind == "property.purge").one()
+    assert json.loads(job.payload) == {"property_id": prop.id}
+    # Dependent rows are still there until the job runs
+    assert db_session.query(Application).count() == 5
+
+    property_id = prop.id
+    assert PropertyService.purge_property(db_session, property_id, batch_size=2) == 11
+    assert db_session.query(Application).count() == 0
+    assert db_session.query(ShortlistedProperty).count() == 0
+    # The instance in the identity map is stale now that its row is gone
+    db_session.expunge(prop)
+    assert db_session.get(Property, property_id) is None
+    assert PropertyService.purge_property(db_session, property_id) == 0
+    db_session.query(Job).delete()
+    db_session.query(ListingVersion).filter(ListingVersion.city == "Softvers").delete()
+    db_session.commit()
@@ -0,0 +1,61 @@
+"""
+Standalone background job worker.
+
+Runs the same ``JobWorker`` pool the API starts in-process, without serving HTTP;
+set ``JOB_WORKERS=0`` on the API when jobs should only run here. SIGTERM/SIGINT
+stop claiming and wait up to ``--graceful-timeout`` seconds for running jobs.
+
+Usage (from the repository root):
+    python -m server.worker --concurrency 4
+"""
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+from typing import Optional, Sequence
+
+from server.core.config import settings
+from server.db.database import create_tables, engine
+from server.services.job_service import JobWorker
+# Importing the services registers their job handlers
+import server.services.archive_service  # noqa: F401
+import server.services.owner_stats_service  # noqa: F401
+import server.services.popularity_service  # noqa: F401
+import server.services.property_service  # noqa: F401
+
+logger = logging.getLogger("server.worker")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=max(1, settings.JOB_WORKERS))
+    parser.add_argument("--poll-interval", type=float, default=settings.JOB_POLL_SECONDS)
+    parser.add_argument("--graceful-timeout", type=int, default=settings.GRACEFUL_TIMEOUT)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(process)d %(levelname)s %(message)s")
+
+    create_tables()
+    worker = JobWorker(
+        concurrency=args.concurrency,
+        poll_interval=args.poll_interval,
+        lock_timeout=settings.JOB_LOCK_TIMEOUT_SECONDS,
+        retention=settings.JOB_RETENTION_SECONDS,
+    )
+    stopping = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda signum, frame: stopping.set())
+
+    worker.start(engine)
+    while not stopping.wait(1.0):
+        pass
+    logger.info("Stopping; waiting up to %ds for running jobs", args.graceful_timeout)
+    worker.stop(timeout=args.graceful_timeout)
+    logger.info("Processed %d jobs", worker.stats()["claimed"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())